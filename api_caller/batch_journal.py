@@ -0,0 +1,199 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pnu_types import PnuSet
+
+# 레코드 상태
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+# 기본 일괄 기록 간격 (레코드 수, 초)
+DEFAULT_FLUSH_EVERY = 500
+DEFAULT_FLUSH_INTERVAL = 2.0
+
+# 응답 해시에서 제외하는 항목 (조회할 때마다 달라지는 값)
+_UNHASHED_FIELDS = ("seconds",)
+
+def response_hash(items):
+    """
+    Hash the items of a lookup, independent of key order
+
+    :param items: Item dictionaries of one PNU (or any JSON-serializable value)
+    :return: Hex digest (the same items always give the same hash)
+    """
+    text = json.dumps(items or [], sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+def is_failed(record):
+    """
+    Check whether a lookup record must be looked up again
+
+    A lookup_profile record whose endpoints partly failed still has
+    ``error`` None, but its ``errors`` are not empty; it counts as failed
+    so that a resumed run fetches the missing endpoints.
+
+    :param record: Record returned by lookup_pnu or lookup_profile
+    """
+    return record.get("error") is not None or bool(record.get("errors"))
+
+def _failure(record):
+    """실패한 레코드의 (오류 메시지, 오류 종류) (엔드포인트 일부 실패는 엔드포인트별로 묶음)"""
+    if record.get("error") is not None:
+        return record["error"], record.get("error_type")
+    errors = record["errors"]
+    message = "; ".join(f"{name}: {error['error']}" for name, error in errors.items())
+    return message, next(iter(errors.values())).get("error_type")
+
+class BatchJournal:
+    """
+    Append-only SQLite journal of a batch job
+
+    One row is appended per finished PNU with its status, the hash of its
+    items and the error class of failures; the latest row of a PNU wins.
+    Rows are buffered and written in one transaction every ``flush_every``
+    records or ``flush_interval`` seconds. Flush hooks run first, so the
+    output a row refers to is on disk before the row is.
+    """
+
+    def __init__(self, path, flush_every=DEFAULT_FLUSH_EVERY, flush_interval=DEFAULT_FLUSH_INTERVAL):
+        """
+        :param path: SQLite database path (":memory:" for a private journal)
+        :param flush_every: Number of buffered records that triggers a write
+        :param flush_interval: Seconds after which buffered records are written anyway
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._flush_hooks = []
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS journal (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                pnu TEXT NOT NULL,
+                status TEXT NOT NULL,
+                response_hash TEXT,
+                total_count INTEGER,
+                error TEXT,
+                error_type TEXT,
+                recorded_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS journal_pnu ON journal (pnu, id)")
+
+    def add_flush_hook(self, hook):
+        """
+        Run hook before every write of buffered rows
+
+        :param hook: Callable taking no arguments (e.g. flushing the output file)
+        """
+        self._flush_hooks.append(hook)
+
+    def record(self, record):
+        """
+        Buffer the outcome of one lookup
+
+        :param record: Record returned by lookup_pnu or lookup_profile (see is_failed)
+        """
+        if not is_failed(record):
+            if "items" in record:
+                payload = record["items"]
+            else:  # lookup_profile 레코드는 엔드포인트별 항목 전체를 해시
+                payload = {name: value for name, value in record.items() if name not in _UNHASHED_FIELDS}
+            row = (record["pnu"], STATUS_DONE, response_hash(payload), record.get("total_count"),
+                   None, None, time.time())
+        else:
+            error, error_type = _failure(record)
+            row = (record["pnu"], STATUS_FAILED, None, None, error, error_type, time.time())
+        with self._lock:
+            self._pending.append(row)
+            due = (len(self._pending) >= self.flush_every
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self):
+        """버퍼에 쌓인 기록을 한 번의 트랜잭션으로 저장"""
+        with self._lock:
+            if not self._pending:
+                self._last_flush = time.monotonic()
+                return
+            for hook in self._flush_hooks:
+                hook()
+            rows, self._pending = self._pending, []
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO journal (pnu, status, response_hash, total_count, error, error_type, recorded_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                self._pending[:0] = rows
+                raise
+            self._last_flush = time.monotonic()
+
+    def _latest(self):
+        return self._conn.execute(
+            "SELECT j.pnu, j.status, j.response_hash, j.error_type FROM journal j "
+            "JOIN (SELECT pnu, MAX(id) AS id FROM journal GROUP BY pnu) latest ON j.id = latest.id"
+        )
+
+    def completed(self):
+        """
+        Return the PNUs whose latest outcome is done
+
+        :return: PnuSet
+        """
+        self.flush()
+        with self._lock:
+            return PnuSet(pnu for pnu, status, _, _ in self._latest() if status == STATUS_DONE)
+
+    def latest_hashes(self):
+        """
+        Return the response hash of every completed PNU
+
+        :return: Dictionary PNU -> response hash
+        """
+        self.flush()
+        with self._lock:
+            return {pnu: digest for pnu, status, digest, _ in self._latest() if status == STATUS_DONE}
+
+    def summary(self):
+        """
+        Summarize the latest outcome of every PNU in the journal
+
+        :return: Dictionary with done, failed and failed_by_type (error class -> count)
+        """
+        self.flush()
+        done = failed = 0
+        failed_by_type = {}
+        with self._lock:
+            for _, status, _, error_type in self._latest():
+                if status == STATUS_DONE:
+                    done += 1
+                else:
+                    failed += 1
+                    failed_by_type[error_type] = failed_by_type.get(error_type, 0) + 1
+        return {"done": done, "failed": failed, "failed_by_type": failed_by_type}
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,342 @@
+import argparse
+import csv
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from building_client import BuildingRegistryClient, DEFAULT_PAGE_SIZE
+from code_table import CodeTable
+from csv_loader import CsvChunkReader
+from dongcd_search import CsvSearchIndex, find_code_column
+from building_records import JSON_BACKEND, decode_titles, iter_xml_events
+from mock_building_api import MockBuildingApi, build_json_response, build_xml_response, synthetic_items
+from parcel_profile import ProfileLookup, building_endpoints, fetch_endpoint
+from building_lookup import fetch_building_info_batch, format_building_info, parse_pnu
+
+SUITES = ("parse", "format", "fetch", "batch", "pagination", "profile", "csv")
+
+# CSV 불러오기/검색 벤치마크 기본 행 수
+DEFAULT_CSV_SIZES = (1000, 50000, 500000)
+
+# CSV 검색 벤치마크에 사용하는 검색어 (코드 앞자리, 이름 일부, 한 글자)
+CSV_QUERIES = ("11", "1111010", "서울", "모의동1", "구")
+
+def measure(func, repeat=5, number=1):
+    """
+    Time a callable
+
+    :param func: Callable taking no arguments
+    :param repeat: Number of timed runs
+    :param number: Operations performed by one call (for per-operation figures)
+    :return: Dictionary with best/median/mean seconds per run and per-operation seconds
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    return {
+        "repeat": repeat,
+        "operations": number,
+        "best_seconds": best,
+        "median_seconds": statistics.median(timings),
+        "mean_seconds": statistics.fmean(timings),
+        "per_operation_seconds": best / number,
+        "operations_per_second": number / best if best else None,
+    }
+
+def random_pnus(count, seed=0):
+    """벤치마크용 19자리 PNU 목록 (산구분 1/2)"""
+    rng = random.Random(seed)
+    return [f"{rng.randrange(11110, 50000):05d}{rng.randrange(10100, 40000):05d}{rng.choice('12')}"
+            f"{rng.randrange(10000):04d}{rng.randrange(10000):04d}" for _ in range(count)]
+
+def write_code_csv(path, rows, seed=0):
+    """
+    Write a synthetic 법정동코드 file in the official layout
+
+    :param path: Output path
+    :param rows: Number of data rows
+    :param seed: Random seed
+    """
+    rng = random.Random(seed)
+    sido_names = ("서울특별시", "부산광역시", "경기도", "강원특별자치도", "전라남도")
+    with open(path, 'w', encoding='utf-8', newline='') as code_file:
+        writer = csv.writer(code_file)
+        writer.writerow(["법정동코드", "법정동명", "폐지여부"])
+        for index in range(rows):
+            code = f"{11 + index % 40:02d}{index // 40 % 1000:03d}{index // 40000 % 1000:03d}{index % 100:02d}"
+            name = f"{rng.choice(sido_names)} 모의구{index % 97} 모의동{index % 1013}"
+            writer.writerow([code, name, "폐지" if rng.random() < 0.1 else "존재"])
+
+def load_csv(path):
+    """
+    Read a CSV and build its search index and code table
+
+    Performs the same steps as the dock's CsvLoadWorker, without the Qt
+    signals.
+
+    :return: Tuple of (rows, CsvSearchIndex, CodeTable or None)
+    """
+    with CsvChunkReader(path) as reader:
+        all_rows = []
+        search_index = None
+        for chunk in reader:
+            if search_index is None:
+                search_index = CsvSearchIndex([], code_column=find_code_column(reader.headers, chunk))
+            search_index.add_rows(chunk, len(all_rows))
+            all_rows.extend(chunk)
+        if search_index is None:
+            search_index = CsvSearchIndex([])
+        search_index.sort_codes()
+        code_table = None
+        if search_index.code_column is not None:
+            code_table = CodeTable.from_rows(reader.headers, all_rows)
+    return all_rows, search_index, code_table
+
+def _result(suite, name, params, timing):
+    return {"suite": suite, "name": name, "params": params, **timing}
+
+def bench_parse(args):
+    pnus = random_pnus(args.parse_count)
+    results = [_result("parse", "parse_pnu", {"rows": len(pnus)},
+                       measure(lambda: [parse_pnu(pnu) for pnu in pnus], args.repeat, len(pnus)))]
+    try:
+        import numpy
+        from pnu_bulk import parse_pnu_bulk
+    except ImportError:
+        return results
+    array = numpy.array(pnus)
+    results.append(_result("parse", "parse_pnu_bulk", {"rows": len(pnus), "input": "numpy"},
+                           measure(lambda: parse_pnu_bulk(array), args.repeat, len(pnus))))
+    results.append(_result("parse", "parse_pnu_bulk", {"rows": len(pnus), "input": "list"},
+                           measure(lambda: parse_pnu_bulk(pnus), args.repeat, len(pnus))))
+    return results
+
+def bench_format(args):
+    items = synthetic_items({'sigunguCd': '11110', 'bjdongCd': '10100', 'platGbCd': '0', 'bun': '0001',
+                             'ji': '0000'}, args.format_count)
+    body = json.dumps(build_json_response(items, len(items), 1, len(items)), ensure_ascii=False).encode('utf-8')
+    xml_body = build_xml_response(items, len(items), 1, len(items)).encode('utf-8')
+    return [_result("format", "format_building_info", {"items": len(items)},
+                    measure(lambda: [format_building_info(item) for item in items], args.repeat, len(items))),
+            _result("format", "json.loads", {"items": len(items)},
+                    measure(lambda: json.loads(body), args.repeat, len(items))),
+            _result("format", "decode_titles", {"items": len(items), "backend": JSON_BACKEND},
+                    measure(lambda: decode_titles(body), args.repeat, len(items))),
+            _result("format", "iter_xml_events", {"items": len(items)},
+                    measure(lambda: sum(1 for _ in iter_xml_events(io.BytesIO(xml_body))), args.repeat, len(items)))]
+
+def _client(api, args, **kwargs):
+    return BuildingRegistryClient("benchmark-key", title_info_url=api.title_info_url, backoff_factor=0.01,
+                                  pool_maxsize=max(args.workers, 10), **kwargs)
+
+def bench_fetch(args, api):
+    pnus = random_pnus(args.fetch_count, seed=1)
+    params = [parse_pnu(pnu) for pnu in pnus]
+    with _client(api, args) as client:
+        def run():
+            for parcel in params:
+                client.fetch_building_info(**parcel, rows=args.page_size)
+        timing = measure(run, args.repeat, len(params))
+    return [_result("fetch", "fetch_building_info", {"requests": len(params), "latency": args.latency,
+                                                     "error_rate": args.error_rate}, timing)]
+
+def bench_batch(args, api):
+    pnus = random_pnus(args.batch_count, seed=2)
+    with _client(api, args) as client:
+        def run():
+            for _ in fetch_building_info_batch(client, pnus, max_workers=args.workers, page_size=args.page_size):
+                pass
+        timing = measure(run, args.repeat, len(pnus))
+    return [_result("batch", "fetch_building_info_batch", {"pnus": len(pnus), "workers": args.workers,
+                                                           "latency": args.latency, "error_rate": args.error_rate},
+                    timing)]
+
+def bench_pagination(args, api):
+    params = parse_pnu(random_pnus(1, seed=3)[0])
+    items_per_parcel = api.items_per_parcel
+    api.items_per_parcel = args.pagination_items
+    try:
+        with _client(api, args) as client:
+            results = []
+            for response_type in ("json", "xml"):
+                def run():
+                    for _ in client.iter_building_items(**params, page_size=args.page_size,
+                                                        response_type=response_type):
+                        pass
+                results.append(_result("pagination", "iter_building_items",
+                                       {"items": args.pagination_items, "page_size": args.page_size,
+                                        "latency": args.latency, "response_type": response_type},
+                                       measure(run, args.repeat, args.pagination_items)))
+    finally:
+        api.items_per_parcel = items_per_parcel
+    return results
+
+def bench_profile(args, api):
+    pnus = random_pnus(args.profile_count, seed=4)
+    endpoints = building_endpoints(api.service_url)
+    with _client(api, args) as client:
+        def run_sequential():
+            for pnu in pnus:
+                for endpoint in endpoints:
+                    fetch_endpoint(client, endpoint, pnu, parse_pnu(pnu), args.page_size)
+
+        def run_fanout():
+            with ProfileLookup(1, endpoints) as lookup:
+                for pnu in pnus:
+                    lookup(client, pnu, args.page_size)
+        params = {"pnus": len(pnus), "endpoints": len(endpoints), "latency": args.latency}
+        return [_result("profile", "sequential endpoints", params, measure(run_sequential, args.repeat, len(pnus))),
+                _result("profile", "lookup_profile", params, measure(run_fanout, args.repeat, len(pnus)))]
+
+def bench_csv(args):
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for rows in args.csv_sizes:
+            path = os.path.join(temp_dir, f"codes_{rows}.csv")
+            write_code_csv(path, rows)
+            repeat = args.repeat if rows <= 50000 else max(1, args.repeat // 3)
+            results.append(_result("csv", "load", {"rows": rows}, measure(lambda: load_csv(path), repeat, rows)))
+
+            _, search_index, code_table = load_csv(path)
+            if code_table is not None:
+                snapshot_path = os.path.join(temp_dir, f"codes_{rows}.bin")
+                code_table.write_snapshot(snapshot_path, path)
+                results.append(_result("csv", "code_table_snapshot", {"rows": rows},
+                                       measure(lambda: CodeTable.from_snapshot(snapshot_path, path), args.repeat)))
+            for query in CSV_QUERIES:
+                def run():
+                    search_index.search("")
+                    search_index.search(query)
+                results.append(_result("csv", "search", {"rows": rows, "query": query},
+                                       measure(run, args.repeat)))
+    return results
+
+def environment_info():
+    """결과 비교용 실행 환경 정보"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "commit": commit,
+    }
+
+def run_benchmarks(args):
+    """
+    Run the selected suites
+
+    :param args: Parsed command-line arguments
+    :return: Report dictionary with "environment", "settings" and "results"
+    """
+    results = []
+    suites = args.suite or SUITES
+    network_suites = [suite for suite in suites if suite in ("fetch", "batch", "pagination", "profile")]
+
+    if "parse" in suites:
+        results.extend(bench_parse(args))
+    if "format" in suites:
+        results.extend(bench_format(args))
+    if network_suites:
+        with MockBuildingApi(items_per_parcel=args.items_per_parcel, latency=args.latency,
+                             latency_jitter=args.latency_jitter, error_rate=args.error_rate,
+                             fixtures_dir=args.fixtures, seed=0) as api:
+            if "fetch" in suites:
+                results.extend(bench_fetch(args, api))
+            if "batch" in suites:
+                results.extend(bench_batch(args, api))
+            if "pagination" in suites:
+                results.extend(bench_pagination(args, api))
+            if "profile" in suites:
+                results.extend(bench_profile(args, api))
+    if "csv" in suites:
+        results.extend(bench_csv(args))
+
+    settings = {name: value for name, value in vars(args).items() if name not in ("output", "compare")}
+    return {"environment": environment_info(), "settings": settings, "results": results}
+
+def _result_key(result):
+    return result["suite"], result["name"], json.dumps(result["params"], sort_keys=True)
+
+def compare_reports(baseline, current):
+    """
+    Pair up results of two reports
+
+    :return: List of (suite, name, params, baseline seconds, current seconds, ratio current/baseline)
+    """
+    baseline_results = {_result_key(result): result for result in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        previous = baseline_results.get(_result_key(result))
+        if previous is None:
+            continue
+        before, after = previous["best_seconds"], result["best_seconds"]
+        rows.append((result["suite"], result["name"], result["params"], before, after,
+                     after / before if before else None))
+    return rows
+
+def print_report(report, out=sys.stderr):
+    for result in report["results"]:
+        params = ", ".join(f"{name}={value}" for name, value in result["params"].items())
+        print(f"{result['suite']:<11} {result['name']:<26} {result['best_seconds'] * 1000:10.2f} ms"
+              f"  ({params})", file=out)
+
+def build_arg_parser():
+    """명령행 인자 정의"""
+    parser = argparse.ArgumentParser(description="모의 API 서버로 PNU 조회·CSV 처리 성능을 측정합니다.")
+    parser.add_argument("--suite", action="append", choices=SUITES,
+                        help="실행할 벤치마크 (여러 번 지정 가능, 기본값: 전체)")
+    parser.add_argument("--output", metavar="FILE", help="결과 JSON 저장 경로 (기본값: 표준출력)")
+    parser.add_argument("--compare", metavar="FILE", help="이전 결과 JSON과 비교해 배율 출력")
+    parser.add_argument("--repeat", type=int, default=5, help="측정 반복 횟수 (최솟값 사용, 기본값: 5)")
+    parser.add_argument("--latency", type=float, default=0.0, help="모의 서버 응답 지연 (초)")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="추가 무작위 지연 최댓값 (초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="모의 서버 오류 응답 비율 (0~1)")
+    parser.add_argument("--fixtures", metavar="DIR", help="녹화된 응답 JSON 폴더 (파일 이름은 PNU.json)")
+    parser.add_argument("--items-per-parcel", type=int, default=3, help="필지당 모의 건축물 수")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="페이지당 요청 행 수")
+    parser.add_argument("--workers", type=int, default=8, help="일괄 조회 동시 요청 수")
+    parser.add_argument("--parse-count", type=int, default=100000, help="PNU 파싱 벤치마크 행 수")
+    parser.add_argument("--format-count", type=int, default=10000, help="포맷팅 벤치마크 항목 수")
+    parser.add_argument("--fetch-count", type=int, default=200, help="단건 조회 벤치마크 요청 수")
+    parser.add_argument("--batch-count", type=int, default=1000, help="일괄 조회 벤치마크 PNU 수")
+    parser.add_argument("--pagination-items", type=int, default=2000, help="페이지 조회 벤치마크 항목 수")
+    parser.add_argument("--profile-count", type=int, default=50, help="다중 엔드포인트 조회 벤치마크 PNU 수")
+    parser.add_argument("--csv-sizes", type=int, nargs="+", default=list(DEFAULT_CSV_SIZES),
+                        help="CSV 불러오기/검색 벤치마크 행 수")
+    return parser
+
+if __name__ == "__main__":
+    args = build_arg_parser().parse_args()
+    report = run_benchmarks(args)
+    print_report(report)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as report_file:
+            report_file.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+        print("\n기준 대비 (current / baseline):", file=sys.stderr)
+        for suite, name, params, before, after, ratio in compare_reports(baseline, report):
+            ratio_text = f"{ratio:6.2f}x" if ratio is not None else "     -"
+            print(f"{suite:<11} {name:<26} {ratio_text}  {before * 1000:9.2f} → {after * 1000:9.2f} ms  {params}",
+                  file=sys.stderr)
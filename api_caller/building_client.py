@@ -0,0 +1,744 @@
+import functools
+import logging
+import random
+import re
+import threading
+import time
+import urllib.parse
+from concurrent.futures import Future, ThreadPoolExecutor
+from xml.etree.ElementTree import ParseError
+from building_records import iter_xml_events, loads, to_titles
+from key_pool import QuotaExhaustedError, key_id
+from response_cache import make_cache_key
+
+# 건축물대장 표제부 조회 API
+TITLE_INFO_URL = "http://apis.data.go.kr/1613000/BldRgstHubService/getBrTitleInfo"
+
+# 일시적인 서버 오류로 보고 재시도할 HTTP 상태 코드
+RETRY_STATUS_CODES = frozenset((500, 502, 503, 504))
+
+# 키별 요청 속도 제한에 걸렸을 때의 HTTP 상태 코드와 해당 키를 쉬게 하는 시간 (초)
+RATE_LIMITED_STATUS = 429
+RATE_LIMIT_BACKOFF = 5.0
+
+# 공공데이터포털 게이트웨이의 요청 한도 초과 오류 (LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR)
+QUOTA_EXCEEDED_CODE = "22"
+QUOTA_EXCEEDED_MESSAGE = "LIMITED_NUMBER_OF_SERVICE_REQUESTS"
+
+# 페이지 단위 조회 시 기본 페이지 크기
+DEFAULT_PAGE_SIZE = 100
+
+# URL과 오류 메시지에 들어 있는 서비스키 값 (로그·결과·작업 기록에는 남기지 않음)
+_SERVICE_KEY_PATTERN = re.compile(r"(serviceKey=)[^&\s'\"]+", re.IGNORECASE)
+
+logger = logging.getLogger(__name__)
+
+# requests는 첫 클라이언트를 만들 때 불러옴 (모듈을 가져오기만 하는 도구의 시작 시간 단축)
+requests = None
+HTTPAdapter = None
+
+_shared_clients = {}
+_shared_clients_lock = threading.Lock()
+
+def _import_requests():
+    """requests를 불러와 모듈 전역에 설정 (클라이언트의 모든 메서드는 생성 이후에만 호출됨)"""
+    global requests, HTTPAdapter
+    if requests is None:
+        import requests as requests_module
+        from requests.adapters import HTTPAdapter as adapter_class
+        requests, HTTPAdapter = requests_module, adapter_class
+
+class BuildingApiError(Exception):
+    """API 호출이 실패했거나 오류 결과코드를 받은 경우"""
+
+def redact_service_key(text):
+    """문자열에 들어 있는 serviceKey 값을 가림"""
+    return _SERVICE_KEY_PATTERN.sub(r"\1***", str(text))
+
+def describe_request_error(error):
+    """
+    Describe a failed request without its service key
+
+    HTTP errors are reduced to the status code and the endpoint path;
+    other exceptions keep their text with any serviceKey value masked.
+
+    :param error: requests exception
+    :return: Message safe to log and to store in results
+    """
+    response = getattr(error, "response", None)
+    if response is not None:
+        reason = f" {response.reason}" if response.reason else ""
+        return f"HTTP {response.status_code}{reason} for {urllib.parse.urlsplit(response.url or '').path}"
+    return redact_service_key(error)
+
+class BuildingRegistryClient:
+    """
+    Reusable client for the building registry OpenAPI
+
+    Owns a pooled requests.Session so connections are kept alive between
+    calls, and retries timeouts, connection errors and 5xx responses with
+    jittered exponential backoff. Identical requests made concurrently
+    share a single API call. Safe to share between threads.
+    """
+
+    def __init__(self, service_key, cache=None, connect_timeout=3.05, read_timeout=10,
+                 max_retries=3, backoff_factor=0.5, backoff_max=8.0, pool_maxsize=32, metrics=None,
+                 title_info_url=TITLE_INFO_URL, key_pool=None):
+        """
+        :param service_key: Decoded service key from the public data portal (unused with a key_pool)
+        :param cache: ResponseCache used for successful responses (None disables caching)
+        :param connect_timeout: Seconds to wait for the TCP connection
+        :param read_timeout: Seconds to wait between bytes of the response
+        :param max_retries: Number of retries after the first attempt
+        :param backoff_factor: Base delay in seconds of the exponential backoff
+        :param backoff_max: Upper bound in seconds of a single backoff delay
+        :param pool_maxsize: Number of keep-alive connections kept per host
+        :param metrics: MetricsRegistry that receives per-request metrics (None disables them)
+        :param title_info_url: URL of the title information endpoint (for a local mock server)
+        :param key_pool: ServiceKeyPool that picks a rate- and quota-limited key per request (optional)
+        """
+        if service_key is None and key_pool is not None:
+            service_key = key_pool.keys[0]
+        self.service_key = service_key
+        self.key_pool = key_pool
+        self.cache = cache
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self._pool_maxsize = pool_maxsize
+        self.metrics = metrics
+        self.title_info_url = title_info_url
+        self._prefetch_executor = None
+        self._prefetch_lock = threading.Lock()
+
+        # 진행 중인 요청 (캐시 키 -> Future)과 요청 수 통계
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self.request_count = 0
+        self.coalesced_count = 0
+
+        _import_requests()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self):
+        """세션과 연결 풀 정리"""
+        if self._prefetch_executor is not None:
+            self._prefetch_executor.shutdown(wait=False)
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _backoff(self, attempt):
+        # Full jitter: 0 ~ min(backoff_max, backoff_factor * 2^attempt) 사이에서 무작위 대기
+        delay = min(self.backoff_max, self.backoff_factor * (2 ** attempt))
+        time.sleep(random.uniform(0, delay))
+
+    def get(self, url, params, timeout=None, stream=False, before_retry=None):
+        """
+        Send a GET request, retrying transient failures
+
+        :param url: Request URL
+        :param params: Query parameters
+        :param timeout: (connect, read) timeout in seconds for this call (client default if None)
+        :param stream: Return as soon as the headers arrive and leave the body unread
+                       (the caller must read or close the response)
+        :param before_retry: Callable run before every retry, after the backoff (e.g. to take a
+                             key pool token, so each HTTP attempt is rate limited and counted)
+        :return: requests.Response with a successful status
+        :raises requests.exceptions.RequestException: When all attempts fail
+        """
+        attempt = 0
+        started = time.perf_counter()
+        while True:
+            try:
+                response = self.session.get(url, params=params, timeout=timeout or self.timeout, stream=stream)
+                # elapsed: 요청 전송부터 응답 헤더 수신까지 (새 연결이면 연결 시간 포함)
+                self._observe("ttfb_seconds", response.elapsed.total_seconds())
+                if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                    response.close()
+                    logger.info("HTTP %s from %s, retrying (attempt %d)", response.status_code, url, attempt + 1)
+                    self._increment("retries_total")
+                    self._backoff(attempt)
+                    attempt += 1
+                    if before_retry is not None:
+                        before_retry()
+                    continue
+                if stream and response.status_code >= 400:
+                    response.close()
+                response.raise_for_status()  # Raise an HTTPError for bad responses (4xx and 5xx)
+                if stream:
+                    return response
+                elapsed = time.perf_counter() - started
+                self._observe("request_seconds", elapsed)
+                self._observe("response_bytes", len(response.content))
+                logger.debug("GET %s status=%s bytes=%d ttfb=%.3f total=%.3f retries=%d", url,
+                             response.status_code, len(response.content), response.elapsed.total_seconds(),
+                             elapsed, attempt)
+                return response
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt >= self.max_retries:
+                    raise
+                logger.info("%s for %s, retrying (attempt %d)", type(e).__name__, url, attempt + 1)
+                self._increment("retries_total")
+                self._backoff(attempt)
+                attempt += 1
+                if before_retry is not None:
+                    before_retry()
+
+    def _increment(self, name, value=1):
+        if self.metrics is not None:
+            self.metrics.increment(name, value)
+
+    def _observe(self, name, value):
+        if self.metrics is not None:
+            self.metrics.observe(name, value)
+
+    def fetch_building_info(self, sigungu_cd, bjdong_cd, plat_gb_cd, bun, ji, rows=1, page=1, response_type="json",
+                            refresh=False, cache_ttl=None):
+        """
+        Fetch building registry title information for one parcel.
+
+        :param sigungu_cd: City/district code
+        :param bjdong_cd: Legal dong code
+        :param plat_gb_cd: Land classification code (0: land, 1: mountain, etc.)
+        :param bun: Main lot number
+        :param ji: Sub lot number
+        :param rows: Number of rows per page
+        :param page: Page number
+        :param response_type: Response format (json or xml)
+        :param refresh: Skip the cached entry and store a fresh response
+        :param cache_ttl: Time-to-live in seconds for the stored entry (cache default if None)
+        :return: API response in JSON format, or a dictionary with an "error" key.
+                 Concurrent identical calls return the same object.
+        """
+        # API parameters
+        params = {
+            "serviceKey": self.service_key,
+            "sigunguCd": sigungu_cd,
+            "bjdongCd": bjdong_cd,
+            "platGbCd": plat_gb_cd,
+            "bun": bun,
+            "ji": ji,
+            "numOfRows": rows,
+            "pageNo": page,
+            "_type": response_type
+        }
+
+        return self.fetch_json(self.title_info_url, params, response_type=response_type, refresh=refresh,
+                               cache_ttl=cache_ttl)
+
+    def fetch_json(self, url, params, response_type="json", refresh=False, cache_ttl=None, timeout=None,
+                   cacheable=None):
+        """
+        Fetch one response of any data.go.kr endpoint through the cache
+
+        :param url: Endpoint URL
+        :param params: Query parameters, including the service key
+        :param response_type: "json" to decode the body, anything else to return the text
+        :param refresh: Skip the cached entry and store a fresh response
+        :param cache_ttl: Time-to-live in seconds for the stored entry (cache default if None)
+        :param timeout: (connect, read) timeout in seconds for this call (client default if None)
+        :param cacheable: Predicate deciding whether a result is stored (is_cacheable if None)
+        :return: Decoded response, or a dictionary with an "error" key.
+                 Concurrent identical calls return the same object.
+        """
+        cacheable = cacheable or is_cacheable
+        request_key = make_cache_key(url, params)
+        if self.cache is not None and not refresh:
+            cached = self.cache.get(request_key)
+            if cached is not None:
+                self._increment("cache_hits_total")
+                return cached
+            self._increment("cache_misses_total")
+
+        def request():
+            result = self._request(url, params, response_type, timeout)
+            # 정상 응답만 캐시에 저장 (오류 응답은 다음 호출에서 다시 요청)
+            if self.cache is not None and cacheable(result):
+                self.cache.set(request_key, result, ttl=cache_ttl)
+            return result
+
+        # 같은 요청이 이미 진행 중이면 새로 보내지 않고 그 결과를 함께 받음
+        return self._single_flight(request_key, request)
+
+    def _request(self, url, params, response_type, timeout=None):
+        """캐시 없이 API를 한 번 호출하고 결과(또는 오류 딕셔너리)를 반환"""
+        if self.key_pool is not None:
+            result = self._request_with_key_pool(url, params, response_type, timeout)
+        else:
+            result = self._send_counted(url, params, response_type, timeout)
+        if isinstance(result, dict) and "error" in result:
+            self._increment("request_errors_total")
+            logger.warning("Request to %s failed: %s", url, redact_service_key(result["error"]))
+        return result
+
+    def _send_counted(self, url, params, response_type, timeout, before_retry=None):
+        with self._inflight_lock:
+            self.request_count += 1
+        self._increment("requests_total")
+        return self._send_request(url, params, response_type, timeout, before_retry)
+
+    def _request_with_key_pool(self, url, params, response_type, timeout):
+        """
+        Send the request with a key from the pool
+
+        A key reported as over its daily quota is retired for the day and a
+        key that gets HTTP 429 rests for RATE_LIMIT_BACKOFF seconds; either
+        way the request is retried with the next available key. Retries of
+        transient failures take another token of the same key, so every
+        HTTP attempt counts toward its rate and daily quota.
+        """
+        # 키마다 한 번씩 시도하면 충분 (모든 키가 거절하면 마지막 결과를 반환)
+        for _ in range(len(self.key_pool.keys) + 1):
+            started = time.perf_counter()
+            try:
+                key = self.key_pool.acquire()
+            except QuotaExhaustedError as e:
+                return {"error": str(e), "quota_exhausted": True}
+            self._observe("key_wait_seconds", time.perf_counter() - started)
+            try:
+                result = self._send_counted(url, {**params, "serviceKey": key}, response_type, timeout,
+                                            before_retry=functools.partial(self.key_pool.acquire, key=key))
+            except QuotaExhaustedError as e:
+                # 재시도 중에 이 키의 한도가 다 되면 다음 키로 다시 요청
+                result = {"error": str(e), "quota_exhausted": True}
+                continue
+            if is_quota_exceeded(result):
+                logger.warning("Service key %s exceeded its daily quota, rotating", key_id(key))
+                self._increment("quota_exceeded_total")
+                self.key_pool.mark_exhausted(key)
+            elif isinstance(result, dict) and result.get("status") == RATE_LIMITED_STATUS:
+                logger.info("Service key %s was rate limited, backing off", key_id(key))
+                self._increment("rate_limited_total")
+                self.key_pool.backoff(key, RATE_LIMIT_BACKOFF)
+            else:
+                return result
+        return result
+
+    def _send_request(self, url, params, response_type, timeout=None, before_retry=None):
+        try:
+            response = self.get(url, params, timeout=timeout, before_retry=before_retry)
+
+            if response_type == "json":
+                # 원본 응답은 디버그 로그를 켠 경우에만 기록
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Raw response: %s", response.text)
+
+                # Check if response is empty
+                if not response.content.strip():
+                    return {"error": "Empty response received from server"}
+
+                try:
+                    started = time.perf_counter()
+                    result = loads(response.content)
+                    self._observe("json_decode_seconds", time.perf_counter() - started)
+                except ValueError as json_err:
+                    return {"error": f"Failed to parse JSON response: {json_err}", "raw_response": response.text}
+            else:
+                result = response.text
+        except requests.exceptions.ConnectionError:
+            return {"error": "Connection error occurred. Please check your network or the API server."}
+        except requests.exceptions.Timeout:
+            return {"error": "The request timed out. Please try again later."}
+        except requests.exceptions.HTTPError as e:
+            return {"error": f"An error occurred: {describe_request_error(e)}", "status": e.response.status_code}
+        except requests.exceptions.RequestException as e:
+            return {"error": f"An error occurred: {describe_request_error(e)}"}
+        return result
+
+    def stream_xml_page(self, url, params, timeout=None):
+        """
+        Request one XML page and parse its items while they are downloaded
+
+        The header is read before returning, so error result codes raise
+        here; the items are only parsed as the returned XmlPage is
+        iterated. With a key pool, a key over its quota is retired and
+        the request is sent again with the next key. Streamed pages bypass
+        the response cache and request coalescing.
+
+        :param url: Endpoint URL
+        :param params: Query parameters, including the service key
+        :param timeout: (connect, read) timeout in seconds for this call (client default if None)
+        :return: XmlPage
+        :raises BuildingApiError: If the request fails or the result code is not 00
+        """
+        params = {**params, "_type": "xml"}
+        attempts = len(self.key_pool.keys) + 1 if self.key_pool is not None else 1
+        for _ in range(attempts):
+            key = None
+            if self.key_pool is not None:
+                try:
+                    key = self.key_pool.acquire()
+                except QuotaExhaustedError as e:
+                    raise BuildingApiError(str(e)) from None
+                params["serviceKey"] = key
+            with self._inflight_lock:
+                self.request_count += 1
+            self._increment("requests_total")
+            before_retry = functools.partial(self.key_pool.acquire, key=key) if key is not None else None
+            try:
+                response = self.get(url, params, timeout=timeout, stream=True, before_retry=before_retry)
+            except QuotaExhaustedError:
+                continue
+            except requests.exceptions.HTTPError as e:
+                if key is not None and e.response.status_code == RATE_LIMITED_STATUS:
+                    logger.info("Service key %s was rate limited, backing off", key_id(key))
+                    self._increment("rate_limited_total")
+                    self.key_pool.backoff(key, RATE_LIMIT_BACKOFF)
+                    continue
+                self._increment("request_errors_total")
+                raise BuildingApiError(f"An error occurred: {describe_request_error(e)}") from None
+            except requests.exceptions.RequestException as e:
+                self._increment("request_errors_total")
+                raise BuildingApiError(f"An error occurred: {describe_request_error(e)}") from None
+
+            # 압축된 응답도 풀어서 읽도록 설정
+            response.raw.decode_content = True
+            page = XmlPage(iter_xml_events(response.raw), response)
+            try:
+                header = page.read_header()
+            except BuildingApiError:
+                page.close()
+                self._increment("request_errors_total")
+                raise
+            if header.get('resultCode') == QUOTA_EXCEEDED_CODE and key is not None:
+                page.close()
+                logger.warning("Service key %s exceeded its daily quota, rotating", key_id(key))
+                self._increment("quota_exceeded_total")
+                self.key_pool.mark_exhausted(key)
+                continue
+            if header.get('resultCode') != "00":
+                page.close()
+                self._increment("request_errors_total")
+                raise BuildingApiError(f"{header.get('resultCode')}: {header.get('resultMsg')}")
+            return page
+        raise BuildingApiError("요청 한도를 넘지 않은 서비스키가 없습니다.")
+
+    def _single_flight(self, key, fetch):
+        """
+        Run fetch once for concurrent calls with the same key
+
+        The first caller runs fetch; callers arriving while it is in flight
+        wait for it and get the same result object, or the same exception.
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            else:
+                self.coalesced_count += 1
+        if not leader:
+            self._increment("coalesced_total")
+            return future.result()
+
+        try:
+            result = fetch()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+    def stats(self):
+        """
+        Return request counters
+
+        :return: Dictionary with requests (API calls sent), coalesced (calls
+                 that shared an in-flight request) and in_flight
+        """
+        with self._inflight_lock:
+            return {"requests": self.request_count, "coalesced": self.coalesced_count,
+                    "in_flight": len(self._inflight)}
+
+    def iter_building_pages(self, sigungu_cd, bjdong_cd, plat_gb_cd, bun, ji, page_size=DEFAULT_PAGE_SIZE,
+                            refresh=False, response_type="json"):
+        """
+        Iterate over all pages of building title information for one parcel.
+
+        Page N+1 is requested in the background while the caller consumes
+        page N, and iteration stops once totalCount items have been yielded,
+        so only about two pages are held in memory at any time. With
+        ``response_type="xml"`` each page is parsed while it downloads
+        (see stream_xml_page) and is not cached.
+
+        :param sigungu_cd: City/district code
+        :param bjdong_cd: Legal dong code
+        :param plat_gb_cd: Land classification code (0: land, 1: mountain, etc.)
+        :param bun: Main lot number
+        :param ji: Sub lot number
+        :param page_size: Number of rows requested per page
+        :param refresh: Skip cached entries and store fresh responses
+        :param response_type: "json" or "xml"
+        :return: Generator of (page number, list of items, totalCount) tuples
+        :raises BuildingApiError: If a page cannot be fetched
+        """
+        executor = self._get_prefetch_executor()
+
+        def fetch(page_no):
+            if response_type == "xml":
+                return self._fetch_xml_page(sigungu_cd, bjdong_cd, plat_gb_cd, bun, ji, page_size, page_no)
+            response = self.fetch_building_info(sigungu_cd, bjdong_cd, plat_gb_cd, bun, ji,
+                                                rows=page_size, page=page_no, refresh=refresh)
+            return extract_items(response), extract_total_count(response)
+
+        page_no = 1
+        remaining = None
+        future = executor.submit(fetch, page_no)
+        try:
+            while future is not None:
+                items, total_count = future.result()
+                future = None
+                if remaining is None:
+                    remaining = total_count
+                items = items[:remaining]
+                remaining -= len(items)
+
+                # 다음 페이지를 미리 요청해 두고 현재 페이지를 넘겨줌
+                if remaining > 0 and items:
+                    future = executor.submit(fetch, page_no + 1)
+                yield page_no, items, total_count
+                page_no += 1
+        finally:
+            if future is not None:
+                future.cancel()
+
+    def iter_building_items(self, sigungu_cd, bjdong_cd, plat_gb_cd, bun, ji, page_size=DEFAULT_PAGE_SIZE,
+                            refresh=False, response_type="json"):
+        """
+        Iterate over every building title item of one parcel across all pages.
+
+        With ``response_type="xml"`` items are yielded one at a time as they
+        are parsed from the response stream, so not even a whole page is
+        held in memory.
+
+        :param page_size: Number of rows requested per page
+        :param refresh: Skip cached entries and store fresh responses (json only)
+        :param response_type: "json" or "xml"
+        :return: Generator of item dictionaries
+        :raises BuildingApiError: If a page cannot be fetched
+        """
+        if response_type != "xml":
+            for _, items, _ in self.iter_building_pages(sigungu_cd, bjdong_cd, plat_gb_cd, bun, ji,
+                                                        page_size=page_size, refresh=refresh):
+                yield from items
+            return
+
+        page_no = 1
+        received = 0
+        while True:
+            page = self.stream_xml_page(self.title_info_url, self._title_params(
+                sigungu_cd, bjdong_cd, plat_gb_cd, bun, ji, page_size, page_no))
+            page_items = 0
+            with page:
+                for item in page:
+                    page_items += 1
+                    yield item
+            received += page_items
+            if not page_items or received >= (page.total_count or 0):
+                return
+            page_no += 1
+
+    def iter_building_titles(self, sigungu_cd, bjdong_cd, plat_gb_cd, bun, ji, page_size=DEFAULT_PAGE_SIZE,
+                             refresh=False):
+        """
+        Iterate over every building of one parcel as compact BuildingTitle records.
+
+        :param page_size: Number of rows requested per page
+        :param refresh: Skip cached entries and store fresh responses
+        :return: Generator of BuildingTitle
+        :raises BuildingApiError: If a page cannot be fetched
+        """
+        for _, items, _ in self.iter_building_pages(sigungu_cd, bjdong_cd, plat_gb_cd, bun, ji,
+                                                    page_size=page_size, refresh=refresh):
+            yield from to_titles(items)
+
+    def _title_params(self, sigungu_cd, bjdong_cd, plat_gb_cd, bun, ji, page_size, page_no):
+        return {
+            "serviceKey": self.service_key,
+            "sigunguCd": sigungu_cd,
+            "bjdongCd": bjdong_cd,
+            "platGbCd": plat_gb_cd,
+            "bun": bun,
+            "ji": ji,
+            "numOfRows": page_size,
+            "pageNo": page_no,
+            "_type": "xml",
+        }
+
+    def _fetch_xml_page(self, sigungu_cd, bjdong_cd, plat_gb_cd, bun, ji, page_size, page_no):
+        """XML 페이지 하나를 받아 (항목 목록, totalCount) 반환"""
+        with self.stream_xml_page(self.title_info_url, self._title_params(
+                sigungu_cd, bjdong_cd, plat_gb_cd, bun, ji, page_size, page_no)) as page:
+            items = list(page)
+        return items, page.total_count or 0
+
+    def _get_prefetch_executor(self):
+        with self._prefetch_lock:
+            if self._prefetch_executor is None:
+                self._prefetch_executor = ThreadPoolExecutor(max_workers=self._pool_maxsize)
+            return self._prefetch_executor
+
+class XmlPage:
+    """
+    Items of one streamed XML response page
+
+    Iterating parses the items as the body downloads. total_count,
+    page_no and num_of_rows come after the items in the document, so
+    they are only set once iteration has finished. Closes the HTTP
+    response when exhausted or closed.
+    """
+
+    def __init__(self, events, response=None):
+        """
+        :param events: Generator returned by iter_xml_events
+        :param response: Streamed requests.Response to close afterwards
+        """
+        self._events = events
+        self._response = response
+        self.header = None
+        self.total_count = None
+        self.page_no = None
+        self.num_of_rows = None
+
+    def read_header(self):
+        """
+        Read up to the end of the response header
+
+        :return: Dictionary with resultCode and resultMsg
+        :raises BuildingApiError: If the document has no header or is not valid XML
+        """
+        kind, value = self._next_event()
+        if kind != "header":
+            raise BuildingApiError("Unexpected response structure")
+        self.header = value
+        return value
+
+    def _next_event(self):
+        try:
+            return next(self._events)
+        except StopIteration:
+            return None, None
+        except (ParseError, requests.exceptions.RequestException) as e:
+            raise BuildingApiError(f"Failed to parse XML response: {e}") from None
+
+    def __iter__(self):
+        try:
+            while True:
+                kind, value = self._next_event()
+                if kind == "item":
+                    yield value
+                elif kind == "body":
+                    self.total_count = int(value.get('totalCount') or 0)
+                    self.page_no = int(value.get('pageNo') or 0) or None
+                    self.num_of_rows = int(value.get('numOfRows') or 0) or None
+                elif kind is None:
+                    return
+        finally:
+            self.close()
+
+    def close(self):
+        self._events.close()
+        if self._response is not None:
+            self._response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def check_response(response):
+    """
+    Raise BuildingApiError for error dictionaries and non-00 result codes
+
+    :param response: Value returned by fetch_building_info
+    :return: The "body" part of the response
+    """
+    if not isinstance(response, dict):
+        raise BuildingApiError("Expected a JSON response")
+    if "error" in response:
+        raise BuildingApiError(response["error"])
+    try:
+        header = response['response']['header']
+        body = response['response']['body']
+    except (KeyError, TypeError):
+        raise BuildingApiError("Unexpected response structure")
+    if header.get('resultCode') != "00":
+        raise BuildingApiError(f"{header.get('resultCode')}: {header.get('resultMsg')}")
+    return body
+
+def extract_items(response):
+    """
+    Return the list of items of a response
+
+    The API returns an empty string for "items" when nothing matches and a
+    single object instead of a list when exactly one item matches.
+
+    :param response: Value returned by fetch_building_info
+    :return: List of item dictionaries
+    """
+    items = check_response(response).get('items')
+    if not items:
+        return []
+    item = items.get('item', [])
+    if isinstance(item, dict):
+        return [item]
+    return item
+
+def extract_total_count(response):
+    """응답의 totalCount를 정수로 반환"""
+    return int(check_response(response).get('totalCount') or 0)
+
+def is_quota_exceeded(result):
+    """
+    Check whether a result reports that the service key's quota is used up
+
+    The portal's gateway answers with an XML error document even for JSON
+    requests, so the raw text of failed JSON decodes is checked too.
+    """
+    if isinstance(result, str):
+        text = result
+    elif isinstance(result, dict):
+        try:
+            return result['response']['header']['resultCode'] == QUOTA_EXCEEDED_CODE
+        except (KeyError, TypeError):
+            text = result.get("raw_response") or ""
+    else:
+        return False
+    return QUOTA_EXCEEDED_MESSAGE in text or f"<returnReasonCode>{QUOTA_EXCEEDED_CODE}</returnReasonCode>" in text
+
+def is_cacheable(result):
+    """정상 응답(resultCode 00)인지 확인"""
+    if isinstance(result, str):
+        return bool(result.strip())
+    try:
+        return result['response']['header']['resultCode'] == "00"
+    except (KeyError, TypeError):
+        return False
+
+def get_shared_client(service_key, cache=None):
+    """
+    Return a process-wide client for the given service key and cache
+
+    :param service_key: Decoded service key from the public data portal
+    :param cache: ResponseCache used by the client
+    :return: BuildingRegistryClient
+    """
+    with _shared_clients_lock:
+        client = _shared_clients.get((service_key, cache))
+        if client is None:
+            client = BuildingRegistryClient(service_key, cache=cache)
+            _shared_clients[(service_key, cache)] = client
+        return client
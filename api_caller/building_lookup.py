@@ -0,0 +1,178 @@
+import itertools
+import sys
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from building_client import DEFAULT_PAGE_SIZE
+from building_records import BUILDING_TITLE_FIELDS, BuildingTitle, format_value
+
+def parse_pnu(pnu):
+    """
+    Parse PNU code into its components
+    
+    :param pnu: 19-digit PNU code
+    :return: Dictionary containing PNU components
+    """
+    if len(pnu) != 19:
+        raise ValueError("PNU must be 19 digits")
+        
+    # 산구분코드 처리
+    san_value = pnu[10:11]
+    if not san_value:
+        raise ValueError("Invalid PNU format: missing plat_gb_cd")
+    
+    return {
+        'sigungu_cd': pnu[0:5],      # 시군구코드 (앞 5자리)
+        'bjdong_cd': pnu[5:10],      # 법정동코드 (다음 5자리)
+        'plat_gb_cd': str(int(san_value) - 1),  # 산여부 (0->-1, 1->0)
+        'bun': pnu[11:15].zfill(4),  # 본번 (4자리로 채우기)
+        'ji': pnu[15:].zfill(4)      # 부번 (4자리로 채우기)
+    }
+
+def check_pnu(pnu):
+    """
+    Validate a PNU entered by the user
+
+    :param pnu: PNU string
+    :raises ValueError: If the PNU is not 19 digits
+    """
+    if len(pnu) != 19:
+        raise ValueError("PNU는 반드시 19자리여야 합니다.")
+
+    if not pnu.isdigit():
+        raise ValueError("PNU는 숫자로만 구성되어야 합니다.")
+
+def format_building_info(item):
+    """
+    건축물 정보를 보기 좋게 포맷팅
+
+    :param item: BuildingTitle or building title item dictionary
+    """
+    title = item if isinstance(item, BuildingTitle) else BuildingTitle.from_item(item)
+    v = {name: format_value(getattr(title, name)) for name in BUILDING_TITLE_FIELDS}
+    return f"""
+📍 기본 정보
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+• 건물명: {v['bldNm']}
+• 지번 주소: {v['platPlc']}
+• 도로명 주소: {v['newPlatPlc']}
+• 동번호: {v['dongNm']}
+
+🏗️ 건축물 규모
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+• 건축면적: {v['archArea']}㎡
+• 연면적: {v['totArea']}㎡
+• 용적률: {v['vlRat']}%
+• 건폐율: {v['bcRat']}%
+• 지상층수: {v['grndFlrCnt']}층
+• 지하층수: {v['ugrndFlrCnt']}층
+• 세대수: {v['hhldCnt']}세대
+
+🏠 건축물 특성
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+• 구조: {v['strctCdNm']}
+• 주용도: {v['mainPurpsCdNm']}
+• 세부용도: {v['etcPurps']}
+• 지붕: {v['roofCdNm']}
+
+📅 인허가 정보
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+• 허가일: {v['pmsDay']}
+• 사용승인일: {v['useAprDay']}"""
+
+def iter_pnus(source):
+    """
+    Iterate PNU strings from a file or an iterable
+
+    :param source: Path of a file with one PNU per line ("-" for stdin) or an iterable of PNUs
+    :return: Generator of stripped PNU strings (blank lines are skipped)
+    """
+    if isinstance(source, str):
+        if source == "-":
+            lines = sys.stdin
+        else:
+            with open(source, 'r', encoding='utf-8-sig') as pnu_file:
+                yield from iter_pnus(pnu_file)
+            return
+    else:
+        lines = source
+
+    for line in lines:
+        pnu = str(line).strip()
+        if pnu:
+            yield pnu
+
+def lookup_pnu(client, pnu, page_size=DEFAULT_PAGE_SIZE, refresh=False, code_table=None):
+    """
+    Parse a single PNU and fetch all of its building title items
+
+    Never raises: any failure is reported in the returned record instead.
+
+    :param client: BuildingRegistryClient used for the request
+    :param pnu: 19-digit PNU code
+    :param page_size: Number of rows requested per page
+    :param refresh: Skip cached entries and store fresh responses
+    :param code_table: CodeTable used to validate and label the legal dong (optional)
+    :return: Dictionary with pnu, params, bjdong_name, total_count, items, error and error_type
+    """
+    record = {"pnu": pnu, "params": None, "bjdong_name": None, "total_count": None, "items": None,
+              "error": None, "error_type": None}
+    try:
+        check_pnu(pnu)
+        if code_table is not None:
+            # 존재하지 않거나 폐지된 법정동이면 API를 호출하지 않음
+            record["bjdong_name"] = code_table.name(pnu[:10])
+            code_table.validate_pnu(pnu)
+        record["params"] = parse_pnu(pnu)
+        items = []
+        for _, page_items, total_count in client.iter_building_pages(**record["params"], page_size=page_size,
+                                                                      refresh=refresh):
+            record["total_count"] = total_count
+            items.extend(page_items)
+        record["items"] = items
+    except Exception as e:
+        record["error"] = str(e)
+        record["error_type"] = type(e).__name__
+    return record
+
+def fetch_building_info_batch(client, pnus, max_workers=8, page_size=DEFAULT_PAGE_SIZE, refresh=False,
+                              code_table=None, lookup=None):
+    """
+    Fetch building registry information for many PNUs concurrently.
+
+    PNUs are consumed lazily from ``pnus`` and at most ``max_workers * 2``
+    lookups are queued at any time, so arbitrarily large inputs can be
+    streamed. Records are yielded in completion order, not input order.
+
+    :param client: BuildingRegistryClient shared by all workers
+    :param pnus: Iterable of 19-digit PNU codes
+    :param max_workers: Number of concurrent requests
+    :param page_size: Number of rows requested per page
+    :param refresh: Skip cached entries and store fresh responses
+    :param code_table: CodeTable used to validate and label the legal dong (optional)
+    :param lookup: Callable with lookup_pnu's signature run for each PNU (lookup_pnu if None)
+    :return: Generator of records as returned by lookup
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    lookup = lookup or lookup_pnu
+
+    pnu_iter = iter(pnus)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = set()
+
+    def submit(count):
+        for pnu in itertools.islice(pnu_iter, count):
+            pending.add(executor.submit(lookup, client, pnu, page_size, refresh, code_table))
+
+    try:
+        submit(max_workers * 2)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            pending.difference_update(done)
+            # 완료된 만큼 다음 PNU를 채워 넣어 대기열 크기를 유지
+            submit(len(done))
+            for future in done:
+                yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
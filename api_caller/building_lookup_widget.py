@@ -0,0 +1,180 @@
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QTextEdit, QLabel,
+                             QProgressBar, QTableView, QSplitter, QAbstractItemView, QHeaderView)
+from PyQt5.QtCore import Qt, QThreadPool
+from building_client import BuildingRegistryClient
+from building_lookup import check_pnu, format_building_info, parse_pnu
+from building_result_model import BuildingTableModel
+from building_worker import BuildingLookupWorker
+from code_table import get_default_code_table
+from key_pool import get_default_key_pool
+from response_cache import get_default_cache
+
+class BuildingLookupWidget(QWidget):
+    """
+    PNU input, building table and detail view of one building lookup
+
+    Lookups run on a BuildingLookupWorker in the global thread pool; pages
+    are appended to the table as they arrive, and a new search cancels the
+    one still in flight. Hosts embed the widget and call cancel_search()
+    when they close.
+    """
+
+    def __init__(self, client=None, code_table=None, parent=None):
+        """
+        :param client: BuildingRegistryClient used for the lookups (shared key pool and cache if None)
+        :param code_table: CodeTable used to validate and label the legal dong (default table if None)
+        :param parent: Parent widget
+        :raises MissingServiceKeyError: If client is None and no service key is configured
+        """
+        super().__init__(parent)
+        # 서비스키는 요청 한도를 관리하는 공용 키 풀에서 선택
+        self.client = client or BuildingRegistryClient(None, cache=get_default_cache(),
+                                                       key_pool=get_default_key_pool())
+        self.code_table = code_table if code_table is not None else get_default_code_table()
+
+        # 백그라운드 조회용 스레드 풀
+        self.thread_pool = QThreadPool.globalInstance()
+        self.current_worker = None
+        self.request_id = 0
+        self.loaded_count = 0
+        self.query_text = ""
+        self.initUI()
+
+    def initUI(self):
+        layout = QVBoxLayout(self)
+
+        # PNU 입력 필드와 조회 버튼
+        input_layout = QHBoxLayout()
+        self.pnu_input = QLineEdit()
+        self.pnu_input.setPlaceholderText("PNU를 입력하세요 (19자리)")
+        self.search_btn = QPushButton("검색")
+        self.search_btn.clicked.connect(self.search_building)
+        self.pnu_input.returnPressed.connect(self.search_building)
+        input_layout.addWidget(self.pnu_input)
+        input_layout.addWidget(self.search_btn)
+
+        # 진행 상태 표시 (첫 페이지를 받기 전까지는 대기 표시)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFormat("%v / %m")
+        self.progress_bar.hide()
+
+        # 조회 파라미터와 상태 표시
+        self.status_label = QLabel()
+        self.status_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+
+        # 결과 표시 영역: 건물 한 동이 한 행, 아래에는 선택한 건물의 상세 정보
+        self.result_model = BuildingTableModel(self)
+        self.result_table = QTableView()
+        self.result_table.setModel(self.result_model)
+        self.result_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.result_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.result_table.verticalHeader().setDefaultSectionSize(22)
+        self.result_table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.result_table.horizontalHeader().setStretchLastSection(True)
+        self.result_table.selectionModel().currentRowChanged.connect(self.show_selected_building)
+
+        self.detail_view = QTextEdit()
+        self.detail_view.setReadOnly(True)
+
+        splitter = QSplitter(Qt.Vertical)
+        splitter.addWidget(self.result_table)
+        splitter.addWidget(self.detail_view)
+        splitter.setSizes([300, 300])
+
+        layout.addLayout(input_layout)
+        layout.addWidget(self.progress_bar)
+        layout.addWidget(self.status_label)
+        layout.addWidget(splitter)
+
+    def search_building(self):
+        """입력한 PNU를 검증하고 백그라운드 조회 시작"""
+        try:
+            pnu = self.pnu_input.text().strip()
+            check_pnu(pnu)
+
+            # 법정동코드 표가 있으면 존재하는 법정동인지 확인
+            if self.code_table is not None:
+                self.code_table.validate_pnu(pnu)
+
+            params = parse_pnu(pnu)
+
+            # 진행 중인 조회를 취소하고 새 조회를 백그라운드에서 시작
+            self.cancel_search()
+            self.request_id += 1
+            self.loaded_count = 0
+
+            worker = BuildingLookupWorker(self.client, self.request_id, params)
+            worker.signals.page_loaded.connect(self.on_page_loaded)
+            worker.signals.finished.connect(self.on_search_finished)
+            worker.signals.failed.connect(self.on_search_failed)
+            self.current_worker = worker
+
+            self.display_header(pnu, params)
+            self.progress_bar.setRange(0, 0)
+            self.progress_bar.show()
+            self.thread_pool.start(worker)
+
+        except ValueError as e:
+            self.show_message(f"❌ 오류: {e}")
+        except Exception as e:
+            self.show_message(f"❌ 예상치 못한 오류가 발생했습니다: {e}")
+
+    def cancel_search(self):
+        """진행 중인 조회 취소"""
+        if self.current_worker is not None:
+            self.current_worker.cancel()
+            self.current_worker = None
+        self.progress_bar.hide()
+
+    def show_message(self, message):
+        """상태 메시지를 표시하고 이전 결과를 비움"""
+        self.status_label.setText(message)
+        self.result_model.clear()
+        self.detail_view.clear()
+
+    def display_header(self, pnu, params):
+        """조회 파라미터를 먼저 표시"""
+        dong_part = ""
+        if self.code_table is not None:
+            dong_part = f" · 법정동 {self.code_table.name(pnu[:10])}"
+        self.query_text = (f"▶ 시군구코드 {params['sigungu_cd']} · 법정동코드 {params['bjdong_cd']}{dong_part}"
+                           f" · 대지구분 {params['plat_gb_cd']} · 본번 {params['bun']} · 부번 {params['ji']}")
+        self.show_message(f"{self.query_text}\n조회 중입니다...")
+
+    def show_selected_building(self, current, previous=None):
+        """선택한 건물의 상세 정보만 표시"""
+        if not current.isValid():
+            self.detail_view.clear()
+            return
+        self.detail_view.setPlainText(format_building_info(self.result_model.title_at(current.row())).lstrip("\n"))
+
+    def on_page_loaded(self, request_id, page_no, titles, total_count):
+        # 이미 취소된 조회의 결과는 무시
+        if request_id != self.request_id:
+            return
+
+        if page_no == 1:
+            self.status_label.setText(f"{self.query_text}\n🏢 총 {total_count}개의 건축물이 검색되었습니다.")
+            self.progress_bar.setRange(0, total_count)
+
+        # 페이지 단위로 행 추가 (첫 건물은 바로 선택해 상세 정보 표시)
+        self.result_model.append_titles(titles)
+        if page_no == 1 and titles:
+            self.result_table.selectRow(0)
+            self.result_table.resizeColumnsToContents()
+
+        self.loaded_count += len(titles)
+        self.progress_bar.setValue(self.loaded_count)
+
+    def on_search_finished(self, request_id):
+        if request_id != self.request_id:
+            return
+        self.current_worker = None
+        self.progress_bar.hide()
+
+    def on_search_failed(self, request_id, message):
+        if request_id != self.request_id:
+            return
+        self.current_worker = None
+        self.progress_bar.hide()
+        self.status_label.setText(f"{self.status_label.text()}\n❌ 예상치 못한 오류가 발생했습니다: {message}")
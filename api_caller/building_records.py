@@ -0,0 +1,174 @@
+import json
+from xml.etree.ElementTree import iterparse
+from title_schema import TITLE_INFO_COLUMNS, convert_value
+
+try:
+    import orjson
+except ImportError:  # 설치되어 있지 않으면 표준 json 모듈 사용
+    orjson = None
+
+# 사용 중인 JSON 해석기 이름
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+_TITLE_KINDS = dict(TITLE_INFO_COLUMNS)
+
+# XML 응답의 머리글 요소 (정상 응답은 header, 게이트웨이 오류 응답은 cmmMsgHeader)
+_XML_HEADER_TAGS = frozenset(('header', 'cmmMsgHeader'))
+
+# BuildingTitle이 보관하는 표제부 항목 (화면 표시, 필지 요약에 쓰는 항목만)
+BUILDING_TITLE_FIELDS = (
+    'mgmBldrgstPk', 'bldNm', 'platPlc', 'newPlatPlc', 'dongNm',
+    'platArea', 'archArea', 'totArea', 'vlRat', 'bcRat',
+    'grndFlrCnt', 'ugrndFlrCnt', 'hhldCnt',
+    'strctCdNm', 'mainPurpsCdNm', 'etcPurps', 'roofCdNm',
+    'pmsDay', 'useAprDay',
+)
+
+def loads(data):
+    """
+    Decode a JSON document with the fastest available backend
+
+    :param data: JSON text as bytes or str
+    :return: Decoded object
+    :raises ValueError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+class BuildingTitle:
+    """
+    One building of a getBrTitleInfo response
+
+    Keeps only BUILDING_TITLE_FIELDS, with numeric fields parsed once to
+    int/float and empty values stored as None. Uses __slots__, so a record
+    costs a fraction of the API's item dictionary.
+    """
+
+    __slots__ = BUILDING_TITLE_FIELDS
+
+    def __init__(self, **values):
+        for name in BUILDING_TITLE_FIELDS:
+            setattr(self, name, values.get(name))
+
+    @classmethod
+    def from_item(cls, item):
+        """
+        Build a record from an API item dictionary
+
+        :param item: Building title item as returned by the API
+        :return: BuildingTitle
+        """
+        title = cls.__new__(cls)
+        for name in BUILDING_TITLE_FIELDS:
+            setattr(title, name, convert_value(item.get(name), _TITLE_KINDS[name]))
+        return title
+
+    def __getitem__(self, name):
+        # 기존 item['필드명'] 형태의 코드와 호환
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def get(self, name, default=None):
+        value = getattr(self, name, None)
+        return default if value is None else value
+
+    def to_dict(self):
+        """필드명 -> 값 딕셔너리"""
+        return {name: getattr(self, name) for name in BUILDING_TITLE_FIELDS}
+
+    def __eq__(self, other):
+        if not isinstance(other, BuildingTitle):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in BUILDING_TITLE_FIELDS)
+
+    def __repr__(self):
+        return f"BuildingTitle(mgmBldrgstPk={self.mgmBldrgstPk!r}, bldNm={self.bldNm!r}, platPlc={self.platPlc!r})"
+
+def to_titles(items):
+    """
+    Convert API items to BuildingTitle records
+
+    :param items: Item dictionaries, a single item dictionary, or an empty value
+    :return: List of BuildingTitle
+    """
+    if not items:
+        return []
+    if isinstance(items, dict):
+        items = [items]
+    return [item if isinstance(item, BuildingTitle) else BuildingTitle.from_item(item) for item in items]
+
+def decode_titles(data):
+    """
+    Decode a raw getBrTitleInfo JSON body straight into records
+
+    Only the header, totalCount and the kept item fields are read; the
+    decoded document is dropped as soon as the records are built.
+
+    :param data: Response body as bytes or str
+    :return: Tuple of (list of BuildingTitle, totalCount)
+    :raises ValueError: If the body is not valid JSON or has an error result code
+    """
+    document = loads(data)
+    try:
+        header = document['response']['header']
+        body = document['response']['body']
+    except (KeyError, TypeError):
+        raise ValueError("Unexpected response structure") from None
+    if header.get('resultCode') != "00":
+        raise ValueError(f"{header.get('resultCode')}: {header.get('resultMsg')}")
+    items = body.get('items')
+    titles = to_titles(items.get('item') if isinstance(items, dict) else None)
+    return titles, int(body.get('totalCount') or 0)
+
+def iter_xml_events(source):
+    """
+    Parse a data.go.kr XML response incrementally
+
+    Elements are read from ``source`` as bytes arrive. Each <item> becomes
+    a dictionary of its child elements, with the same keys as an item of
+    the JSON response and text values ("" for empty elements), and is
+    cleared as soon as it is yielded. Memory use does not depend on the
+    page size.
+
+    The gateway's error document (<OpenAPI_ServiceResponse>) gives a header
+    whose resultCode is its returnReasonCode.
+
+    :param source: Binary file-like object (e.g. the raw HTTP response stream)
+    :return: Generator of ("header", {"resultCode", "resultMsg"}), then ("item", item dictionary)
+             for every item, then ("body", {"numOfRows", "pageNo", "totalCount"})
+    :raises xml.etree.ElementTree.ParseError: If the document is not well-formed XML
+    """
+    parents = []
+    body = {}
+    for event, element in iterparse(source, events=("start", "end")):
+        if event == "start":
+            parents.append(element)
+            continue
+        parents.pop()
+        tag = element.tag
+        if tag == 'item':
+            yield "item", {child.tag: child.text or "" for child in element}
+            # 처리한 항목은 부모(items)에서 떼어내 메모리에 남지 않게 함
+            if parents:
+                parents[-1].remove(element)
+        elif tag in _XML_HEADER_TAGS:
+            fields = {child.tag: child.text or "" for child in element}
+            yield "header", {
+                'resultCode': fields.get('resultCode', fields.get('returnReasonCode')),
+                'resultMsg': fields.get('resultMsg') or fields.get('returnAuthMsg') or fields.get('errMsg'),
+            }
+            element.clear()
+        elif tag in ('numOfRows', 'pageNo', 'totalCount') and parents and parents[-1].tag == 'body':
+            body[tag] = element.text
+    yield "body", body
+
+def format_value(value):
+    """표시용 문자열 (빈 값은 빈 문자열, 정수 값 실수는 소수점 없이)"""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
@@ -0,0 +1,73 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from building_records import format_value
+
+# 결과 표에 표시할 열: (BuildingTitle 필드명, 제목)
+RESULT_COLUMNS = (
+    ('bldNm', "건물명"),
+    ('dongNm', "동"),
+    ('mainPurpsCdNm', "주용도"),
+    ('totArea', "연면적(㎡)"),
+    ('grndFlrCnt', "지상층수"),
+    ('ugrndFlrCnt', "지하층수"),
+    ('useAprDay', "사용승인일"),
+)
+
+# 오른쪽 정렬할 숫자 열
+_NUMERIC_FIELDS = frozenset(('totArea', 'grndFlrCnt', 'ugrndFlrCnt'))
+
+class BuildingTableModel(QAbstractTableModel):
+    """
+    Table model over the BuildingTitle records of one lookup
+
+    Pages are appended as they arrive, and cells are only formatted when
+    the view asks for them, so a parcel with hundreds of buildings costs
+    one row insert per page instead of a full text relayout.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._titles = []
+
+    def clear(self):
+        self.beginResetModel()
+        self._titles = []
+        self.endResetModel()
+
+    def append_titles(self, titles):
+        """조회된 페이지의 레코드를 뒤에 추가"""
+        if not titles:
+            return
+        first = len(self._titles)
+        self.beginInsertRows(QModelIndex(), first, first + len(titles) - 1)
+        self._titles.extend(titles)
+        self.endInsertRows()
+
+    def title_at(self, row):
+        return self._titles[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._titles)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(RESULT_COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        name = RESULT_COLUMNS[index.column()][0]
+        if role == Qt.DisplayRole:
+            return format_value(getattr(self._titles[index.row()], name))
+        if role == Qt.TextAlignmentRole and name in _NUMERIC_FIELDS:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return RESULT_COLUMNS[section][1]
+        return str(section + 1)
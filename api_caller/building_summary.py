@@ -0,0 +1,85 @@
+from building_client import DEFAULT_PAGE_SIZE
+from building_lookup import fetch_building_info_batch
+from title_schema import KIND_DOUBLE, KIND_INT, KIND_STRING, convert_value
+
+# 필지 단위로 합칠 수 있는 표제부 항목: API 필드명 -> (값 종류, 집계 방식, 설명)
+# 한 필지에 건물이 여러 동 있으면 면적/세대수는 합계, 층수/비율은 최댓값,
+# 사용승인일은 가장 이른 날짜, 나머지 문자열은 첫 번째 값을 사용
+SUMMARY_FIELDS = {
+    'totArea': (KIND_DOUBLE, "sum", "연면적(㎡)"),
+    'archArea': (KIND_DOUBLE, "sum", "건축면적(㎡)"),
+    'platArea': (KIND_DOUBLE, "max", "대지면적(㎡)"),
+    'vlRat': (KIND_DOUBLE, "max", "용적률(%)"),
+    'bcRat': (KIND_DOUBLE, "max", "건폐율(%)"),
+    'grndFlrCnt': (KIND_INT, "max", "지상층수"),
+    'ugrndFlrCnt': (KIND_INT, "max", "지하층수"),
+    'hhldCnt': (KIND_INT, "sum", "세대수"),
+    'useAprDay': (KIND_STRING, "min", "사용승인일"),
+    'mainPurpsCdNm': (KIND_STRING, "first", "주용도"),
+    'strctCdNm': (KIND_STRING, "first", "구조"),
+    'bldNm': (KIND_STRING, "first", "건물명"),
+}
+
+# 건물 동 수를 담는 추가 필드
+BUILDING_COUNT_FIELD = 'bldCnt'
+
+DEFAULT_SUMMARY_FIELDS = ('totArea', 'vlRat', 'bcRat', 'grndFlrCnt', 'useAprDay')
+
+def summarize_items(items, fields=DEFAULT_SUMMARY_FIELDS):
+    """
+    Combine the building title items of one parcel into a single row
+
+    :param items: Building title items of a parcel
+    :param fields: SUMMARY_FIELDS keys to compute
+    :return: Dictionary of field -> value (None when no building has a value), plus BUILDING_COUNT_FIELD
+    """
+    summary = {}
+    for field in fields:
+        kind, method, _ = SUMMARY_FIELDS[field]
+        values = [value for value in (convert_value(item.get(field), kind) for item in items) if value is not None]
+        if not values:
+            summary[field] = None
+        elif method == "sum":
+            summary[field] = sum(values)
+        elif method == "max":
+            summary[field] = max(values)
+        elif method == "min":
+            summary[field] = min(values)
+        else:
+            summary[field] = values[0]
+    summary[BUILDING_COUNT_FIELD] = len(items)
+    return summary
+
+def fetch_parcel_summaries(client, pnus, fields=DEFAULT_SUMMARY_FIELDS, max_workers=8,
+                           page_size=DEFAULT_PAGE_SIZE, code_table=None, progress=None, is_canceled=None):
+    """
+    Look up every distinct PNU once and summarize its buildings
+
+    :param client: BuildingRegistryClient shared by all workers
+    :param pnus: Iterable of PNU strings (duplicates are looked up once)
+    :param fields: SUMMARY_FIELDS keys to compute
+    :param max_workers: Number of concurrent requests
+    :param page_size: Number of rows requested per page
+    :param code_table: CodeTable used to skip unknown or abolished legal dongs (optional)
+    :param progress: Callable receiving (done, total) after each PNU (optional)
+    :param is_canceled: Callable returning True to stop early (optional)
+    :return: Tuple of (summaries, errors), both dictionaries keyed by PNU
+    """
+    unique_pnus = sorted(set(pnus))
+    summaries = {}
+    errors = {}
+    records = fetch_building_info_batch(client, unique_pnus, max_workers=max_workers, page_size=page_size,
+                                        code_table=code_table)
+    try:
+        for done, record in enumerate(records, 1):
+            if record["error"] is None:
+                summaries[record["pnu"]] = summarize_items(record["items"], fields)
+            else:
+                errors[record["pnu"]] = record["error"]
+            if progress is not None:
+                progress(done, len(unique_pnus))
+            if is_canceled is not None and is_canceled():
+                break
+    finally:
+        records.close()
+    return summaries, errors
@@ -0,0 +1,66 @@
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+from building_client import DEFAULT_PAGE_SIZE
+from building_records import to_titles
+
+class LookupSignals(QObject):
+    """
+    Signals emitted by BuildingLookupWorker
+
+    Every signal carries the request id the worker was started with, so a
+    window can ignore results of lookups it has already replaced.
+    """
+    # 레코드 목록은 QVariantList로 변환되지 않도록 object로 전달
+    page_loaded = pyqtSignal(int, int, object, int)  # request_id, page_no, BuildingTitle list, total_count
+    finished = pyqtSignal(int)                       # request_id
+    failed = pyqtSignal(int, str)                    # request_id, error message
+
+class BuildingLookupWorker(QRunnable):
+    """
+    Fetch every page of building title information off the GUI thread
+
+    Start it with QThreadPool.start(). Each page is converted to
+    BuildingTitle records on the worker thread and delivered through
+    ``signals``, arriving on the GUI thread as queued signal calls.
+    """
+
+    def __init__(self, client, request_id, params, page_size=DEFAULT_PAGE_SIZE):
+        """
+        :param client: BuildingRegistryClient used for the requests
+        :param request_id: Identifier echoed back in every signal
+        :param params: Parsed PNU parameters from parse_pnu
+        :param page_size: Number of rows requested per page
+        """
+        super().__init__()
+        self.client = client
+        self.request_id = request_id
+        self.params = params
+        self.page_size = page_size
+        self.signals = LookupSignals()
+        self._cancelled = False
+
+    def cancel(self):
+        """
+        Stop delivering results
+
+        A request already on the wire cannot be interrupted, but its result
+        is dropped and no further pages are requested.
+        """
+        self._cancelled = True
+
+    def is_cancelled(self):
+        return self._cancelled
+
+    def run(self):
+        try:
+            for page_no, items, total_count in self.client.iter_building_pages(**self.params,
+                                                                               page_size=self.page_size):
+                if self._cancelled:
+                    return
+                self.signals.page_loaded.emit(self.request_id, page_no, to_titles(items), total_count)
+        except Exception as e:
+            if not self._cancelled:
+                self.signals.failed.emit(self.request_id, str(e))
+            return
+
+        if not self._cancelled:
+            self.signals.finished.emit(self.request_id)
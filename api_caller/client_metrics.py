@@ -0,0 +1,152 @@
+import bisect
+import json
+import threading
+
+# 지연 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 응답 크기 히스토그램 구간 (바이트)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+class Histogram:
+    """
+    Cumulative-bucket histogram in the Prometheus style
+
+    Keeps count, sum, min and max plus a count per upper bound; a value
+    falls into the first bucket whose bound is >= the value.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        """
+        :param buckets: Sorted upper bounds of the buckets (+Inf is implied)
+        """
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def snapshot(self):
+        """
+        Return the histogram as plain data
+
+        :return: Dictionary with count, sum, min, max, mean and cumulative [upper bound, count] buckets
+        """
+        cumulative = []
+        running = 0
+        for bound, bucket_count in zip(self.buckets + ("+Inf",), self.bucket_counts):
+            running += bucket_count
+            cumulative.append([bound, running])
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.sum / self.count if self.count else None,
+            "buckets": cumulative,
+        }
+
+class MetricsRegistry:
+    """
+    Thread-safe in-process counters and histograms
+
+    Clients record into a registry only when one is passed to them, so
+    instrumentation costs nothing unless it is asked for. Snapshots can be
+    exported as JSON or in the Prometheus text format.
+    """
+
+    def __init__(self, histogram_buckets=None):
+        """
+        :param histogram_buckets: Dictionary of histogram name -> bucket bounds
+                                  (LATENCY_BUCKETS for names not listed, SIZE_BUCKETS
+                                  for names ending in "_bytes")
+        """
+        self.histogram_buckets = dict(histogram_buckets or {})
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name, value=1):
+        """카운터 증가"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name, value):
+        """히스토그램에 값 기록"""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                default_buckets = SIZE_BUCKETS if name.endswith("_bytes") else LATENCY_BUCKETS
+                histogram = Histogram(self.histogram_buckets.get(name, default_buckets))
+                self._histograms[name] = histogram
+            histogram.observe(value)
+
+    def counter(self, name):
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def histogram(self, name):
+        """히스토그램 스냅샷 (기록된 값이 없으면 None)"""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            return histogram.snapshot() if histogram is not None else None
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self):
+        """
+        Return every counter and histogram as plain data
+
+        :return: Dictionary with "counters" and "histograms"
+        """
+        with self._lock:
+            return {
+                "counters": dict(sorted(self._counters.items())),
+                "histograms": {name: self._histograms[name].snapshot() for name in sorted(self._histograms)},
+            }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix="building_api"):
+        """
+        Export a snapshot in the Prometheus text exposition format
+
+        :param prefix: Prefix added to every metric name
+        :return: Text ending with a newline
+        """
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in snapshot["counters"].items():
+            metric = f"{prefix}_{name}"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        for name, histogram in snapshot["histograms"].items():
+            metric = f"{prefix}_{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            for bound, count in histogram["buckets"]:
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {count}')
+            lines.append(f"{metric}_sum {histogram['sum']}")
+            lines.append(f"{metric}_count {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """
+        Write a snapshot to a file (Prometheus text for .prom/.txt, JSON otherwise)
+
+        :param path: Output file path
+        """
+        text = self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json()
+        with open(path, 'w', encoding='utf-8') as metrics_file:
+            metrics_file.write(text)
@@ -0,0 +1,466 @@
+import bisect
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from csv_loader import detect_file_encoding
+
+# PNU 도구가 기본으로 읽는 법정동코드 파일 위치
+DEFAULT_CODE_TABLE_PATH = os.path.join(os.path.expanduser("~"), ".qgis_apitest", "bjdong_codes.csv")
+
+# 파싱한 법정동코드 표를 저장해 두는 위치 (원본 CSV마다 파일 하나)
+DEFAULT_SNAPSHOT_DIR = os.path.join(os.path.expanduser("~"), ".qgis_apitest", "snapshots")
+
+# 스냅숏 파일 형식: 머리글 (매직, 버전, 헤더 JSON 길이, 코드 수, 이름 바이트 수, 원본 mtime/크기/SHA-1)
+# 뒤에 헤더 JSON, int64 코드, uint32 이름 오프셋, 폐지 플래그, UTF-8 이름이 8바이트 단위로 정렬되어 이어짐
+SNAPSHOT_MAGIC = b"BJCT"
+SNAPSHOT_VERSION = 1
+_SNAPSHOT_HEADER = struct.Struct("<4sHHIQQqQ20s")
+# 머리글에서 원본 mtime이 놓인 위치 (내용이 같으면 이 값만 고쳐 씀)
+_SOURCE_MTIME = struct.Struct("<q")
+_SOURCE_MTIME_OFFSET = struct.calcsize("<4sHHIQQ")
+
+# 스냅숏에서 다시 만드는 폐지여부 값
+_STATUS_ACTIVE = "존재"
+_STATUS_ABOLISHED = "폐지"
+
+# 법정동코드 계층 (10자리: 시도 2 + 시군구 3 + 읍면동 3 + 리 2)
+LEVEL_SIDO = 0
+LEVEL_SIGUNGU = 1
+LEVEL_EUPMYEONDONG = 2
+LEVEL_RI = 3
+
+LEVEL_NAMES = ("시도", "시군구", "읍면동", "리")
+
+# 각 계층의 코드 앞자리 길이
+_PREFIX_LENGTHS = (2, 5, 8, 10)
+
+_default_code_table = None
+
+def code_level(code):
+    """
+    Return the hierarchy level of a 10-digit legal-dong code
+
+    :param code: Legal-dong code (int or 10-digit string)
+    :return: One of LEVEL_SIDO, LEVEL_SIGUNGU, LEVEL_EUPMYEONDONG, LEVEL_RI
+    """
+    code = int(code)
+    if code % 100000000 == 0:
+        return LEVEL_SIDO
+    if code % 100000 == 0:
+        return LEVEL_SIGUNGU
+    if code % 100 == 0:
+        return LEVEL_EUPMYEONDONG
+    return LEVEL_RI
+
+def prefix_range(code, level=None):
+    """
+    Return the range of codes sharing a code's prefix down to a level
+
+    :param code: Legal-dong code (int or 10-digit string)
+    :param level: Hierarchy level whose prefix is shared (code_level(code) if None)
+    :return: Tuple (lo, hi) of ints; the codes under ``code`` are lo <= c < hi
+    """
+    if level is None:
+        level = code_level(code)
+    scale = 10 ** (10 - _PREFIX_LENGTHS[level])
+    lo = int(code) // scale * scale
+    return lo, lo + scale
+
+class CodeTable:
+    """
+    Compact hierarchical index over 10-digit legal-dong (법정동) codes
+
+    Codes are kept sorted in an int64 array, names in a single UTF-8 blob
+    with a byte offset array, and the 폐지여부 flag in a bytearray. A
+    dictionary maps each code to its position for O(1) lookups, and prefix
+    ranges over the sorted array enumerate the children of a code.
+
+    The same columns can be saved as a binary snapshot and memory-mapped
+    back (see write_snapshot and from_snapshot); a mapped table looks codes
+    up by binary search instead of building the dictionary.
+    """
+
+    def __init__(self, codes, names, abolished, headers=None):
+        """
+        :param codes: Sorted iterable of codes as ints
+        :param names: Names in the same order as codes
+        :param abolished: 폐지 flags (truthy for abolished codes) in the same order as codes
+        :param headers: Header row of the source file (optional, see source_rows)
+        """
+        self.codes = array('q', codes)
+        self.name_offsets = array('I', [0])
+        encoded = []
+        for name in names:
+            name = name.encode('utf-8')
+            encoded.append(name)
+            self.name_offsets.append(self.name_offsets[-1] + len(name))
+        self.name_blob = b"".join(encoded)
+        self.abolished = bytearray(1 if flag else 0 for flag in abolished)
+        self.headers = list(headers) if headers is not None else None
+        self._positions = {code: position for position, code in enumerate(self.codes)}
+        self._snapshot = None
+
+    @classmethod
+    def from_rows(cls, headers, rows):
+        """
+        Build a table from CSV rows of the 법정동코드 file
+
+        The code, name and 폐지여부 columns are found by header; rows whose
+        code is not 10 digits are skipped. When a code appears more than
+        once, an existing (존재) entry wins over an abolished one.
+
+        :param headers: Header row
+        :param rows: Iterable of data rows
+        :return: CodeTable
+        """
+        code_col, name_col, status_col = _find_columns(headers)
+        entries = {}
+        for row_data in rows:
+            code = str(row_data[code_col]).strip()
+            if len(code) != 10 or not code.isdigit():
+                continue
+            name = str(row_data[name_col]).strip()
+            abolished = status_col is not None and str(row_data[status_col]).strip() == "폐지"
+            code = int(code)
+            previous = entries.get(code)
+            if previous is None or (previous[1] and not abolished):
+                entries[code] = (name, abolished)
+
+        codes = sorted(entries)
+        return cls(codes, [entries[code][0] for code in codes], [entries[code][1] for code in codes], headers)
+
+    @classmethod
+    def from_csv(cls, path, encoding=None):
+        """
+        Load a 법정동코드 CSV or tab-separated text file
+
+        :param path: File path
+        :param encoding: File encoding (detected from the first bytes if None)
+        :return: CodeTable
+        """
+        if encoding is None:
+            encoding = detect_file_encoding(path)
+        with open(path, 'r', encoding=encoding, newline='') as code_file:
+            first_line = code_file.readline()
+            delimiter = "\t" if "\t" in first_line else ","
+            headers = next(csv.reader([first_line], delimiter=delimiter))
+            return cls.from_rows(headers, csv.reader(code_file, delimiter=delimiter))
+
+    @classmethod
+    def from_snapshot(cls, path, source_path=None):
+        """
+        Memory-map a snapshot written by write_snapshot
+
+        Nothing is parsed or copied: the columns are views into the mapped
+        file, so opening takes the same time for any table size. If the
+        source was touched but its content is unchanged, the new mtime is
+        written into the header so the next open skips the hash.
+
+        :param path: Snapshot path
+        :param source_path: Source CSV the snapshot must still match (not checked if None)
+        :return: CodeTable, or None if the snapshot is missing, of another version,
+                 damaged, or older than the source file
+        """
+        if sys.byteorder != "little":
+            return None
+        try:
+            with open(path, 'rb') as snapshot_file:
+                mapped = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        try:
+            (magic, version, _, headers_size, count, blob_size, source_mtime, source_size,
+             source_digest) = _SNAPSHOT_HEADER.unpack_from(mapped)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                return None
+            if source_path is not None:
+                current_mtime = _source_mtime_if_matches(source_path, source_mtime, source_size, source_digest)
+                if current_mtime is None:
+                    return None
+                if current_mtime != source_mtime:
+                    _update_source_mtime(path, current_mtime)
+
+            view = memoryview(mapped)
+            offset = _SNAPSHOT_HEADER.size
+            headers = json.loads(bytes(view[offset:offset + headers_size]).decode('utf-8'))
+            offset = _align(offset + headers_size)
+            codes = view[offset:offset + count * 8].cast('q')
+            offset = _align(offset + count * 8)
+            name_offsets = view[offset:offset + (count + 1) * 4].cast('I')
+            offset = _align(offset + (count + 1) * 4)
+            abolished = view[offset:offset + count]
+            offset = _align(offset + count)
+            name_blob = view[offset:offset + blob_size]
+            if (len(codes) != count or len(name_offsets) != count + 1 or len(abolished) != count
+                    or len(name_blob) != blob_size):
+                return None
+        except (struct.error, ValueError, TypeError):
+            return None
+
+        table = cls.__new__(cls)
+        table.codes = codes
+        table.name_offsets = name_offsets
+        table.name_blob = name_blob
+        table.abolished = abolished
+        table.headers = headers
+        table._positions = None
+        table._snapshot = mapped
+        return table
+
+    def write_snapshot(self, path, source_path):
+        """
+        Save the table as a memory-mappable binary snapshot
+
+        The file is written next to its final name and then renamed, so a
+        reader never maps a half-written snapshot.
+
+        :param path: Snapshot path
+        :param source_path: Source CSV whose mtime, size and SHA-1 are recorded
+        """
+        stat = os.stat(source_path)
+        headers = json.dumps(self.headers, ensure_ascii=False).encode('utf-8')
+        header = _SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, len(headers), len(self.codes),
+                                       len(self.name_blob), stat.st_mtime_ns, stat.st_size, file_digest(source_path))
+        sections = (headers, array('q', self.codes).tobytes(), array('I', self.name_offsets).tobytes(),
+                    bytes(self.abolished))
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'wb') as snapshot_file:
+                snapshot_file.write(header)
+                offset = len(header)
+                for section in sections:
+                    snapshot_file.write(section)
+                    offset += len(section)
+                    padding = _align(offset) - offset
+                    snapshot_file.write(b"\0" * padding)
+                    offset += padding
+                snapshot_file.write(bytes(self.name_blob))
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, code):
+        return self._position(code) is not None
+
+    def _position(self, code):
+        try:
+            code = int(code)
+        except (TypeError, ValueError):
+            return None
+        if self._positions is not None:
+            return self._positions.get(code)
+        # 스냅숏에서 연 표는 정렬된 코드 배열에서 이진 탐색
+        position = bisect.bisect_left(self.codes, code)
+        if position < len(self.codes) and self.codes[position] == code:
+            return position
+        return None
+
+    def _name_at(self, position):
+        return str(self.name_blob[self.name_offsets[position]:self.name_offsets[position + 1]], 'utf-8')
+
+    def source_rows(self):
+        """
+        Rebuild the rows of the source file from the table
+
+        Only possible when the source had exactly the code, name and
+        폐지여부 columns (the official export).
+
+        :return: List of rows in the source column order, or None if the source had other columns
+        """
+        if not self.headers or len(self.headers) != 3:
+            return None
+        code_col, name_col, status_col = _find_columns(self.headers)
+        if status_col is None or len({code_col, name_col, status_col}) != 3:
+            return None
+        rows = []
+        for position, code in enumerate(self.codes):
+            row_data = [None, None, None]
+            row_data[code_col] = f"{code:010d}"
+            row_data[name_col] = self._name_at(position)
+            row_data[status_col] = _STATUS_ABOLISHED if self.abolished[position] else _STATUS_ACTIVE
+            rows.append(row_data)
+        return rows
+
+    def name(self, code):
+        """
+        Return the full name of a code
+
+        :param code: Legal-dong code (int or 10-digit string)
+        :return: Name such as "서울특별시 종로구 청운동", or None if unknown
+        """
+        position = self._position(code)
+        if position is None:
+            return None
+        return self._name_at(position)
+
+    def is_active(self, code):
+        """코드가 존재하고 폐지되지 않았는지 확인"""
+        position = self._position(code)
+        return position is not None and not self.abolished[position]
+
+    def is_abolished(self, code):
+        """코드가 폐지된 코드인지 확인 (알 수 없는 코드는 False)"""
+        position = self._position(code)
+        return position is not None and bool(self.abolished[position])
+
+    def descendants(self, code, include_abolished=False):
+        """
+        Iterate codes below a code in the hierarchy
+
+        :param code: Parent legal-dong code
+        :param include_abolished: Also yield abolished codes
+        :return: Generator of codes as 10-digit strings
+        """
+        lo, hi = prefix_range(code)
+        start = bisect.bisect_left(self.codes, lo)
+        end = bisect.bisect_left(self.codes, hi, start)
+        for position in range(start, end):
+            child = self.codes[position]
+            if child != int(code) and (include_abolished or not self.abolished[position]):
+                yield f"{child:010d}"
+
+    def children(self, code, include_abolished=False):
+        """
+        Return the codes exactly one level below a code
+
+        :param code: Parent legal-dong code
+        :param include_abolished: Also return abolished codes
+        :return: List of codes as 10-digit strings
+        """
+        level = code_level(code) + 1
+        return [child for child in self.descendants(code, include_abolished) if code_level(child) == level]
+
+    def describe_pnu(self, pnu):
+        """
+        Resolve the legal-dong part of a PNU
+
+        :param pnu: 19-digit PNU code
+        :return: Dictionary with bjdong_code, name (None if unknown), known and abolished
+        """
+        bjdong_code = pnu[:10]
+        position = self._position(bjdong_code)
+        return {
+            'bjdong_code': bjdong_code,
+            'name': self._name_at(position) if position is not None else None,
+            'known': position is not None,
+            'abolished': position is not None and bool(self.abolished[position]),
+        }
+
+    def validate_pnu(self, pnu):
+        """
+        Check that a PNU refers to an existing, non-abolished legal dong
+
+        :param pnu: 19-digit PNU code
+        :raises ValueError: If the legal-dong code is unknown or abolished
+        """
+        info = self.describe_pnu(pnu)
+        if not info['known']:
+            raise ValueError(f"존재하지 않는 법정동코드입니다: {info['bjdong_code']}")
+        if info['abolished']:
+            raise ValueError(f"폐지된 법정동코드입니다: {info['bjdong_code']} ({info['name']})")
+
+def _find_columns(headers):
+    """법정동코드, 법정동명, 폐지여부 열 위치 찾기"""
+    code_col = name_col = status_col = None
+    for col, header in enumerate(headers):
+        header = str(header).strip().lstrip("\ufeff")
+        if code_col is None and "코드" in header:
+            code_col = col
+        elif name_col is None and ("명" in header or "이름" in header):
+            name_col = col
+        elif status_col is None and "폐지" in header:
+            status_col = col
+    if code_col is None:
+        code_col = 0
+    if name_col is None:
+        name_col = 1 if code_col != 1 else 0
+    return code_col, name_col, status_col
+
+def _align(offset):
+    """다음 8바이트 경계"""
+    return (offset + 7) & ~7
+
+def file_digest(path):
+    """파일 내용의 SHA-1 (20바이트)"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as source_file:
+        for block in iter(lambda: source_file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.digest()
+
+def _source_mtime_if_matches(source_path, mtime_ns, size, digest):
+    """원본이 스냅숏을 만들 때와 같으면 현재 mtime, 다르면 None (수정 시각이 바뀌었으면 내용 해시로 비교)"""
+    try:
+        stat = os.stat(source_path)
+        if stat.st_size != size:
+            return None
+        if stat.st_mtime_ns == mtime_ns or file_digest(source_path) == digest:
+            return stat.st_mtime_ns
+        return None
+    except OSError:
+        return None
+
+def _update_source_mtime(snapshot_path, mtime_ns):
+    """스냅숏 머리글의 원본 mtime만 고쳐 씀 (실패해도 다음에 다시 해시로 비교할 뿐이므로 무시)"""
+    try:
+        with open(snapshot_path, 'r+b') as snapshot_file:
+            snapshot_file.seek(_SOURCE_MTIME_OFFSET)
+            snapshot_file.write(_SOURCE_MTIME.pack(mtime_ns))
+    except OSError:
+        pass
+
+def snapshot_path_for(source_path, snapshot_dir=DEFAULT_SNAPSHOT_DIR):
+    """
+    Return the snapshot path used for a source CSV
+
+    :param source_path: 법정동코드 CSV path
+    :param snapshot_dir: Directory holding the snapshots
+    :return: Path named after the source's absolute path
+    """
+    key = hashlib.sha1(os.path.abspath(source_path).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(snapshot_dir, f"bjdong_codes_{key}.v{SNAPSHOT_VERSION}.bin")
+
+def load_code_table(path, snapshot_dir=DEFAULT_SNAPSHOT_DIR):
+    """
+    Load a 법정동코드 file through its binary snapshot
+
+    A snapshot that still matches the file is memory-mapped; otherwise the
+    file is parsed and a new snapshot is written for the next session.
+
+    :param path: 법정동코드 CSV path
+    :param snapshot_dir: Directory holding the snapshots (None to always parse)
+    :return: CodeTable
+    """
+    if snapshot_dir is None:
+        return CodeTable.from_csv(path)
+    snapshot_path = snapshot_path_for(path, snapshot_dir)
+    table = CodeTable.from_snapshot(snapshot_path, path)
+    if table is not None:
+        return table
+    table = CodeTable.from_csv(path)
+    try:
+        table.write_snapshot(snapshot_path, path)
+    except OSError:
+        pass  # 스냅숏은 시작 시간을 줄이기 위한 것이므로 저장에 실패해도 계속 진행
+    return table
+
+def get_default_code_table():
+    """
+    Return the code table at DEFAULT_CODE_TABLE_PATH, loading it on first use
+
+    :return: CodeTable, or None if the file does not exist
+    """
+    global _default_code_table
+    if _default_code_table is None and os.path.exists(DEFAULT_CODE_TABLE_PATH):
+        _default_code_table = load_code_table(DEFAULT_CODE_TABLE_PATH)
+    return _default_code_table
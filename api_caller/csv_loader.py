@@ -0,0 +1,106 @@
+import codecs
+import csv
+import io
+import os
+
+# 인코딩 판별에 사용할 앞부분 크기
+SNIFF_SIZE = 64 * 1024
+
+# 한 번에 넘겨주는 행 수
+DEFAULT_CHUNK_SIZE = 5000
+
+def detect_encoding(sample):
+    """
+    Guess the encoding of a 법정동코드 export from its first bytes
+
+    UTF-8 (with or without BOM) is tried first, then CP949, which is what
+    the official exports usually use. A multi-byte character cut off at the
+    end of the sample is not treated as an error.
+
+    :param sample: First bytes of the file
+    :return: Codec name usable with open()
+    """
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+
+    for encoding in ("utf-8", "cp949"):
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            decoder.decode(sample, final=False)
+        except UnicodeDecodeError:
+            continue
+        return encoding
+    return "utf-8"
+
+def detect_file_encoding(path, sniff_size=SNIFF_SIZE):
+    """
+    Guess the encoding of a file by reading only its first bytes
+
+    :param path: File path
+    :param sniff_size: Number of bytes inspected
+    :return: Codec name usable with open()
+    """
+    with open(path, 'rb') as raw_file:
+        return detect_encoding(raw_file.read(sniff_size))
+
+class CsvChunkReader:
+    """
+    Read a CSV or tab-separated file in chunks of rows
+
+    The encoding is sniffed from the first bytes and the file is then read
+    once; bytes that still fail to decode are replaced instead of aborting
+    the load. Use as a context manager and iterate to get row chunks.
+    """
+
+    def __init__(self, path, encoding=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        :param path: File path
+        :param encoding: File encoding (sniffed if None)
+        :param chunk_size: Number of rows per chunk
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self.total_bytes = os.path.getsize(path)
+        self._raw = open(path, 'rb')
+        try:
+            if encoding is None:
+                encoding = detect_encoding(self._raw.read(SNIFF_SIZE))
+                self._raw.seek(0)
+            self.encoding = encoding
+            self._text = io.TextIOWrapper(self._raw, encoding=encoding, errors='replace', newline='')
+
+            first_line = self._text.readline()
+            self.delimiter = "\t" if "\t" in first_line else ","
+            self.headers = next(csv.reader([first_line], delimiter=self.delimiter), [])
+            self._reader = csv.reader(self._text, delimiter=self.delimiter)
+        except Exception:
+            self._raw.close()
+            raise
+
+    @property
+    def bytes_read(self):
+        """지금까지 읽은 바이트 수 (진행률 표시용)"""
+        if self._raw.closed:
+            return self.total_bytes
+        return self._raw.tell()
+
+    def __iter__(self):
+        chunk = []
+        for row_data in self._reader:
+            if not row_data:
+                continue
+            chunk.append(row_data)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def close(self):
+        self._text.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,291 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from building_client import DEFAULT_PAGE_SIZE
+from building_lookup import fetch_building_info_batch
+from title_schema import TITLE_INFO_COLUMNS, convert_value
+
+# 변경 종류
+CHANGE_ADDED = "added"
+CHANGE_CHANGED = "changed"
+CHANGE_REMOVED = "removed"
+
+# 내용과 관계없이 바뀌는 항목 (대장 생성일자)은 비교에서 제외
+_VOLATILE_FIELDS = frozenset(('crtnDay',))
+_COMPARED_COLUMNS = tuple((name, kind) for name, kind in TITLE_INFO_COLUMNS if name not in _VOLATILE_FIELDS)
+
+# 한 번에 저장하는 필지 수
+DEFAULT_COMMIT_EVERY = 200
+
+def normalize_item(item):
+    """
+    Reduce a getBrTitleInfo item to its typed, compared fields
+
+    :param item: Building title item dictionary
+    :return: Dictionary of the TITLE_INFO_COLUMNS values (volatile fields removed)
+    """
+    return {name: convert_value(item.get(name), kind) for name, kind in _COMPARED_COLUMNS}
+
+def item_key(item, digest):
+    """건물을 구분하는 키 (건축물대장 PK, 없으면 비교 항목의 내용 해시이므로 응답 순서와 관계없음)"""
+    return str(item.get('mgmBldrgstPk') or f"#{digest[:16]}")
+
+def content_hash(value):
+    """정규화한 값의 해시 (항목 순서와 관계없음)"""
+    text = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+class BuildingSnapshot:
+    """
+    SQLite snapshot of the building title items of tracked parcels
+
+    Keeps one normalized row and content hash per building and a hash per
+    parcel, so a fresh response can be compared without touching the
+    unchanged rows. Each applied difference is also appended to the
+    ``changes`` table.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: SQLite database path (":memory:" for a private snapshot)
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """CREATE TABLE IF NOT EXISTS parcels (
+                pnu TEXT PRIMARY KEY,
+                content_hash TEXT,
+                building_count INTEGER,
+                priority INTEGER NOT NULL DEFAULT 0,
+                fetched_at REAL,
+                attempted_at REAL,
+                changed_at REAL,
+                last_error TEXT
+            );
+            CREATE TABLE IF NOT EXISTS buildings (
+                pnu TEXT NOT NULL,
+                building_key TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                item TEXT NOT NULL,
+                PRIMARY KEY (pnu, building_key)
+            );
+            CREATE TABLE IF NOT EXISTS changes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                pnu TEXT NOT NULL,
+                building_key TEXT NOT NULL,
+                change TEXT NOT NULL,
+                item TEXT,
+                recorded_at REAL NOT NULL
+            );"""
+        )
+        # attempted_at이 없던 이전 스냅숏은 열을 추가하고 마지막 조회 시각으로 채움
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(parcels)")}
+        if "attempted_at" not in columns:
+            self._conn.execute("ALTER TABLE parcels ADD COLUMN attempted_at REAL")
+            self._conn.execute("UPDATE parcels SET attempted_at = fetched_at")
+        self._conn.execute("DROP INDEX IF EXISTS parcels_refresh_order")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS parcels_attempt_order ON parcels (priority DESC, attempted_at)")
+
+    def track(self, pnus, priority=None):
+        """
+        Add parcels to the snapshot (already tracked parcels are kept)
+
+        :param pnus: Iterable of PNU strings
+        :param priority: Refresh priority to set (higher is refreshed first; unchanged if None)
+        :return: Number of parcels that were not tracked before
+        """
+        pnus = list(pnus)
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN")
+            self._conn.executemany("INSERT OR IGNORE INTO parcels (pnu) VALUES (?)", ((pnu,) for pnu in pnus))
+            added = self._conn.total_changes - before
+            if priority is not None:
+                self._conn.executemany("UPDATE parcels SET priority = ? WHERE pnu = ?",
+                                       ((priority, pnu) for pnu in pnus))
+            self._conn.execute("COMMIT")
+            return added
+
+    def refresh_order(self, limit=None, max_age=None, now=None):
+        """
+        Return tracked PNUs in refresh order
+
+        Never-attempted parcels come first, then by priority (highest first)
+        and time of the last attempt (oldest first). Failed attempts count,
+        so a parcel that keeps failing moves to the back instead of using
+        up every run's limit.
+
+        :param limit: Maximum number of PNUs (all if None)
+        :param max_age: Only parcels fetched longer than this many seconds ago (all if None)
+        :return: List of PNU strings
+        """
+        query = "SELECT pnu FROM parcels"
+        args = []
+        if max_age is not None:
+            query += " WHERE fetched_at IS NULL OR fetched_at < ?"
+            args.append((time.time() if now is None else now) - max_age)
+        query += " ORDER BY attempted_at IS NOT NULL, priority DESC, attempted_at"
+        if limit is not None:
+            query += " LIMIT ?"
+            args.append(limit)
+        with self._lock:
+            return [row[0] for row in self._conn.execute(query, args)]
+
+    def apply(self, records, now=None):
+        """
+        Compare fresh lookup records with the snapshot and store the differences
+
+        Only buildings that were added, changed or removed are written. A
+        failed record only stores its error and attempt time; the parcel's
+        old data is kept.
+
+        :param records: Records returned by lookup_pnu
+        :return: List of change dictionaries (pnu, building_key, change, item)
+        """
+        now = time.time() if now is None else now
+        changes = []
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for record in records:
+                    changes.extend(self._apply_record(record, now))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return changes
+
+    def _apply_record(self, record, now):
+        pnu = record["pnu"]
+        if record.get("error") is not None:
+            self._conn.execute("INSERT OR IGNORE INTO parcels (pnu) VALUES (?)", (pnu,))
+            self._conn.execute("UPDATE parcels SET last_error = ?, attempted_at = ? WHERE pnu = ?",
+                               (record["error"], now, pnu))
+            return []
+
+        fresh = {}
+        for item in record.get("items") or []:
+            normalized = normalize_item(item)
+            digest = content_hash(normalized)
+            key = base_key = item_key(item, digest)
+            # PK 없이 내용까지 같은 건물이 여럿이면 번호를 붙여 구분
+            duplicate = 1
+            while key in fresh:
+                duplicate += 1
+                key = f"{base_key}-{duplicate}"
+            fresh[key] = (digest, normalized)
+        parcel_hash = content_hash(sorted(digest for digest, _ in fresh.values()))
+
+        row = self._conn.execute("SELECT content_hash FROM parcels WHERE pnu = ?", (pnu,)).fetchone()
+        if row is not None and row[0] == parcel_hash:
+            # 바뀐 것이 없으면 조회 시각만 갱신
+            self._conn.execute("UPDATE parcels SET fetched_at = ?, attempted_at = ?, last_error = NULL WHERE pnu = ?",
+                               (now, now, pnu))
+            return []
+
+        stored = dict(self._conn.execute("SELECT building_key, content_hash FROM buildings WHERE pnu = ?", (pnu,)))
+        changes = []
+        for key, (digest, normalized) in fresh.items():
+            if stored.get(key) == digest:
+                continue
+            change = CHANGE_ADDED if key not in stored else CHANGE_CHANGED
+            item_text = json.dumps(normalized, ensure_ascii=False)
+            self._conn.execute("INSERT OR REPLACE INTO buildings (pnu, building_key, content_hash, item) "
+                               "VALUES (?, ?, ?, ?)", (pnu, key, digest, item_text))
+            changes.append({"pnu": pnu, "building_key": key, "change": change, "item": normalized})
+        for key in stored.keys() - fresh.keys():
+            self._conn.execute("DELETE FROM buildings WHERE pnu = ? AND building_key = ?", (pnu, key))
+            changes.append({"pnu": pnu, "building_key": key, "change": CHANGE_REMOVED, "item": None})
+
+        self._conn.executemany(
+            "INSERT INTO changes (pnu, building_key, change, item, recorded_at) VALUES (?, ?, ?, ?, ?)",
+            [(change["pnu"], change["building_key"], change["change"],
+              None if change["item"] is None else json.dumps(change["item"], ensure_ascii=False), now)
+             for change in changes])
+        self._conn.execute(
+            "INSERT INTO parcels (pnu, content_hash, building_count, fetched_at, attempted_at, changed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (pnu) DO UPDATE SET content_hash = excluded.content_hash, "
+            "building_count = excluded.building_count, fetched_at = excluded.fetched_at, "
+            "attempted_at = excluded.attempted_at, changed_at = excluded.changed_at, last_error = NULL",
+            (pnu, parcel_hash, len(fresh), now, now, now if changes else None))
+        return changes
+
+    def items(self, pnu):
+        """저장된 필지의 정규화된 건물 항목 목록"""
+        with self._lock:
+            return [json.loads(row[0]) for row in self._conn.execute(
+                "SELECT item FROM buildings WHERE pnu = ? ORDER BY building_key", (pnu,))]
+
+    def stats(self):
+        """
+        Return snapshot counts
+
+        :return: Dictionary with parcels, never_fetched, buildings and failed (last attempt failed)
+        """
+        with self._lock:
+            parcels, never_fetched, failed = self._conn.execute(
+                "SELECT COUNT(*), SUM(fetched_at IS NULL), SUM(last_error IS NOT NULL) FROM parcels").fetchone()
+            buildings = self._conn.execute("SELECT COUNT(*) FROM buildings").fetchone()[0]
+        return {"parcels": parcels, "never_fetched": never_fetched or 0, "buildings": buildings,
+                "failed": failed or 0}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def sync_snapshot(client, snapshot, limit=None, max_age=None, max_workers=8, page_size=DEFAULT_PAGE_SIZE,
+                  code_table=None, commit_every=DEFAULT_COMMIT_EVERY):
+    """
+    Refresh the stalest tracked parcels and yield what changed
+
+    Parcels are fetched in BuildingSnapshot.refresh_order, bypassing the
+    response cache, so stopping early (or a ``limit`` sized to the day's
+    quota) still refreshes the oldest data first. Records are applied in
+    transactions of ``commit_every`` parcels.
+
+    :param client: BuildingRegistryClient shared by all workers
+    :param snapshot: BuildingSnapshot to refresh
+    :param limit: Maximum number of parcels to fetch (all stale parcels if None)
+    :param max_age: Only refresh parcels fetched longer than this many seconds ago
+    :param max_workers: Number of concurrent requests
+    :param page_size: Number of rows requested per page
+    :param code_table: CodeTable used to validate the legal dong (optional)
+    :param commit_every: Number of parcels applied per transaction
+    :return: Generator of (record, changes) pairs, one per fetched parcel
+    """
+    pnus = snapshot.refresh_order(limit=limit, max_age=max_age)
+    records = fetch_building_info_batch(client, pnus, max_workers=max_workers, page_size=page_size,
+                                        refresh=True, code_table=code_table)
+    pending = []
+
+    def apply_pending():
+        changes = snapshot.apply(pending)
+        by_pnu = {}
+        for change in changes:
+            by_pnu.setdefault(change["pnu"], []).append(change)
+        applied = [(record, by_pnu.get(record["pnu"], [])) for record in pending]
+        pending.clear()
+        return applied
+
+    for record in records:
+        pending.append(record)
+        if len(pending) >= commit_every:
+            yield from apply_pending()
+    if pending:
+        yield from apply_pending()
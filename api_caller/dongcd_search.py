@@ -0,0 +1,166 @@
+import bisect
+
+# 셀 사이에 검색어가 걸쳐 일치하지 않도록 사용하는 구분자
+_CELL_SEPARATOR = "\x00"
+
+def find_code_column(headers, rows, sample_size=100):
+    """
+    Guess the code column of a CSV
+
+    Prefers a header containing "코드", then the first column whose sampled
+    values are all digits.
+
+    :param headers: Header row
+    :param rows: Data rows
+    :param sample_size: Number of rows inspected
+    :return: Column index, or None if there is no code-like column
+    """
+    for col, header in enumerate(headers):
+        if "코드" in str(header):
+            return col
+
+    sample = rows[:sample_size]
+    for col in range(len(headers)):
+        values = [str(row[col]).strip() for row in sample if col < len(row)]
+        if values and all(value.isdigit() for value in values):
+            return col
+    return None
+
+class CsvSearchIndex:
+    """
+    Precomputed search index over CSV rows
+
+    * Digit-only queries are matched as a prefix of the code column using
+      a sorted code list (plus any other column containing the digits).
+    * Other queries are matched as a case-insensitive substring of any
+      other column, using a character/bigram inverted index to pick a small
+      candidate set before checking the normalized row keys.
+
+    When a query extends the previous one, only the previous result is
+    narrowed; deleting characters falls back to the index.
+    """
+
+    def __init__(self, rows, code_column=None):
+        """
+        :param rows: Data rows (lists of cells)
+        :param code_column: Index of the code column, or None if there is none
+        """
+        self.code_column = code_column
+        self._keys = []
+        self._postings = {}
+        self._codes = []
+        self._code_rows = []
+        self._unsorted_codes = []
+        self._last_query = None
+        self._last_result = None
+        self.add_rows(rows, 0)
+        self.sort_codes()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add_rows(self, rows, start):
+        """
+        Index rows appended to the data
+
+        :param rows: New rows
+        :param start: Row index of the first new row
+        """
+        code_column = self.code_column
+        postings = self._postings
+        code_pairs = self._unsorted_codes
+
+        for offset, row_data in enumerate(rows):
+            row = start + offset
+            cells = []
+            for col, cell in enumerate(row_data):
+                if col == code_column:
+                    code_pairs.append((str(cell).strip(), row))
+                else:
+                    cells.append(str(cell).lower())
+            key = _CELL_SEPARATOR.join(cells)
+            self._keys.append(key)
+
+            # 한 글자와 두 글자 조각을 모두 색인 (행 번호는 증가 순으로 추가됨)
+            grams = set(key)
+            grams.update(key[i:i + 2] for i in range(len(key) - 1))
+            grams.discard(_CELL_SEPARATOR)
+            for gram in grams:
+                posting = postings.get(gram)
+                if posting is None:
+                    postings[gram] = [row]
+                else:
+                    posting.append(row)
+
+        self._last_query = None
+        self._last_result = None
+
+    def search(self, text):
+        """
+        Find the rows matching a query
+
+        :param text: Search text
+        :return: Sorted list of matching row indices, or None when the query is empty
+        """
+        query = text.strip().lower()
+        if not query:
+            self._last_query = None
+            self._last_result = None
+            return None
+
+        if query.isdigit() and self.code_column is not None:
+            # 숫자만 입력하면 코드 앞자리 일치 + 이름에 포함된 숫자 일치
+            result = sorted(set(self._search_code_prefix(query)).union(self._search_names(query)))
+        elif self._last_query is not None and not self._last_query.isdigit() and self._last_query in query:
+            # 이전 검색어를 늘린 경우 이전 결과 안에서만 다시 확인
+            result = self._search_names(query, within=self._last_result)
+        else:
+            result = self._search_names(query)
+
+        self._last_query = query
+        self._last_result = result
+        return result
+
+    def sort_codes(self):
+        """
+        Sort codes added since the last sort
+
+        Rows added in chunks are only sorted once, on demand; call this after
+        the last chunk to keep the sort off the first search.
+        """
+        if not self._unsorted_codes:
+            return
+        code_pairs = sorted(list(zip(self._codes, self._code_rows)) + self._unsorted_codes)
+        self._codes = [code for code, _ in code_pairs]
+        self._code_rows = [row for _, row in code_pairs]
+        self._unsorted_codes = []
+
+    def _search_code_prefix(self, prefix):
+        self.sort_codes()
+        lo = bisect.bisect_left(self._codes, prefix)
+        hi = bisect.bisect_left(self._codes, prefix + "\uffff", lo)
+        return self._code_rows[lo:hi]
+
+    def _search_names(self, query, within=None):
+        postings = self._postings
+        if len(query) <= 2:
+            grams = [query]
+        else:
+            grams = [query[i:i + 2] for i in range(len(query) - 1)]
+
+        # 가장 짧은 색인 목록(또는 이전 결과)을 후보로 삼아 실제 포함 여부를 확인
+        candidates = None
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting is None:
+                return []
+            if candidates is None or len(posting) < len(candidates):
+                candidates = posting
+        if within is not None and len(within) < len(candidates):
+            candidates = within
+        elif len(query) <= 2:
+            # 한 글자, 두 글자 검색어는 색인 목록이 곧 결과
+            return list(candidates)
+
+        keys = self._keys
+        return [row for row in candidates if query in keys[row]]
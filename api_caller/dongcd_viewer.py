@@ -1,8 +1,213 @@
 from qgis.PyQt.QtWidgets import (QDockWidget, QVBoxLayout, QPushButton, 
-                                QFileDialog, QTableWidget, QTableWidgetItem, 
-                                QWidget, QLineEdit, QHBoxLayout, QLabel)
-from qgis.PyQt.QtCore import Qt
-import csv
+                                QFileDialog, QTableView, QHeaderView,
+                                QWidget, QLineEdit, QHBoxLayout, QLabel, QProgressBar)
+from qgis.PyQt.QtCore import (Qt, QAbstractTableModel, QModelIndex, QTimer, QObject, QRunnable,
+                              QThreadPool, QSettings, pyqtSignal)
+from qgis.core import QgsApplication
+import os
+import sys
+
+# QGIS 파이썬 콘솔에서 실행해도 같은 폴더의 모듈을 불러올 수 있도록 경로 추가
+if "__file__" in globals():
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dongcd_search import CsvSearchIndex, find_code_column
+from code_table import CodeTable, snapshot_path_for
+from csv_loader import DEFAULT_CHUNK_SIZE, CsvChunkReader
+
+# 열 너비 추정에 사용할 표본 행 수
+COLUMN_WIDTH_SAMPLE_ROWS = 200
+
+# 마지막 입력 후 검색을 실행하기까지 기다리는 시간 (ms)
+SEARCH_DEBOUNCE_MS = 150
+
+# 마지막으로 연 파일을 기억하는 QGIS 설정 키
+LAST_FILE_SETTING = "qgis_apitest/bjdong_csv_path"
+
+def snapshot_directory():
+    """법정동코드 스냅숏 위치 (QGIS 사용자 프로필 폴더 아래)"""
+    return os.path.join(QgsApplication.qgisSettingsDirPath(), "qgis_apitest", "snapshots")
+
+class CsvTableModel(QAbstractTableModel):
+    """
+    Table model over the loaded CSV rows
+
+    Cells are only converted when the view asks for them, so only the
+    visible part of the table is ever materialized. Filtering replaces the
+    list of visible row indices instead of copying rows.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._headers = []
+        self._rows = []
+        self._visible = None  # None이면 전체 행 표시
+
+    def set_rows(self, headers, rows):
+        """헤더와 전체 행 설정 (필터 초기화)"""
+        self.beginResetModel()
+        self._headers = list(headers)
+        self._rows = rows
+        self._visible = None
+        self.endResetModel()
+
+    def set_visible_rows(self, indices):
+        """
+        Show only the given rows
+
+        :param indices: Sequence of row indices into the loaded rows, or None for all rows
+        """
+        self.beginResetModel()
+        self._visible = indices
+        self.endResetModel()
+
+    def rows(self):
+        return self._rows
+
+    def append_rows(self, rows):
+        """불러오는 중인 행을 뒤에 추가 (필터가 걸려 있으면 표시 행은 그대로 유지)"""
+        if not rows:
+            return
+        if self._visible is None:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self._rows.extend(rows)
+            self.endInsertRows()
+        else:
+            self._rows.extend(rows)
+
+    def row_at(self, row):
+        if self._visible is None:
+            return self._rows[row]
+        return self._rows[self._visible[row]]
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows) if self._visible is None else len(self._visible)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        row_data = self.row_at(index.row())
+        if index.column() < len(row_data):
+            return str(row_data[index.column()])
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            if section < len(self._headers):
+                return self._headers[section]
+            return None
+        return str(section + 1)
+
+class CsvLoadSignals(QObject):
+    """CsvLoadWorker 진행 상황 알림"""
+    # 행 목록은 QVariantList로 변환되지 않도록 object로 전달
+    started = pyqtSignal(int, object, str)           # load_id, headers, encoding
+    rows_loaded = pyqtSignal(int, object, int, int)  # load_id, rows, bytes_read, total_bytes
+    finished = pyqtSignal(int, object, object)       # load_id, CsvSearchIndex, CodeTable or None
+    failed = pyqtSignal(int, str)                    # load_id, error message
+
+class CsvLoadWorker(QRunnable):
+    """
+    Read a CSV file off the GUI thread and stream its rows in chunks
+
+    The search index is built alongside in the worker thread and handed
+    over once the whole file has been read. A 법정동코드 file that has a
+    current snapshot is not parsed at all: the table is memory-mapped and
+    the rows are rebuilt from it. After a full parse the snapshot is
+    written for the next session.
+    """
+
+    def __init__(self, load_id, file_path, snapshot_dir=None):
+        """
+        :param snapshot_dir: Directory of code-table snapshots (None disables them)
+        """
+        super().__init__()
+        self.load_id = load_id
+        self.file_path = file_path
+        self.snapshot_dir = snapshot_dir
+        self.signals = CsvLoadSignals()
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            snapshot_path = code_table = None
+            if self.snapshot_dir is not None:
+                snapshot_path = snapshot_path_for(self.file_path, self.snapshot_dir)
+                code_table = CodeTable.from_snapshot(snapshot_path, self.file_path)
+            rows = code_table.source_rows() if code_table is not None else None
+            if rows is not None:
+                result = self._load_rows(code_table.headers, rows, code_table)
+            else:
+                result = self._load_csv(code_table, snapshot_path)
+        except Exception as e:
+            if not self._cancelled:
+                self.signals.failed.emit(self.load_id, str(e))
+            return
+
+        if result is not None and not self._cancelled:
+            self.signals.finished.emit(self.load_id, *result)
+
+    def _load_rows(self, headers, rows, code_table):
+        """스냅숏에서 다시 만든 행을 CSV를 읽을 때와 같은 단위로 전달"""
+        self.signals.started.emit(self.load_id, headers, "snapshot")
+        search_index = CsvSearchIndex([], code_column=find_code_column(headers, rows))
+        for start in range(0, len(rows), DEFAULT_CHUNK_SIZE):
+            if self._cancelled:
+                return None
+            chunk = rows[start:start + DEFAULT_CHUNK_SIZE]
+            search_index.add_rows(chunk, start)
+            self.signals.rows_loaded.emit(self.load_id, chunk, start + len(chunk), len(rows))
+        search_index.sort_codes()
+        return search_index, code_table
+
+    def _load_csv(self, code_table, snapshot_path):
+        """
+        Parse the CSV file
+
+        :param code_table: Table already mapped from a snapshot (built from the rows if None)
+        :param snapshot_path: Where to save the built table (not saved if None)
+        """
+        with CsvChunkReader(self.file_path) as reader:
+            self.signals.started.emit(self.load_id, reader.headers, reader.encoding)
+            all_rows = []
+            search_index = None
+            for chunk in reader:
+                if self._cancelled:
+                    return None
+                if search_index is None:
+                    search_index = CsvSearchIndex([], code_column=find_code_column(reader.headers, chunk))
+                search_index.add_rows(chunk, len(all_rows))
+                all_rows.extend(chunk)
+                self.signals.rows_loaded.emit(self.load_id, chunk, reader.bytes_read, reader.total_bytes)
+
+            if search_index is None:
+                search_index = CsvSearchIndex([])
+            search_index.sort_codes()
+
+            # 법정동코드 파일이면 계층 색인도 생성하고 다음 실행을 위해 스냅숏으로 저장
+            if code_table is None and search_index.code_column is not None:
+                code_table = CodeTable.from_rows(reader.headers, all_rows)
+                if not len(code_table):
+                    code_table = None
+                elif snapshot_path is not None:
+                    try:
+                        code_table.write_snapshot(snapshot_path, self.file_path)
+                    except OSError:
+                        pass  # 스냅숏이 없어도 다음에 다시 파싱하면 됨
+        return search_index, code_table
 
 class CsvViewerDockWidget(QDockWidget):
     def __init__(self, iface):
@@ -20,80 +225,200 @@ class CsvViewerDockWidget(QDockWidget):
         self.open_button.clicked.connect(self.open_csv)
         self.layout.addWidget(self.open_button)
 
+        # 불러오기 진행 상태와 취소 버튼
+        self.load_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.cancel_button = QPushButton("취소")
+        self.cancel_button.clicked.connect(self.cancel_load)
+        self.load_layout.addWidget(self.progress_bar)
+        self.load_layout.addWidget(self.cancel_button)
+        self.load_widget = QWidget()
+        self.load_widget.setLayout(self.load_layout)
+        self.load_widget.hide()
+        self.layout.addWidget(self.load_widget)
+
         # 검색 기능 추가
         self.search_layout = QHBoxLayout()
         self.search_label = QLabel("검색:")
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("검색어를 입력하세요...")
-        self.search_input.textChanged.connect(self.search_table)
+        self.search_input.setPlaceholderText("검색어 또는 19자리 PNU를 입력하세요...")
+        # 입력이 멈춘 뒤에 한 번만 검색하도록 지연 실행
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.search_table)
+        self.search_input.textChanged.connect(self.search_timer.start)
         
         self.search_layout.addWidget(self.search_label)
         self.search_layout.addWidget(self.search_input)
-        self.layout.insertLayout(1, self.search_layout)  # Open CSV 버튼과 테이블 사이에 추가
+        self.layout.insertLayout(2, self.search_layout)  # 진행 표시줄과 테이블 사이에 추가
+
+        # PNU 입력 시 법정동 확인 결과 표시
+        self.pnu_label = QLabel()
+        self.pnu_label.hide()
+        self.layout.insertWidget(3, self.pnu_label)
 
         # 원본 데이터 저장용 변수
+        self.headers = []
         self.original_data = []
+        self.search_index = None
+        self.code_table = None
         
-        # Add table widget to display CSV content
-        self.table = QTableWidget()
+        # 백그라운드 불러오기 상태
+        self.thread_pool = QThreadPool.globalInstance()
+        self.load_worker = None
+        self.load_id = 0
+        
+        # Add table view to display CSV content
+        self.model = CsvTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setWordWrap(False)
+        # 행 높이를 고정해 내용 기반 크기 계산을 피함
+        vertical_header = self.table.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.Fixed)
+        vertical_header.setDefaultSectionSize(self.table.fontMetrics().height() + 6)
         self.layout.addWidget(self.table)
 
         self.setWidget(self.widget)
 
+        # 지난번에 연 파일이 있으면 도킹 창이 표시된 뒤 바로 불러옴
+        last_path = QSettings().value(LAST_FILE_SETTING, "")
+        if last_path and os.path.exists(last_path):
+            QTimer.singleShot(0, lambda: self.start_load(last_path))
+
     def search_table(self):
-        search_text = self.search_input.text().lower()
-        
-        # 검색어가 비어있으면 원본 데이터 모두 표시
-        if not search_text:
-            self.display_data(self.original_data)
+        if self.search_index is None:
             return
-            
-        # 검색 결과 필터링
-        filtered_data = []
-        for row_data in self.original_data:
-            if any(search_text in str(cell).lower() for cell in row_data):
-                filtered_data.append(row_data)
+        
+        search_text = self.search_input.text().strip()
+        
+        # 19자리 PNU는 법정동코드 표로 확인하고 해당 법정동만 표시
+        if self.code_table is not None and len(search_text) == 19 and search_text.isdigit():
+            self.show_pnu_info(search_text)
+            search_text = search_text[:10]
+        else:
+            self.pnu_label.hide()
+        
+        # 검색 결과 필터링 (검색어가 비어있으면 None → 원본 데이터 모두 표시)
+        filtered_rows = self.search_index.search(search_text)
                 
         # 필터링된 결과 표시
-        self.display_data(filtered_data)
+        self.model.set_visible_rows(filtered_rows)
         
-    def display_data(self, data):
-        self.table.setRowCount(len(data))
-        for row, row_data in enumerate(data):
-            for col, cell_data in enumerate(row_data):
-                self.table.setItem(row, col, QTableWidgetItem(str(cell_data)))
-        self.table.resizeColumnsToContents()
+    def show_pnu_info(self, pnu):
+        info = self.code_table.describe_pnu(pnu)
+        if not info['known']:
+            text = f"❌ 존재하지 않는 법정동코드: {info['bjdong_code']}"
+        elif info['abolished']:
+            text = f"⚠️ 폐지된 법정동: {info['name']} ({info['bjdong_code']})"
+        else:
+            text = f"✅ {info['name']} ({info['bjdong_code']})"
+        self.pnu_label.setText(text)
+        self.pnu_label.show()
+
+    def display_data(self, headers, data):
+        self.model.set_rows(headers, data)
+        self.resize_columns_from_sample(headers, data)
+
+    def resize_columns_from_sample(self, headers, data):
+        """표본 행으로 열 너비를 추정 (전체 행에 대한 resizeColumnsToContents 대신)"""
+        metrics = self.table.fontMetrics()
+        padding = 2 * metrics.averageCharWidth() + 8
+        sample = data[:COLUMN_WIDTH_SAMPLE_ROWS]
+        for col, header in enumerate(headers):
+            longest = max(
+                (str(row_data[col]) for row_data in sample if col < len(row_data)),
+                key=len,
+                default=""
+            )
+            width = max(metrics.horizontalAdvance(str(header)), metrics.horizontalAdvance(longest))
+            self.table.setColumnWidth(col, width + padding)
 
     def open_csv(self):
-        # 시작 디렉토리 지정
-        start_directory = "C:/Users/dohwa/Desktop/유틸리티/법정동코드/법정동코드 전체자료_250113"
+        # 마지막으로 연 파일의 폴더에서 시작 (처음이면 홈 폴더)
+        last_path = QSettings().value(LAST_FILE_SETTING, "")
+        start_directory = os.path.dirname(last_path) if last_path else os.path.expanduser("~")
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             "CSV 파일 선택",
             start_directory,
-            "CSV files (*.csv)"
+            "CSV files (*.csv);;Text files (*.txt)"
         )
         
         if file_path:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as csv_file:
-                    csv_reader = csv.reader(csv_file)
-                    headers = next(csv_reader)
-                    self.original_data = list(csv_reader)  # 원본 데이터 저장
-
-                # 테이블 초기화
-                self.table.clear()
-                self.table.setColumnCount(len(headers))
-                self.table.setHorizontalHeaderLabels(headers)
-                
-                # 데이터 표시
-                self.display_data(self.original_data)
-                
-                # 검색창 초기화
-                self.search_input.clear()
-                
-            except UnicodeDecodeError:
-                # ... existing error handling code ...
+            self.start_load(file_path)
+
+    def start_load(self, file_path):
+        """파일을 백그라운드에서 불러오기 시작 (진행 중인 불러오기는 취소)"""
+        self.cancel_load()
+        self.load_id += 1
+
+        # 검색 색인은 불러오기가 끝난 뒤에 사용
+        self.search_index = None
+        self.code_table = None
+        self.original_data = []
+        self.pnu_label.hide()
+
+        QSettings().setValue(LAST_FILE_SETTING, file_path)
+        worker = CsvLoadWorker(self.load_id, file_path, snapshot_directory())
+        worker.signals.started.connect(self.on_load_started)
+        worker.signals.rows_loaded.connect(self.on_rows_loaded)
+        worker.signals.finished.connect(self.on_load_finished)
+        worker.signals.failed.connect(self.on_load_failed)
+        self.load_worker = worker
+
+        self.progress_bar.setValue(0)
+        self.load_widget.show()
+        self.thread_pool.start(worker)
+
+    def cancel_load(self):
+        if self.load_worker is not None:
+            self.load_worker.cancel()
+            self.load_worker = None
+        self.load_widget.hide()
+
+    def on_load_started(self, load_id, headers, encoding):
+        if load_id != self.load_id:
+            return
+        # 검색창 초기화
+        self.search_input.blockSignals(True)
+        self.search_input.clear()
+        self.search_input.blockSignals(False)
+        self.search_timer.stop()
+
+        self.headers = headers
+        self.display_data(headers, self.original_data)
+
+    def on_rows_loaded(self, load_id, rows, bytes_read, total_bytes):
+        if load_id != self.load_id:
+            return
+        first_chunk = not self.original_data
+        self.model.append_rows(rows)  # original_data와 같은 목록에 추가됨
+        if first_chunk:
+            self.resize_columns_from_sample(self.headers, self.original_data)
+        if total_bytes:
+            self.progress_bar.setValue(int(bytes_read * 100 / total_bytes))
+
+    def on_load_finished(self, load_id, search_index, code_table):
+        if load_id != self.load_id:
+            return
+        self.load_worker = None
+        self.load_widget.hide()
+        self.search_index = search_index
+        self.code_table = code_table
+
+        # 불러오는 동안 입력된 검색어 적용
+        if self.search_input.text():
+            self.search_table()
+
+    def on_load_failed(self, load_id, message):
+        if load_id != self.load_id:
+            return
+        self.load_worker = None
+        self.load_widget.hide()
+        self.iface.messageBar().pushWarning("CSV", f"파일을 읽을 수 없습니다: {message}")
 
 # Create and show the dock widget
 csv_viewer = CsvViewerDockWidget(iface)
@@ -0,0 +1,328 @@
+import atexit
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import urllib.parse
+from datetime import datetime, timedelta, timezone
+
+# 키 목록 파일 (한 줄에 하나, # 이후는 주석)과 환경 변수 (쉼표/공백 구분)
+DEFAULT_KEYS_PATH = os.path.join(os.path.expanduser("~"), ".qgis_apitest", "service_keys.txt")
+SERVICE_KEYS_ENV = "QGIS_APITEST_SERVICE_KEYS"
+
+# 일일 사용량 기록 위치
+DEFAULT_USAGE_PATH = os.path.join(os.path.expanduser("~"), ".qgis_apitest", "key_usage.sqlite")
+
+# 키 하나의 초당 요청 수와 일일 요청 한도 (공공데이터포털 개발계정 기준)
+DEFAULT_RATE = 30.0
+DEFAULT_DAILY_QUOTA = 10000
+
+# 일일 한도는 한국 시간 자정에 초기화됨
+_KST = timezone(timedelta(hours=9))
+
+_default_key_pool = None
+_default_key_pool_lock = threading.Lock()
+
+class QuotaExhaustedError(Exception):
+    """모든 키가 오늘의 요청 한도를 다 쓴 경우"""
+
+class MissingServiceKeyError(ValueError):
+    """환경 변수와 키 목록 파일 어디에도 서비스키가 없는 경우"""
+
+def load_service_keys(path=DEFAULT_KEYS_PATH):
+    """
+    Load the configured service keys
+
+    Keys come from the QGIS_APITEST_SERVICE_KEYS environment variable, or
+    else from ``path``. URL-encoded keys (the portal's "Encoding" key) are
+    decoded.
+
+    :param path: Key file with one key per line
+    :return: List of distinct decoded keys, in configured order
+    :raises MissingServiceKeyError: If neither source provides a key
+    """
+    text = os.environ.get(SERVICE_KEYS_ENV)
+    if text:
+        candidates = re.split(r"[\s,]+", text)
+    elif path and os.path.exists(path):
+        with open(path, 'r', encoding='utf-8-sig') as key_file:
+            candidates = [line.split("#", 1)[0] for line in key_file]
+    else:
+        candidates = []
+
+    keys = []
+    for key in candidates:
+        key = key.strip()
+        if "%" in key:
+            key = urllib.parse.unquote(key)
+        if key and key not in keys:
+            keys.append(key)
+    if not keys:
+        raise MissingServiceKeyError(
+            f"서비스키가 설정되지 않았습니다. {path or DEFAULT_KEYS_PATH} 파일에 한 줄에 하나씩 키를 적거나 "
+            f"{SERVICE_KEYS_ENV} 환경 변수를 설정하세요.")
+    return keys
+
+def key_id(key):
+    """키 자체 대신 기록·로그에 쓰는 짧은 식별자"""
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:12]
+
+def quota_day(now=None):
+    """일일 한도 기준 날짜 (한국 시간, YYYY-MM-DD)"""
+    return datetime.fromtimestamp(time.time() if now is None else now, _KST).date().isoformat()
+
+class TokenBucket:
+    """
+    Token bucket limiting the request rate of one key
+
+    Not thread-safe on its own; ServiceKeyPool calls it under its lock.
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        :param rate: Tokens added per second (must be positive)
+        :param capacity: Maximum burst (rate, at least 1, if None)
+        :raises ValueError: If rate is not positive
+        """
+        if not rate > 0:
+            raise ValueError(f"요청 속도는 0보다 커야 합니다: {rate}")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, now=None):
+        """
+        Take one token if available
+
+        :return: 0.0 if a token was taken, otherwise seconds until one is available
+        """
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+class UsageStore:
+    """
+    SQLite record of requests sent per key and day
+
+    Counts are buffered in memory and written every ``flush_every``
+    requests, on close and at interpreter exit, so the store costs no
+    disk write per request.
+    """
+
+    def __init__(self, path=DEFAULT_USAGE_PATH, flush_every=50):
+        """
+        :param path: SQLite database path (":memory:" for a private store)
+        :param flush_every: Number of recorded requests between writes
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._pending_count = 0
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS usage (
+                key_id TEXT NOT NULL,
+                day TEXT NOT NULL,
+                requests INTEGER NOT NULL,
+                exhausted INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (key_id, day)
+            )"""
+        )
+        atexit.register(self.flush)
+
+    def load(self, key_ids, day):
+        """
+        Return today's usage of the given keys
+
+        :return: Dictionary key_id -> (requests, exhausted)
+        """
+        with self._lock:
+            self._flush()
+            rows = self._conn.execute(
+                f"SELECT key_id, requests, exhausted FROM usage WHERE day = ? AND key_id IN "
+                f"({','.join('?' * len(key_ids))})", (day, *key_ids)).fetchall()
+        return {row[0]: (row[1], bool(row[2])) for row in rows}
+
+    def record(self, key_id, day, count=1):
+        with self._lock:
+            self._pending[(key_id, day)] = self._pending.get((key_id, day), 0) + count
+            self._pending_count += count
+            if self._pending_count >= self.flush_every:
+                self._flush()
+
+    def mark_exhausted(self, key_id, day):
+        with self._lock:
+            self._flush()
+            self._conn.execute(
+                "INSERT INTO usage (key_id, day, requests, exhausted) VALUES (?, ?, 0, 1) "
+                "ON CONFLICT (key_id, day) DO UPDATE SET exhausted = 1", (key_id, day))
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._conn.close()
+            self._conn = None
+
+    def _flush(self):
+        if not self._pending or self._conn is None:
+            return
+        pending, self._pending = self._pending, {}
+        self._pending_count = 0
+        self._conn.executemany(
+            "INSERT INTO usage (key_id, day, requests) VALUES (?, ?, ?) "
+            "ON CONFLICT (key_id, day) DO UPDATE SET requests = requests + excluded.requests",
+            [(key, day, count) for (key, day), count in pending.items()])
+
+class ServiceKeyPool:
+    """
+    Quota-aware scheduler over one or more service keys
+
+    Each key has a token bucket for its request rate and a daily quota
+    whose usage is kept in a UsageStore. acquire() hands out keys in
+    rotation, skipping keys that are out of tokens, backing off or used up
+    for the day, and waits only when every key is rate limited. Safe to
+    share between threads.
+    """
+
+    def __init__(self, keys, rate=DEFAULT_RATE, daily_quota=DEFAULT_DAILY_QUOTA, usage_store=None, burst=None):
+        """
+        :param keys: Decoded service keys
+        :param rate: Requests per second allowed per key
+        :param daily_quota: Requests per day allowed per key (None for no limit)
+        :param usage_store: UsageStore keeping daily usage (in memory only if None)
+        :param burst: Token bucket capacity per key (rate if None)
+        :raises ValueError: If no key is given or rate is not positive
+        """
+        if not keys:
+            raise ValueError("At least one service key is required")
+        self.keys = list(keys)
+        self.rate = rate
+        self.daily_quota = daily_quota
+        self.usage_store = usage_store
+        self._ids = {key: key_id(key) for key in self.keys}
+        self._buckets = {key: TokenBucket(rate, burst) for key in self.keys}
+        self._blocked_until = {key: 0.0 for key in self.keys}
+        self._lock = threading.Lock()
+        self._next = 0
+        self._day = None
+        self._used = {}
+        self._exhausted = set()
+        self._load_day(quota_day())
+
+    def _load_day(self, day):
+        self._day = day
+        stored = self.usage_store.load(list(self._ids.values()), day) if self.usage_store is not None else {}
+        self._used = {key: stored.get(self._ids[key], (0, False))[0] for key in self.keys}
+        self._exhausted = {key for key in self.keys if stored.get(self._ids[key], (0, False))[1]}
+
+    def _available(self, key):
+        if key in self._exhausted:
+            return False
+        return self.daily_quota is None or self._used[key] < self.daily_quota
+
+    def acquire(self, timeout=None, key=None):
+        """
+        Take one request slot and return the key to send it with
+
+        :param timeout: Maximum seconds to wait for a rate-limited key (no limit if None)
+        :param key: Take the slot of this key only, e.g. to retry a request with the same key
+                    (next key in rotation if None)
+        :return: Service key
+        :raises QuotaExhaustedError: If every key (or the given key) has used up today's quota
+        :raises TimeoutError: If no key became available within timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                day = quota_day()
+                if day != self._day:
+                    self._load_day(day)
+                now = time.monotonic()
+                wait = None
+                for offset in range(len(self.keys) if key is None else 1):
+                    candidate = self.keys[(self._next + offset) % len(self.keys)] if key is None else key
+                    if not self._available(candidate):
+                        continue
+                    key_wait = (max(self._blocked_until[candidate] - now, 0.0)
+                                or self._buckets[candidate].try_acquire(now))
+                    if key_wait == 0.0:
+                        if key is None:
+                            self._next = (self._next + offset + 1) % len(self.keys)
+                        self._used[candidate] += 1
+                        if self.usage_store is not None:
+                            self.usage_store.record(self._ids[candidate], day)
+                        return candidate
+                    wait = key_wait if wait is None else min(wait, key_wait)
+                if wait is None:
+                    if key is not None:
+                        raise QuotaExhaustedError(f"서비스키 {key_id(key)}가 오늘({day})의 요청 한도를 모두 사용했습니다.")
+                    raise QuotaExhaustedError(f"모든 서비스키({len(self.keys)}개)가 오늘({day})의 요청 한도를 모두 사용했습니다.")
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("No service key became available in time")
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def mark_exhausted(self, key):
+        """API가 한도 초과를 알린 키를 오늘 하루 사용하지 않음"""
+        with self._lock:
+            self._exhausted.add(key)
+            day = self._day
+        if self.usage_store is not None:
+            self.usage_store.mark_exhausted(self._ids[key], day)
+
+    def backoff(self, key, seconds):
+        """일시적으로 요청이 거부된 키를 seconds 동안 쉬게 함"""
+        with self._lock:
+            self._blocked_until[key] = max(self._blocked_until[key], time.monotonic() + seconds)
+
+    def usage(self):
+        """
+        Return today's usage per key
+
+        :return: Dictionary key id -> {"requests", "remaining", "exhausted"}
+        """
+        with self._lock:
+            return {
+                self._ids[key]: {
+                    "requests": self._used[key],
+                    "remaining": None if self.daily_quota is None else max(self.daily_quota - self._used[key], 0),
+                    "exhausted": not self._available(key),
+                }
+                for key in self.keys
+            }
+
+    def close(self):
+        if self.usage_store is not None:
+            self.usage_store.flush()
+
+def get_default_key_pool():
+    """
+    Return the key pool shared by the CLI and the PyQt windows
+
+    :return: ServiceKeyPool over load_service_keys(), recording usage at DEFAULT_USAGE_PATH
+    :raises MissingServiceKeyError: If no service key is configured
+    """
+    global _default_key_pool
+    with _default_key_pool_lock:
+        if _default_key_pool is None:
+            _default_key_pool = ServiceKeyPool(load_service_keys(), usage_store=UsageStore(DEFAULT_USAGE_PATH))
+        return _default_key_pool
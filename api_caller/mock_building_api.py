@@ -0,0 +1,258 @@
+import json
+import os
+import random
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+
+# 실제 API와 같은 경로 (건축물대장 서비스의 다른 오퍼레이션도 같은 항목으로 응답)
+BUILDING_SERVICE_PATH = "/1613000/BldRgstHubService/"
+TITLE_INFO_PATH = BUILDING_SERVICE_PATH + "getBrTitleInfo"
+
+# 요청 한도를 넘은 키에 공공데이터포털 게이트웨이가 돌려주는 응답 (JSON 요청에도 XML)
+QUOTA_EXCEEDED_BODY = (
+    b"<OpenAPI_ServiceResponse><cmmMsgHeader><errMsg>SERVICE ERROR</errMsg>"
+    b"<returnAuthMsg>LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR</returnAuthMsg>"
+    b"<returnReasonCode>22</returnReasonCode></cmmMsgHeader></OpenAPI_ServiceResponse>"
+)
+
+def fixture_name(params):
+    """녹화 응답 파일 이름 (PNU 순서의 파라미터 + .json)"""
+    san_value = int(params.get('platGbCd', '0') or 0) + 1
+    return (f"{params.get('sigunguCd', '')}{params.get('bjdongCd', '')}{san_value}"
+            f"{params.get('bun', '')}{params.get('ji', '')}.json")
+
+def synthetic_items(params, count):
+    """
+    Build deterministic building title items for a parcel
+
+    :param params: Query parameters of the request
+    :param count: Number of items
+    :return: List of item dictionaries
+    """
+    seed = fixture_name(params)
+    rng = random.Random(seed)
+    items = []
+    for index in range(count):
+        area = round(rng.uniform(50, 5000), 2)
+        items.append({
+            'bldNm': f"모의건물 {index + 1}",
+            'platPlc': f"서울특별시 모의구 모의동 {params.get('bun', '')}-{params.get('ji', '')}",
+            'newPlatPlc': f"서울특별시 모의구 모의로 {rng.randint(1, 300)}",
+            'dongNm': f"{index + 1}동",
+            'platArea': str(round(area * 1.5, 2)),
+            'archArea': str(round(area / 3, 2)),
+            'totArea': str(area),
+            'vlRat': str(round(rng.uniform(50, 400), 2)),
+            'bcRat': str(round(rng.uniform(10, 60), 2)),
+            'grndFlrCnt': str(rng.randint(1, 30)),
+            'ugrndFlrCnt': str(rng.randint(0, 5)),
+            'hhldCnt': str(rng.randint(0, 200)),
+            'strctCdNm': "철근콘크리트구조",
+            'mainPurpsCdNm': rng.choice(("공동주택", "단독주택", "업무시설", "제1종근린생활시설")),
+            'etcPurps': "모의 용도",
+            'roofCdNm': "(철근)콘크리트",
+            'pmsDay': f"{rng.randint(1970, 2020)}0101",
+            'useAprDay': f"{rng.randint(1971, 2022)}0601",
+            'sigunguCd': params.get('sigunguCd', ''),
+            'bjdongCd': params.get('bjdongCd', ''),
+            'platGbCd': params.get('platGbCd', ''),
+            'bun': params.get('bun', ''),
+            'ji': params.get('ji', ''),
+            'mgmBldrgstPk': f"{seed[:-5]}{index:05d}",
+        })
+    return items
+
+def build_json_response(items, total_count, page_no, page_size, result_code="00", result_msg="NORMAL SERVICE."):
+    """실제 API와 같은 모양의 JSON 응답 (항목이 하나면 객체, 없으면 빈 문자열)"""
+    if not items:
+        items_value = ""
+    else:
+        items_value = {"item": items[0] if len(items) == 1 else items}
+    return {"response": {
+        "header": {"resultCode": result_code, "resultMsg": result_msg},
+        "body": {"items": items_value, "numOfRows": page_size, "pageNo": page_no, "totalCount": total_count},
+    }}
+
+def build_xml_response(items, total_count, page_no, page_size, result_code="00", result_msg="NORMAL SERVICE."):
+    """실제 API와 같은 모양의 XML 응답"""
+    parts = ['<?xml version="1.0" encoding="UTF-8" standalone="yes"?>',
+             f"<response><header><resultCode>{result_code}</resultCode><resultMsg>{escape(result_msg)}</resultMsg>"
+             "</header><body><items>"]
+    for item in items:
+        parts.append("<item>")
+        parts.extend(f"<{name}>{escape(str(value))}</{name}>" for name, value in item.items())
+        parts.append("</item>")
+    parts.append(f"</items><numOfRows>{page_size}</numOfRows><pageNo>{page_no}</pageNo>"
+                 f"<totalCount>{total_count}</totalCount></body></response>")
+    return "".join(parts)
+
+class MockBuildingApi:
+    """
+    Local HTTP server that imitates getBrTitleInfo
+
+    Other operations of the building registry service (getBrFlrOulnInfo,
+    getBrRecapTitleInfo, ...) are answered the same way, so multi-endpoint
+    fetches can be exercised too.
+
+    Serves recorded responses from ``fixtures_dir`` when a file named after
+    the parcel exists (see fixture_name; either a full API response or a
+    plain list of items), and deterministic synthetic items otherwise.
+    Latency, error rate and the number of items per parcel are
+    configurable, and can be changed while the server runs.
+
+    Use as a context manager; ``title_info_url`` is the URL to pass to
+    BuildingRegistryClient.
+    """
+
+    def __init__(self, items_per_parcel=3, latency=0.0, latency_jitter=0.0, error_rate=0.0,
+                 error_status=503, fixtures_dir=None, seed=None, host="127.0.0.1", port=0, quota_per_key=None):
+        """
+        :param items_per_parcel: Number of synthetic items per parcel (totalCount)
+        :param latency: Seconds added to every response
+        :param latency_jitter: Random extra latency of up to this many seconds
+        :param error_rate: Fraction of requests answered with error_status
+        :param error_status: HTTP status returned for injected errors
+        :param fixtures_dir: Directory of recorded responses (optional)
+        :param seed: Seed for latency jitter and error injection
+        :param host: Interface to listen on
+        :param port: Port to listen on (0 picks a free port)
+        :param quota_per_key: Requests answered per serviceKey before the gateway's
+                              quota-exceeded error is returned (no limit if None)
+        """
+        self.items_per_parcel = items_per_parcel
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.fixtures_dir = fixtures_dir
+        self.request_count = 0
+        self.error_count = 0
+        self.quota_per_key = quota_per_key
+        self.key_requests = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._items_cache = {}
+
+        self.server = ThreadingHTTPServer((host, port), self._make_handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def title_info_url(self):
+        return self.service_url + "getBrTitleInfo"
+
+    @property
+    def service_url(self):
+        """건축물대장 서비스 기본 URL (끝에 오퍼레이션 이름을 붙여 사용)"""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}{BUILDING_SERVICE_PATH}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def parcel_items(self, params):
+        """필지의 전체 항목 (녹화 응답이 있으면 그 항목)"""
+        name = fixture_name(params)
+        cache_key = (name, self.items_per_parcel)
+        with self._lock:
+            items = self._items_cache.get(cache_key)
+        if items is not None:
+            return items
+
+        items = None
+        if self.fixtures_dir:
+            path = os.path.join(self.fixtures_dir, name)
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as fixture_file:
+                    recorded = json.load(fixture_file)
+                items = recorded if isinstance(recorded, list) else _recorded_items(recorded)
+        if items is None:
+            items = synthetic_items(params, self.items_per_parcel)
+        with self._lock:
+            self._items_cache[cache_key] = items
+        return items
+
+    def respond(self, query):
+        """
+        Build the response to a query string
+
+        :param query: Dictionary of query parameters (single values)
+        :return: Tuple of (HTTP status, content type, body bytes)
+        """
+        with self._lock:
+            self.request_count += 1
+            key = query.get('serviceKey', '')
+            self.key_requests[key] = self.key_requests.get(key, 0) + 1
+            over_quota = self.quota_per_key is not None and self.key_requests[key] > self.quota_per_key
+            fail = self.error_rate and self._random.random() < self.error_rate
+            delay = self.latency + (self._random.uniform(0, self.latency_jitter) if self.latency_jitter else 0)
+            if fail:
+                self.error_count += 1
+        if delay:
+            time.sleep(delay)
+        if over_quota:
+            return 200, "text/xml;charset=UTF-8", QUOTA_EXCEEDED_BODY
+        if fail:
+            return self.error_status, "text/plain", b"Service Unavailable"
+
+        page_size = max(int(query.get('numOfRows') or 10), 1)
+        page_no = max(int(query.get('pageNo') or 1), 1)
+        items = self.parcel_items(query)
+        page_items = items[(page_no - 1) * page_size:page_no * page_size]
+        if query.get('_type', 'xml') == 'json':
+            body = json.dumps(build_json_response(page_items, len(items), page_no, page_size), ensure_ascii=False)
+            return 200, "application/json;charset=UTF-8", body.encode('utf-8')
+        body = build_xml_response(page_items, len(items), page_no, page_size)
+        return 200, "application/xml;charset=UTF-8", body.encode('utf-8')
+
+    def _make_handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # 헤더와 본문이 따로 전송될 때 지연 ACK로 40ms씩 늦어지지 않도록 함
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urllib.parse.urlsplit(self.path)
+                if not url.path.startswith(BUILDING_SERVICE_PATH):
+                    status, content_type, body = 404, "text/plain", b"Not Found"
+                else:
+                    query = {name: values[0] for name, values in urllib.parse.parse_qs(url.query).items()}
+                    status, content_type, body = api.respond(query)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+def _recorded_items(response):
+    """녹화된 전체 응답에서 항목 목록 추출"""
+    try:
+        items = response['response']['body']['items']
+    except (KeyError, TypeError):
+        return []
+    if not items:
+        return []
+    item = items.get('item', [])
+    return [item] if isinstance(item, dict) else item
@@ -0,0 +1,257 @@
+from qgis.core import (NULL, QgsApplication, QgsFeature, QgsFeatureRequest, QgsFeatureSink, QgsField, QgsFields,
+                       QgsProcessing, QgsProcessingAlgorithm, QgsProcessingException, QgsProcessingParameterEnum,
+                       QgsProcessingParameterFeatureSink, QgsProcessingParameterFeatureSource,
+                       QgsProcessingParameterField, QgsProcessingParameterNumber, QgsProcessingProvider,
+                       QgsVectorDataProvider)
+from qgis.PyQt.QtCore import QVariant
+import os
+import sys
+
+# QGIS 파이썬 콘솔에서 실행해도 같은 폴더의 모듈을 불러올 수 있도록 경로 추가
+if "__file__" in globals():
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from building_client import BuildingRegistryClient
+from building_summary import BUILDING_COUNT_FIELD, DEFAULT_SUMMARY_FIELDS, SUMMARY_FIELDS, fetch_parcel_summaries
+from code_table import get_default_code_table
+from key_pool import MissingServiceKeyError, get_default_key_pool
+from pnu_types import attribute_pnu
+from response_cache import get_default_cache
+from title_schema import KIND_DOUBLE, KIND_INT
+
+_QVARIANT_TYPES = {
+    KIND_DOUBLE: QVariant.Double,
+    KIND_INT: QVariant.Int,
+}
+
+# 선택 목록에 보여 줄 필드 순서
+_FIELD_CHOICES = list(SUMMARY_FIELDS)
+
+def _pnu_value(value):
+    """속성 값을 PNU 문자열로 변환 (QGIS NULL은 빈 값, 실수형 속성은 거부)"""
+    if value == NULL:
+        return None
+    return attribute_pnu(value)
+
+def summary_qgs_fields(fields):
+    """
+    Build the QgsField definitions added to the layer
+
+    :param fields: SUMMARY_FIELDS keys
+    :return: List of QgsField (the building count field comes last)
+    """
+    qgs_fields = []
+    for field in fields:
+        kind = SUMMARY_FIELDS[field][0]
+        qgs_fields.append(QgsField(field, _QVARIANT_TYPES.get(kind, QVariant.String)))
+    qgs_fields.append(QgsField(BUILDING_COUNT_FIELD, QVariant.Int))
+    return qgs_fields
+
+def collect_layer_pnus(source, pnu_field):
+    """
+    Read the PNU attribute of every feature without geometry
+
+    :param source: QgsVectorLayer or QgsFeatureSource
+    :param pnu_field: Name of the PNU attribute
+    :return: Dictionary of PNU -> list of feature ids
+    :raises ValueError: If the PNU attribute is a Real/double field
+    """
+    request = QgsFeatureRequest().setFlags(QgsFeatureRequest.NoGeometry)
+    request.setSubsetOfAttributes([pnu_field], source.fields())
+    feature_ids = {}
+    for feature in source.getFeatures(request):
+        pnu = _pnu_value(feature[pnu_field])
+        if pnu is not None:
+            feature_ids.setdefault(pnu, []).append(feature.id())
+    return feature_ids
+
+def enrich_parcel_layer(layer, pnu_field, client, fields=DEFAULT_SUMMARY_FIELDS, max_workers=8, code_table=None,
+                        feedback=None):
+    """
+    Add building registry fields to a parcel layer in place
+
+    Each distinct PNU is fetched once (through the client's cache), then
+    all values are written in one changeAttributeValues call on the data
+    provider. If the layer is already in edit mode, the changes go into
+    its edit buffer as a single undo command instead.
+
+    :param layer: QgsVectorLayer with a PNU attribute
+    :param pnu_field: Name of the PNU attribute
+    :param client: BuildingRegistryClient used for the lookups
+    :param fields: SUMMARY_FIELDS keys to add
+    :param max_workers: Number of concurrent requests
+    :param code_table: CodeTable used to skip unknown or abolished legal dongs (optional)
+    :param feedback: QgsFeedback for progress and cancellation (optional)
+    :return: Dictionary with parcels, features, updated and errors (PNU -> message)
+    """
+    provider = layer.dataProvider()
+    editable = layer.isEditable()
+    if not editable and not provider.capabilities() & QgsVectorDataProvider.ChangeAttributeValues:
+        raise ValueError(f"레이어 '{layer.name()}'의 속성을 수정할 수 없습니다.")
+
+    feature_ids = collect_layer_pnus(layer, pnu_field)
+    summaries, errors = fetch_parcel_summaries(
+        client, feature_ids, fields, max_workers=max_workers, code_table=code_table,
+        progress=(lambda done, total: feedback.setProgress(done * 100 / total)) if feedback else None,
+        is_canceled=feedback.isCanceled if feedback else None
+    )
+    if feedback is not None and feedback.isCanceled():
+        return {"parcels": len(feature_ids), "features": 0, "updated": 0, "errors": errors}
+
+    if editable:
+        # 필드 추가와 값 변경을 한 번의 실행 취소 단위로 묶음
+        layer.beginEditCommand("건축물대장 정보 추가")
+
+    # 없는 필드만 추가
+    new_fields = [field for field in summary_qgs_fields(fields) if layer.fields().indexOf(field.name()) < 0]
+    if new_fields:
+        if editable:
+            for field in new_fields:
+                layer.addAttribute(field)
+        elif not provider.addAttributes(new_fields):
+            raise ValueError(f"레이어 '{layer.name()}'에 필드를 추가할 수 없습니다.")
+        layer.updateFields()
+
+    field_indexes = {name: layer.fields().indexOf(name) for name in list(fields) + [BUILDING_COUNT_FIELD]}
+    attribute_map = {}
+    for pnu, summary in summaries.items():
+        values = {field_indexes[name]: (NULL if value is None else value) for name, value in summary.items()}
+        for feature_id in feature_ids[pnu]:
+            attribute_map[feature_id] = values
+
+    if editable:
+        for feature_id, values in attribute_map.items():
+            layer.changeAttributeValues(feature_id, values)
+        layer.endEditCommand()
+    else:
+        if not provider.changeAttributeValues(attribute_map):
+            raise ValueError(f"레이어 '{layer.name()}'의 속성을 저장하지 못했습니다.")
+        layer.triggerRepaint()
+
+    return {"parcels": len(feature_ids), "features": sum(len(ids) for ids in feature_ids.values()),
+            "updated": len(attribute_map), "errors": errors}
+
+class EnrichParcelsAlgorithm(QgsProcessingAlgorithm):
+    """
+    Processing algorithm that copies a parcel layer with building fields added
+
+    Distinct PNUs are looked up concurrently through the shared response
+    cache; features whose PNU could not be looked up keep NULL values.
+    """
+    INPUT = 'INPUT'
+    PNU_FIELD = 'PNU_FIELD'
+    FIELDS = 'FIELDS'
+    WORKERS = 'WORKERS'
+    OUTPUT = 'OUTPUT'
+
+    def name(self):
+        return 'enrichparcels'
+
+    def displayName(self):
+        return '필지에 건축물대장 정보 추가'
+
+    def shortHelpString(self):
+        return ("PNU 속성이 있는 필지 레이어에 건축물대장 표제부 정보를 필드로 추가합니다. "
+                "같은 PNU는 한 번만 조회하고, 한 필지에 건물이 여러 동이면 면적은 합계, "
+                "층수와 비율은 최댓값, 사용승인일은 가장 이른 날짜를 사용합니다.")
+
+    def createInstance(self):
+        return EnrichParcelsAlgorithm()
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterFeatureSource(
+            self.INPUT, '필지 레이어', [QgsProcessing.TypeVectorPolygon]))
+        self.addParameter(QgsProcessingParameterField(
+            self.PNU_FIELD, 'PNU 필드', 'PNU', self.INPUT))
+        self.addParameter(QgsProcessingParameterEnum(
+            self.FIELDS, '추가할 항목', [f"{field} ({SUMMARY_FIELDS[field][2]})" for field in _FIELD_CHOICES],
+            allowMultiple=True,
+            defaultValue=[_FIELD_CHOICES.index(field) for field in DEFAULT_SUMMARY_FIELDS]))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.WORKERS, '동시 요청 수', QgsProcessingParameterNumber.Integer, 8, minValue=1, maxValue=32))
+        self.addParameter(QgsProcessingParameterFeatureSink(self.OUTPUT, '건축물 정보가 추가된 필지'))
+
+    def processAlgorithm(self, parameters, context, feedback):
+        source = self.parameterAsSource(parameters, self.INPUT, context)
+        if source is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.INPUT))
+        pnu_field = self.parameterAsString(parameters, self.PNU_FIELD, context)
+        fields = [_FIELD_CHOICES[index] for index in self.parameterAsEnums(parameters, self.FIELDS, context)]
+        workers = self.parameterAsInt(parameters, self.WORKERS, context)
+
+        output_fields = QgsFields(source.fields())
+        for field in summary_qgs_fields(fields):
+            if output_fields.indexOf(field.name()) < 0:
+                output_fields.append(field)
+        sink, dest_id = self.parameterAsSink(parameters, self.OUTPUT, context, output_fields,
+                                             source.wkbType(), source.sourceCrs())
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        feedback.pushInfo("PNU 목록을 읽는 중...")
+        feature_ids = collect_layer_pnus(source, pnu_field)
+        feedback.pushInfo(f"고유 PNU {len(feature_ids)}개를 조회합니다.")
+
+        try:
+            key_pool = get_default_key_pool()
+        except MissingServiceKeyError as e:
+            raise QgsProcessingException(str(e))
+        with BuildingRegistryClient(None, cache=get_default_cache(), pool_maxsize=max(workers, 10),
+                                    key_pool=key_pool) as client:
+            summaries, errors = fetch_parcel_summaries(
+                client, feature_ids, fields, max_workers=workers, code_table=get_default_code_table(),
+                progress=lambda done, total: feedback.setProgress(done * 90 / total),
+                is_canceled=feedback.isCanceled
+            )
+        if feedback.isCanceled():
+            return {}
+        for pnu, message in list(errors.items())[:20]:
+            feedback.reportError(f"{pnu}: {message}")
+        if len(errors) > 20:
+            feedback.reportError(f"... 외 {len(errors) - 20}건 조회 실패")
+
+        names = list(fields) + [BUILDING_COUNT_FIELD]
+        pnu_by_id = {feature_id: pnu for pnu, ids in feature_ids.items() for feature_id in ids}
+        total = source.featureCount() or 1
+        for current, feature in enumerate(source.getFeatures()):
+            if feedback.isCanceled():
+                break
+            summary = summaries.get(pnu_by_id.get(feature.id()), {})
+            out_feature = QgsFeature(output_fields)
+            out_feature.setGeometry(feature.geometry())
+            attributes = feature.attributes()
+            attributes.extend([NULL] * (output_fields.count() - len(attributes)))
+            for name in names:
+                value = summary.get(name)
+                attributes[output_fields.indexOf(name)] = NULL if value is None else value
+            out_feature.setAttributes(attributes)
+            sink.addFeature(out_feature, QgsFeatureSink.FastInsert)
+            feedback.setProgress(90 + current * 10 / total)
+
+        return {self.OUTPUT: dest_id}
+
+class ApiTestProcessingProvider(QgsProcessingProvider):
+    """공공데이터 API 처리 알고리즘 묶음"""
+
+    def id(self):
+        return 'qgis_apitest'
+
+    def name(self):
+        return '공공데이터 API'
+
+    def loadAlgorithms(self):
+        self.addAlgorithm(EnrichParcelsAlgorithm())
+
+def register_provider():
+    """
+    Register the processing provider so the algorithm shows up in the toolbox
+
+    :return: The registered provider (pass it to removeProvider to unload)
+    """
+    provider = ApiTestProcessingProvider()
+    QgsApplication.processingRegistry().addProvider(provider)
+    return provider
+
+# QGIS 파이썬 콘솔에서 실행하면 처리 도구상자에 알고리즘 등록
+if "iface" in globals():
+    apitest_provider = register_provider()
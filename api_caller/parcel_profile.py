@@ -0,0 +1,227 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from building_client import BuildingApiError, DEFAULT_PAGE_SIZE, extract_items, extract_total_count, is_cacheable
+from building_lookup import check_pnu, parse_pnu
+
+# 건축물대장 서비스 (오퍼레이션 이름을 붙여 사용)
+BUILDING_SERVICE_URL = "http://apis.data.go.kr/1613000/BldRgstHubService/"
+
+# 토지임야정보 (토지대장) 서비스
+LAND_LEDGER_URL = "http://apis.data.go.kr/1611000/nsdi/LadfrlService/attr/getLadfrlList"
+
+def building_params(pnu, params, page_size, page_no):
+    """건축물대장 서비스 요청 파라미터 (parse_pnu 결과 사용)"""
+    return {
+        "sigunguCd": params['sigungu_cd'],
+        "bjdongCd": params['bjdong_cd'],
+        "platGbCd": params['plat_gb_cd'],
+        "bun": params['bun'],
+        "ji": params['ji'],
+        "numOfRows": page_size,
+        "pageNo": page_no,
+        "_type": "json",
+    }
+
+def land_params(pnu, params, page_size, page_no):
+    """토지임야정보 요청 파라미터 (PNU를 그대로 사용)"""
+    return {"pnu": pnu, "format": "json", "numOfRows": page_size, "pageNo": page_no}
+
+def extract_building_page(response):
+    """건축물대장 응답의 (항목 목록, totalCount)"""
+    return extract_items(response), extract_total_count(response)
+
+def extract_land_page(response):
+    """
+    Return the items and total count of a land ledger response
+
+    The NSDI services wrap the page in an object named after the list,
+    e.g. {"ladfrlVOList": {"ladfrlVOList": [...], "totalCount": "1"}}.
+
+    :raises BuildingApiError: For error dictionaries and unexpected shapes
+    """
+    if not isinstance(response, dict):
+        raise BuildingApiError("Expected a JSON response")
+    if "error" in response:
+        raise BuildingApiError(response["error"])
+    page = response.get("ladfrlVOList")
+    if not isinstance(page, dict):
+        raise BuildingApiError("Unexpected response structure")
+    items = page.get("ladfrlVOList") or []
+    if isinstance(items, dict):
+        items = [items]
+    return items, int(page.get("totalCount") or 0)
+
+def is_land_cacheable(result):
+    """정상 토지임야정보 응답인지 확인"""
+    return isinstance(result, dict) and isinstance(result.get("ladfrlVOList"), dict)
+
+class ApiEndpoint:
+    """
+    One endpoint of a parcel profile
+
+    Describes how to build the query of a PNU and how to read the items
+    out of a response page.
+    """
+
+    def __init__(self, name, url, build_params=building_params, extract_page=extract_building_page,
+                 timeout=None, cacheable=is_cacheable):
+        """
+        :param name: Key of the endpoint's items in the profile record
+        :param url: Endpoint URL
+        :param build_params: Callable (pnu, parsed params, page size, page no) -> query parameters
+        :param extract_page: Callable response -> (items, totalCount), raising BuildingApiError on errors
+        :param timeout: (connect, read) timeout in seconds (client default if None)
+        :param cacheable: Predicate deciding whether a response is cached
+        """
+        self.name = name
+        self.url = url
+        self.build_params = build_params
+        self.extract_page = extract_page
+        self.timeout = timeout
+        self.cacheable = cacheable
+
+    def __repr__(self):
+        return f"ApiEndpoint({self.name!r}, {self.url!r})"
+
+def building_endpoints(service_url=BUILDING_SERVICE_URL, timeout=None):
+    """
+    Endpoints of the building registry service used in a profile
+
+    :param service_url: Base URL of the service (for a local mock server)
+    :param timeout: (connect, read) timeout shared by the endpoints
+    :return: Tuple of ApiEndpoint (표제부, 총괄표제부, 층별개요, 전유공용면적)
+    """
+    return (
+        ApiEndpoint("title", service_url + "getBrTitleInfo", timeout=timeout),
+        ApiEndpoint("recap_title", service_url + "getBrRecapTitleInfo", timeout=timeout),
+        ApiEndpoint("floor", service_url + "getBrFlrOulnInfo", timeout=timeout),
+        ApiEndpoint("area", service_url + "getBrExposPubuseAreaInfo", timeout=timeout),
+    )
+
+LAND_LEDGER_ENDPOINT = ApiEndpoint("land", LAND_LEDGER_URL, build_params=land_params,
+                                   extract_page=extract_land_page, cacheable=is_land_cacheable)
+
+DEFAULT_ENDPOINTS = building_endpoints() + (LAND_LEDGER_ENDPOINT,)
+
+def fetch_endpoint(client, endpoint, pnu, params, page_size=DEFAULT_PAGE_SIZE, refresh=False):
+    """
+    Fetch every page of one endpoint for a parcel
+
+    :param client: BuildingRegistryClient whose session, cache and retries are used
+    :param endpoint: ApiEndpoint to query
+    :param pnu: 19-digit PNU code
+    :param params: Parsed PNU parameters from parse_pnu
+    :param page_size: Number of rows requested per page
+    :param refresh: Skip cached entries and store fresh responses
+    :return: Tuple of (items, totalCount)
+    :raises BuildingApiError: If a page cannot be fetched
+    """
+    items = []
+    page_no = 1
+    while True:
+        query = {"serviceKey": client.service_key, **endpoint.build_params(pnu, params, page_size, page_no)}
+        response = client.fetch_json(endpoint.url, query, refresh=refresh, timeout=endpoint.timeout,
+                                     cacheable=endpoint.cacheable)
+        page_items, total_count = endpoint.extract_page(response)
+        items.extend(page_items)
+        if not page_items or len(items) >= total_count:
+            return items[:total_count], total_count
+        page_no += 1
+
+def lookup_profile(client, pnu, page_size=DEFAULT_PAGE_SIZE, refresh=False, code_table=None,
+                   endpoints=DEFAULT_ENDPOINTS, executor=None):
+    """
+    Fetch all endpoints of a parcel concurrently and merge them into one record
+
+    Every endpoint is requested at the same time over the client's pooled
+    session, so a profile takes about as long as its slowest endpoint.
+    An endpoint that fails does not fail the others; its error is
+    reported under ``errors``. Never raises.
+
+    The endpoint fetches run on ``executor``. Callers looking up many
+    parcels at once should pass one with a thread for every endpoint of
+    every parcel in flight (see ProfileLookup), or the fetches of one
+    parcel wait behind those of the others.
+
+    :param client: BuildingRegistryClient used for the requests
+    :param pnu: 19-digit PNU code
+    :param page_size: Number of rows requested per page
+    :param refresh: Skip cached entries and store fresh responses
+    :param code_table: CodeTable used to validate and label the legal dong (optional)
+    :param endpoints: Sequence of ApiEndpoint
+    :param executor: Executor running the endpoint fetches (a private one for this call if None)
+    :return: Dictionary with pnu, params, bjdong_name, one item list per endpoint name
+             (None if it failed), total_counts, seconds, errors, error and error_type.
+             error is only set when the PNU is invalid or every endpoint failed.
+    """
+    record = {"pnu": pnu, "params": None, "bjdong_name": None}
+    record.update({endpoint.name: None for endpoint in endpoints})
+    record.update({"total_counts": {}, "seconds": {}, "errors": {}, "error": None, "error_type": None})
+    try:
+        check_pnu(pnu)
+        if code_table is not None:
+            record["bjdong_name"] = code_table.name(pnu[:10])
+            code_table.validate_pnu(pnu)
+        record["params"] = parse_pnu(pnu)
+    except Exception as e:
+        record["error"] = str(e)
+        record["error_type"] = type(e).__name__
+        return record
+
+    def timed_fetch(endpoint):
+        started = time.perf_counter()
+        try:
+            return fetch_endpoint(client, endpoint, pnu, record["params"], page_size, refresh)
+        finally:
+            record["seconds"][endpoint.name] = round(time.perf_counter() - started, 6)
+
+    own_executor = executor is None and bool(endpoints)
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=len(endpoints), thread_name_prefix="profile")
+    try:
+        futures = [(endpoint, executor.submit(timed_fetch, endpoint)) for endpoint in endpoints]
+        for endpoint, future in futures:
+            try:
+                record[endpoint.name], record["total_counts"][endpoint.name] = future.result()
+            except Exception as e:
+                record["errors"][endpoint.name] = {"error": str(e), "error_type": type(e).__name__}
+    finally:
+        if own_executor:
+            executor.shutdown(wait=False)
+
+    if endpoints and len(record["errors"]) == len(endpoints):
+        record["error"] = "모든 엔드포인트 조회에 실패했습니다."
+        record["error_type"] = BuildingApiError.__name__
+    return record
+
+class ProfileLookup:
+    """
+    lookup_profile with a fan-out pool sized for a batch
+
+    The pool has a thread for every endpoint of every parcel in flight
+    (max_workers * len(endpoints)), so concurrent profiles never queue
+    behind each other. Pass the instance as the ``lookup`` of
+    fetch_building_info_batch and close it when the batch is done.
+    """
+
+    def __init__(self, max_workers, endpoints=DEFAULT_ENDPOINTS):
+        """
+        :param max_workers: Number of parcels looked up at the same time
+        :param endpoints: Sequence of ApiEndpoint fetched for every parcel
+        """
+        self.endpoints = endpoints
+        self.executor = ThreadPoolExecutor(max_workers=max(max_workers, 1) * max(len(endpoints), 1),
+                                           thread_name_prefix="profile")
+
+    def __call__(self, client, pnu, page_size=DEFAULT_PAGE_SIZE, refresh=False, code_table=None):
+        return lookup_profile(client, pnu, page_size, refresh, code_table, endpoints=self.endpoints,
+                              executor=self.executor)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
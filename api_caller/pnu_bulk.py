@@ -0,0 +1,172 @@
+try:
+    import numpy as np
+except ImportError:  # numpy가 없으면 순수 파이썬으로 처리
+    np = None
+
+# parse_pnu가 반환하는 항목 (열 순서)
+PNU_FIELDS = ('sigungu_cd', 'bjdong_cd', 'plat_gb_cd', 'bun', 'ji')
+
+# 각 항목의 PNU 내 위치
+_FIELD_SLICES = {
+    'sigungu_cd': (0, 5),
+    'bjdong_cd': (5, 10),
+    'bun': (11, 15),
+    'ji': (15, 19),
+}
+
+# 산구분 숫자 → platGbCd (parse_pnu와 같은 str(int(san) - 1) 규칙)
+_PLAT_GB_CODES = tuple(str(digit - 1) for digit in range(10))
+
+# 정상적인 산구분 값 (1: 일반, 2: 산)
+_VALID_SAN_DIGITS = (1, 2)
+
+def parse_pnu_bulk(pnus):
+    """
+    Parse many PNU codes at once into columns
+
+    Gives the same strings as parse_pnu for every PNU that parse_pnu
+    accepts (19 characters with a numeric 산 digit); other rows get empty
+    strings. ``valid`` is True only for 19-digit, all-numeric PNUs whose 산
+    digit is 1 or 2.
+
+    With numpy installed the columns are numpy unicode arrays computed
+    without a Python-level loop; when every row parses, the code columns
+    are read-only views that share memory with the (converted) input.
+    Without numpy they are lists.
+
+    :param pnus: List of strings, numpy array or pyarrow string array/chunked array
+    :return: Dictionary with the parse_pnu keys plus "valid"
+    """
+    if np is None:
+        return _parse_pnu_bulk_python(_to_list(pnus))
+
+    return _parse_unicode_array(_to_unicode_array(pnus))
+
+def iter_parsed_pnus(columns):
+    """
+    Iterate parse_pnu-style dictionaries from parse_pnu_bulk output
+
+    :param columns: Return value of parse_pnu_bulk
+    :return: Generator of (valid, params) tuples, one per input row
+    """
+    field_columns = [columns[field] for field in PNU_FIELDS]
+    for valid, *values in zip(columns['valid'], *field_columns):
+        yield bool(valid), {field: str(value) for field, value in zip(PNU_FIELDS, values)}
+
+def _to_list(pnus):
+    if hasattr(pnus, 'to_pylist'):
+        return pnus.to_pylist()
+    return list(pnus)
+
+def _parse_pnu_bulk_python(pnus):
+    columns = {field: [] for field in PNU_FIELDS}
+    valid_mask = []
+    for pnu in pnus:
+        pnu = pnu if isinstance(pnu, str) else ""
+        san = pnu[10:11]
+        if len(pnu) == 19 and san.isdigit() and san.isascii():
+            for field, (start, end) in _FIELD_SLICES.items():
+                columns[field].append(pnu[start:end])
+            columns['plat_gb_cd'].append(_PLAT_GB_CODES[int(san)])
+            valid_mask.append(pnu.isascii() and pnu.isdigit() and int(san) in _VALID_SAN_DIGITS)
+        else:
+            for field in PNU_FIELDS:
+                columns[field].append("")
+            valid_mask.append(False)
+    columns['valid'] = valid_mask
+    return columns
+
+def _to_unicode_array(pnus):
+    """입력을 1차원 numpy 유니코드 배열로 변환"""
+    array = _arrow_unicode_array(pnus)
+    if array is not None:
+        return array
+
+    if hasattr(pnus, 'to_numpy'):
+        pnus = pnus.to_numpy(zero_copy_only=False) if _is_arrow(pnus) else pnus.to_numpy()
+    array = np.asarray(pnus)
+    if array.ndim != 1:
+        array = array.ravel()
+    if array.dtype.kind == 'O':
+        array = np.array([pnu if isinstance(pnu, str) else "" for pnu in array], dtype='U')
+    elif array.dtype.kind == 'S':
+        # 바이트 문자열은 바이트 값을 그대로 코드 포인트로 사용
+        array = _bytes_to_unicode(array.view(np.uint8).reshape(len(array), array.dtype.itemsize))
+    elif array.dtype.kind != 'U':
+        array = array.astype('U')
+    return np.ascontiguousarray(array)
+
+def _bytes_to_unicode(data):
+    array = np.empty(len(data), dtype=f'U{max(data.shape[1], 1)}')
+    array.view(np.uint32).reshape(len(data), -1)[:, :data.shape[1]] = data
+    return array
+
+def _is_arrow(pnus):
+    return type(pnus).__module__.startswith('pyarrow')
+
+def _arrow_unicode_array(pnus):
+    """Arrow 문자열 배열의 모든 값이 19바이트면 데이터 버퍼에서 바로 변환"""
+    if not _is_arrow(pnus):
+        return None
+    if hasattr(pnus, 'combine_chunks'):
+        pnus = pnus.combine_chunks()
+    if str(pnus.type) not in ('string', 'utf8') or pnus.null_count:
+        return None
+
+    _, offsets_buffer, data_buffer = pnus.buffers()
+    offsets = np.frombuffer(offsets_buffer, dtype=np.int32)[pnus.offset:pnus.offset + len(pnus) + 1]
+    if len(pnus) == 0 or not (np.diff(offsets) == 19).all():
+        return None
+
+    data = np.frombuffer(data_buffer, dtype=np.uint8)[offsets[0]:offsets[-1]].reshape(len(pnus), 19)
+    array = _bytes_to_unicode(data)
+    if data.max() >= 0x80:
+        # ASCII가 아닌 글자가 섞인 값은 19자가 아니므로 파싱 대상이 아님
+        array[(data >= 0x80).any(axis=1)] = ""
+    return array
+
+def _field_view(array, start, end):
+    """각 행의 [start, end) 글자를 복사 없이 가리키는 읽기 전용 배열"""
+    view = np.ndarray((len(array),), dtype=f'U{end - start}', buffer=array,
+                      offset=start * 4, strides=(array.itemsize,))
+    view.flags.writeable = False
+    return view
+
+def _parse_unicode_array(array):
+    n = len(array)
+    width = array.dtype.itemsize // 4
+    if n == 0 or width < 19:
+        result = {field: np.full(n, "", dtype='U1') for field in PNU_FIELDS}
+        result['valid'] = np.zeros(n, dtype=bool)
+        return result
+
+    codes = array.view(np.uint32).reshape(n, width)
+    head = codes[:, :19]
+    san = head[:, 10]
+    parsed = (head[:, 18] != 0) & (san - np.uint32(48) < 10)
+    if width > 19:
+        parsed &= codes[:, 19] == 0
+
+    # 전체 최솟값/최댓값이 '0'~'9' 안이면 행마다 확인할 필요가 없음
+    if head.min() >= 48 and head.max() <= 57:
+        all_digits = parsed
+    else:
+        is_digit = head - np.uint32(48) < 10
+        all_digits = parsed & (is_digit.view(np.uint8).sum(axis=1, dtype=np.uint8) == 19)
+    valid = all_digits & ((san == 48 + 1) | (san == 48 + 2))
+
+    all_parsed = bool(parsed.all())
+    columns = {}
+    for field, (start, end) in _FIELD_SLICES.items():
+        column = _field_view(array, start, end)
+        columns[field] = column if all_parsed else np.where(parsed, column, "")
+
+    plat_gb_codes = np.array(_PLAT_GB_CODES + ("",), dtype='U2')
+    san_index = san - np.uint32(48)
+    if not all_parsed:
+        san_index = np.where(parsed, san_index, len(_PLAT_GB_CODES))
+    columns['plat_gb_cd'] = plat_gb_codes.take(san_index)
+
+    result = {field: columns[field] for field in PNU_FIELDS}
+    result['valid'] = valid
+    return result
@@ -0,0 +1,315 @@
+import bisect
+import functools
+from array import array
+from code_table import prefix_range
+
+# PNU 자리수와 법정동코드 뒤에 붙는 자리수 (산 1 + 본번 4 + 부번 4)
+PNU_LENGTH = 19
+_LOT_DIGITS = 9
+_LOT_SCALE = 10 ** _LOT_DIGITS
+
+def pack_pnu(pnu):
+    """
+    Pack a PNU into an unsigned 64-bit integer
+
+    :param pnu: 19-digit PNU string, PackedPnu or already packed int
+    :return: PNU as int (fits in an unsigned 64-bit integer)
+    :raises ValueError: If the PNU is not 19 digits
+    """
+    if isinstance(pnu, PackedPnu):
+        return pnu.value
+    if isinstance(pnu, int):
+        if not 0 <= pnu < 10 ** PNU_LENGTH:
+            raise ValueError(f"PNU 범위를 벗어난 값입니다: {pnu}")
+        return pnu
+    pnu = str(pnu)
+    if len(pnu) != PNU_LENGTH or not (pnu.isascii() and pnu.isdigit()):
+        raise ValueError(f"PNU는 19자리 숫자여야 합니다: {pnu}")
+    return int(pnu)
+
+def attribute_pnu(value):
+    """
+    Convert a layer attribute value to a PNU string
+
+    Integer attributes (Int64) are zero-padded to 19 digits. Real/double
+    attributes are refused: a double keeps only 15-16 significant digits,
+    so neighbouring PNUs would collapse into one wrong value.
+
+    :param value: Attribute value (string, int or None)
+    :return: PNU string, or None for an empty value
+    :raises ValueError: If the value is a float
+    """
+    if value is None:
+        return None
+    if isinstance(value, float):
+        raise ValueError(f"PNU가 실수형(Real) 필드에 저장되어 있어 정확한 값을 알 수 없습니다: {value!r}. "
+                         "PNU 필드를 문자열(Text) 또는 정수(Int64) 형식으로 저장하세요.")
+    if isinstance(value, int):
+        return format(value, '019d')
+    value = str(value).strip()
+    return value or None
+
+def _bjdong_range(bjdong_code):
+    """법정동코드(시도~리 어느 계층이든)에 속하는 PNU 정수 범위 [lo, hi)"""
+    lo, hi = prefix_range(bjdong_code)
+    return lo * _LOT_SCALE, hi * _LOT_SCALE
+
+@functools.total_ordering
+class PackedPnu:
+    """
+    A PNU held as a single integer
+
+    Orders and hashes like its integer value, and converts losslessly to
+    and from the 19-digit string and the parse_pnu dictionary.
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, pnu):
+        """
+        :param pnu: 19-digit PNU string, PackedPnu or packed int
+        """
+        self.value = pack_pnu(pnu)
+
+    @classmethod
+    def from_params(cls, params):
+        """
+        Build a PNU from a parse_pnu dictionary
+
+        :param params: Dictionary with sigungu_cd, bjdong_cd, plat_gb_cd, bun and ji
+        :return: PackedPnu
+        """
+        san_value = int(params['plat_gb_cd']) + 1
+        return cls(f"{params['sigungu_cd']}{params['bjdong_cd']}{san_value}{params['bun']}{params['ji']}")
+
+    def __str__(self):
+        return f"{self.value:019d}"
+
+    def __repr__(self):
+        return f"PackedPnu('{self}')"
+
+    def __int__(self):
+        return self.value
+
+    def __index__(self):
+        return self.value
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __eq__(self, other):
+        if isinstance(other, PackedPnu):
+            return self.value == other.value
+        return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, PackedPnu):
+            return self.value < other.value
+        return NotImplemented
+
+    @property
+    def bjdong_code(self):
+        """10자리 법정동코드 (시군구 5 + 읍면동/리 5)"""
+        return f"{self.value // _LOT_SCALE:010d}"
+
+    def to_params(self):
+        """
+        Return the same dictionary parse_pnu gives for this PNU
+
+        :return: Dictionary with sigungu_cd, bjdong_cd, plat_gb_cd, bun and ji
+        """
+        pnu = str(self)
+        return {
+            'sigungu_cd': pnu[0:5],
+            'bjdong_cd': pnu[5:10],
+            'plat_gb_cd': str(int(pnu[10]) - 1),
+            'bun': pnu[11:15],
+            'ji': pnu[15:],
+        }
+
+class PnuSet:
+    """
+    Sorted set of PNUs backed by an unsigned 64-bit array
+
+    Each PNU costs 8 bytes. Membership uses binary search, and iteration
+    is always in PNU order, so all parcels of a legal dong (or 시군구,
+    시도) form one contiguous range.
+    """
+
+    def __init__(self, pnus=()):
+        """
+        :param pnus: Iterable of PNU strings, PackedPnu or packed ints
+        """
+        self._values = array('Q', sorted(set(map(pack_pnu, pnus))))
+
+    @classmethod
+    def _from_sorted(cls, values):
+        pnu_set = cls.__new__(cls)
+        pnu_set._values = values
+        return pnu_set
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, pnu):
+        try:
+            value = pack_pnu(pnu)
+        except (TypeError, ValueError):
+            return False
+        position = bisect.bisect_left(self._values, value)
+        return position < len(self._values) and self._values[position] == value
+
+    def __iter__(self):
+        return (PackedPnu(value) for value in self._values)
+
+    def __eq__(self, other):
+        if isinstance(other, PnuSet):
+            return self._values == other._values
+        return NotImplemented
+
+    def __repr__(self):
+        return f"PnuSet(<{len(self)} PNUs>)"
+
+    def strings(self):
+        """PNU 문자열을 정렬 순서대로 반환하는 제너레이터"""
+        return (f"{value:019d}" for value in self._values)
+
+    def add(self, pnu):
+        """
+        Add one PNU (O(n) insert; prefer update() for many PNUs)
+
+        :param pnu: PNU string, PackedPnu or packed int
+        """
+        value = pack_pnu(pnu)
+        position = bisect.bisect_left(self._values, value)
+        if position == len(self._values) or self._values[position] != value:
+            self._values.insert(position, value)
+
+    def update(self, pnus):
+        """
+        Add many PNUs at once
+
+        :param pnus: Iterable of PNU strings, PackedPnu or packed ints
+        """
+        new_values = set(map(pack_pnu, pnus))
+        if new_values:
+            new_values.update(self._values)
+            self._values = array('Q', sorted(new_values))
+
+    def discard(self, pnu):
+        """PNU가 있으면 제거"""
+        try:
+            value = pack_pnu(pnu)
+        except (TypeError, ValueError):
+            return
+        position = bisect.bisect_left(self._values, value)
+        if position < len(self._values) and self._values[position] == value:
+            del self._values[position]
+
+    def range(self, start, stop):
+        """
+        Return the PNUs in [start, stop)
+
+        :param start: First PNU (inclusive)
+        :param stop: Last PNU (exclusive)
+        :return: PnuSet
+        """
+        lo = bisect.bisect_left(self._values, pack_pnu(start))
+        hi = bisect.bisect_left(self._values, pack_pnu(stop), lo)
+        return self._from_sorted(self._values[lo:hi])
+
+    def in_bjdong(self, bjdong_code):
+        """
+        Return the PNUs located in a legal dong
+
+        A 시도 or 시군구 level code selects every PNU below it.
+
+        :param bjdong_code: 10-digit legal-dong code
+        :return: PnuSet
+        """
+        lo, hi = _bjdong_range(bjdong_code)
+        start = bisect.bisect_left(self._values, lo)
+        end = bisect.bisect_left(self._values, hi, start)
+        return self._from_sorted(self._values[start:end])
+
+class PnuMap:
+    """
+    Read-mostly mapping from PNU to value, sorted by PNU
+
+    Keys live in an unsigned 64-bit array and values in a parallel list.
+    Lookups use binary search; building from many pairs sorts once.
+    """
+
+    def __init__(self, items=()):
+        """
+        :param items: Iterable of (PNU, value) pairs; later pairs win for duplicate PNUs
+        """
+        entries = {}
+        for pnu, value in items:
+            entries[pack_pnu(pnu)] = value
+        keys = sorted(entries)
+        self._keys = array('Q', keys)
+        self._values = [entries[key] for key in keys]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _position(self, pnu):
+        try:
+            key = pack_pnu(pnu)
+        except (TypeError, ValueError):
+            return None
+        position = bisect.bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            return position
+        return None
+
+    def __contains__(self, pnu):
+        return self._position(pnu) is not None
+
+    def __getitem__(self, pnu):
+        position = self._position(pnu)
+        if position is None:
+            raise KeyError(pnu)
+        return self._values[position]
+
+    def __setitem__(self, pnu, value):
+        key = pack_pnu(pnu)
+        position = bisect.bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            self._values[position] = value
+        else:
+            self._keys.insert(position, key)
+            self._values.insert(position, value)
+
+    def __iter__(self):
+        return (PackedPnu(key) for key in self._keys)
+
+    def __repr__(self):
+        return f"PnuMap(<{len(self)} PNUs>)"
+
+    def get(self, pnu, default=None):
+        position = self._position(pnu)
+        return default if position is None else self._values[position]
+
+    def keys(self):
+        return PnuSet._from_sorted(array('Q', self._keys))
+
+    def values(self):
+        return list(self._values)
+
+    def items(self):
+        """(PackedPnu, 값) 쌍을 PNU 순서대로 반환하는 제너레이터"""
+        return ((PackedPnu(key), value) for key, value in zip(self._keys, self._values))
+
+    def items_in_bjdong(self, bjdong_code):
+        """
+        Iterate the entries located in a legal dong
+
+        :param bjdong_code: 10-digit legal-dong code (시도/시군구 codes select everything below)
+        :return: Generator of (PackedPnu, value) pairs in PNU order
+        """
+        lo, hi = _bjdong_range(bjdong_code)
+        start = bisect.bisect_left(self._keys, lo)
+        end = bisect.bisect_left(self._keys, hi, start)
+        for position in range(start, end):
+            yield PackedPnu(self._keys[position]), self._values[position]
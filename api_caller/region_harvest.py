@@ -0,0 +1,257 @@
+import json
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from building_client import DEFAULT_PAGE_SIZE, extract_items, extract_total_count
+from code_table import LEVEL_EUPMYEONDONG, LEVEL_RI, LEVEL_SIDO, LEVEL_SIGUNGU, code_level
+from result_writers import DEFAULT_ROW_GROUP_SIZE, guess_output_format, open_result_writer
+
+# 수집 결과를 넘겨받기 전까지 쌓아 두는 최대 페이지 수 (작업 스레드 수의 배수)
+QUEUE_PAGES_PER_WORKER = 4
+
+def normalize_region_code(region):
+    """
+    Expand a 시도 (2-digit) or 시군구 (5-digit) code to a 10-digit legal-dong code
+
+    :param region: Region code as a string or int
+    :return: 10-digit code string
+    :raises ValueError: If the code is not a 2-, 5- or 10-digit number
+    """
+    region = str(region).strip()
+    if not region.isdigit() or len(region) not in (2, 5, 10):
+        raise ValueError(f"지역 코드는 2자리(시도), 5자리(시군구) 또는 10자리 숫자여야 합니다: {region}")
+    return region.ljust(10, "0")
+
+def harvest_dongs(code_table, region, include_abolished=False):
+    """
+    List the legal dongs of a region that buildings are registered under
+
+    A 읍·면 with 리 below it is replaced by its 리, because the building
+    registry files buildings under the 리 code; 동 and 리 without children
+    are returned as they are.
+
+    :param code_table: CodeTable to enumerate
+    :param region: 시도 or 시군구 code (2, 5 or 10 digits)
+    :param include_abolished: Also return abolished codes
+    :return: List of 10-digit legal-dong codes in code order
+    :raises ValueError: If the region is unknown or not a 시도/시군구
+    """
+    region = normalize_region_code(region)
+    if region not in code_table:
+        raise ValueError(f"존재하지 않는 지역 코드입니다: {region}")
+    if code_level(region) not in (LEVEL_SIDO, LEVEL_SIGUNGU):
+        raise ValueError(f"시도 또는 시군구 코드를 입력하세요: {region} ({code_table.name(region)})")
+
+    candidates = [code for code in code_table.descendants(region, include_abolished)
+                  if code_level(code) in (LEVEL_EUPMYEONDONG, LEVEL_RI)]
+    # 리가 있는 읍·면은 제외
+    parents = {code[:8] for code in candidates if code_level(code) == LEVEL_RI}
+    return [code for code in candidates if code_level(code) == LEVEL_RI or code[:8] not in parents]
+
+def item_pnu(item):
+    """건축물대장 항목의 지번을 19자리 PNU로 변환 (대지구분 0/1 -> 1/2)"""
+    try:
+        san_value = int(item.get('platGbCd') or 0) + 1
+    except (TypeError, ValueError):
+        san_value = 1
+    return (f"{item.get('sigunguCd', '')}{item.get('bjdongCd', '')}{san_value}"
+            f"{str(item.get('bun') or '').zfill(4)}{str(item.get('ji') or '').zfill(4)}")
+
+def harvest_key(item):
+    """중복 제거에 쓰는 키 (건축물대장 PK, 없으면 지번과 동 이름)"""
+    return item.get('mgmBldrgstPk') or (item_pnu(item), item.get('dongNm'), item.get('bldNm'))
+
+class HarvestShard:
+    """Progress of one legal dong in a region harvest"""
+
+    __slots__ = ('code', 'name', 'pages', 'items', 'total_count', 'done', 'error', 'seconds')
+
+    def __init__(self, code, name=None):
+        self.code = code
+        self.name = name
+        self.pages = 0
+        self.items = 0
+        self.total_count = None
+        self.done = False
+        self.error = None
+        self.seconds = 0.0
+
+    def __repr__(self):
+        return f"HarvestShard({self.code!r}, items={self.items}/{self.total_count}, done={self.done})"
+
+def iter_dong_pages(client, bjdong_code, page_size=DEFAULT_PAGE_SIZE, refresh=False):
+    """
+    Iterate the building title pages of one whole legal dong
+
+    Only sigunguCd and bjdongCd are sent, so the API returns every building
+    in the dong.
+
+    :param client: BuildingRegistryClient used for the requests
+    :param bjdong_code: 10-digit legal-dong code
+    :param page_size: Number of rows requested per page
+    :param refresh: Skip cached entries and store fresh responses
+    :return: Generator of (page number, list of items, totalCount) tuples
+    :raises BuildingApiError: If a page cannot be fetched
+    """
+    page_no = 1
+    received = 0
+    while True:
+        params = {
+            "serviceKey": client.service_key,
+            "sigunguCd": bjdong_code[:5],
+            "bjdongCd": bjdong_code[5:],
+            "numOfRows": page_size,
+            "pageNo": page_no,
+            "_type": "json",
+        }
+        response = client.fetch_json(client.title_info_url, params, refresh=refresh)
+        total_count = extract_total_count(response)
+        items = extract_items(response)[:max(total_count - received, 0)]
+        received += len(items)
+        yield page_no, items, total_count
+        if not items or received >= total_count:
+            return
+        page_no += 1
+
+def harvest_region(client, dongs, max_workers=8, page_size=DEFAULT_PAGE_SIZE, refresh=False, code_table=None,
+                   progress=None):
+    """
+    Fetch every building of many legal dongs and merge them into one stream
+
+    Each dong is a shard paged through by one worker thread; pages are
+    handed over a bounded queue, so memory stays flat however large the
+    region is. Items repeated within a dong (same mgmBldrgstPk) are
+    dropped; a building is filed under one legal dong only, so the keys of
+    a dong are forgotten once it is done. A shard that fails is reported
+    through its HarvestShard and the others go on.
+
+    :param client: BuildingRegistryClient shared by all workers
+    :param dongs: Iterable of 10-digit legal-dong codes (see harvest_dongs)
+    :param max_workers: Number of dongs fetched at the same time
+    :param page_size: Number of rows requested per page
+    :param refresh: Skip cached entries and store fresh responses
+    :param code_table: CodeTable used to name the shards (optional)
+    :param progress: Callable taking a HarvestShard, called after every page and when a shard ends
+                     (on the consuming thread)
+    :return: Generator of unique building title items
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    shards = [HarvestShard(code, code_table.name(code) if code_table is not None else None) for code in dongs]
+    pages = queue.Queue(maxsize=max_workers * QUEUE_PAGES_PER_WORKER)
+    stop = threading.Event()
+
+    def put(message):
+        # 소비 쪽이 중단되면 대기 중인 작업 스레드도 멈춤
+        while not stop.is_set():
+            try:
+                pages.put(message, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run_shard(shard):
+        started = time.perf_counter()
+        error = None
+        try:
+            for _, items, total_count in iter_dong_pages(client, shard.code, page_size, refresh):
+                if not put((shard, items, total_count, None)):
+                    return
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            shard.seconds = round(time.perf_counter() - started, 6)
+        put((shard, None, None, error))
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="harvest")
+    futures = [executor.submit(run_shard, shard) for shard in shards]
+    # 진행 중인 법정동별로 이미 내보낸 항목의 키 (끝난 법정동은 버림)
+    seen = {}
+    try:
+        remaining = len(shards)
+        while remaining:
+            shard, items, total_count, error = pages.get()
+            if items is None:
+                remaining -= 1
+                shard.done = True
+                shard.error = error
+                seen.pop(shard.code, None)
+            else:
+                shard.pages += 1
+                shard.items += len(items)
+                shard.total_count = total_count
+            if progress is not None:
+                progress(shard)
+            if items:
+                shard_seen = seen.setdefault(shard.code, set())
+                for item in items:
+                    key = harvest_key(item)
+                    if key not in shard_seen:
+                        shard_seen.add(key)
+                        yield item
+    finally:
+        stop.set()
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+def run_harvest(client, region, code_table, output=None, max_workers=8, page_size=DEFAULT_PAGE_SIZE, refresh=False,
+                output_format=None, parcels_path=None, pnu_field="PNU", row_group_size=DEFAULT_ROW_GROUP_SIZE,
+                include_abolished=False, progress=None):
+    """
+    Harvest a whole region and write its buildings as they arrive
+
+    With the "jsonl" format one JSON line is written per building, with
+    its PNU under "pnu"; the other formats write typed rows through a
+    ResultWriter.
+
+    :param client: BuildingRegistryClient shared by all workers
+    :param region: 시도 or 시군구 code
+    :param code_table: CodeTable enumerating the region's legal dongs
+    :param output: Output file path (stdout if None, "jsonl" only)
+    :param max_workers: Number of dongs fetched at the same time
+    :param page_size: Number of rows requested per page
+    :param refresh: Skip cached entries and store fresh responses
+    :param output_format: One of OUTPUT_FORMATS (guessed from the output extension if None)
+    :param parcels_path: Parcel layer joined by PNU for the "gpkg" format
+    :param pnu_field: PNU attribute of the parcel layer
+    :param row_group_size: Number of rows buffered before each write
+    :param include_abolished: Also harvest abolished legal dongs
+    :param progress: Callable taking a HarvestShard (see harvest_region)
+    :return: Tuple of (buildings written, list of HarvestShard that failed)
+    """
+    output_format = output_format or (guess_output_format(output) if output else "jsonl")
+    if output_format != "jsonl" and not output:
+        raise ValueError(f"{output_format} 형식으로 저장하려면 --output 경로가 필요합니다.")
+    dongs = harvest_dongs(code_table, region, include_abolished)
+    failed = []
+
+    def track(shard):
+        if shard.done and shard.error is not None:
+            failed.append(shard)
+        if progress is not None:
+            progress(shard)
+
+    items = harvest_region(client, dongs, max_workers=max_workers, page_size=page_size, refresh=refresh,
+                           code_table=code_table, progress=track)
+    written = 0
+    if output_format != "jsonl":
+        with open_result_writer(output, output_format, parcels_path=parcels_path, pnu_field=pnu_field,
+                                row_group_size=row_group_size) as writer:
+            for item in items:
+                writer.write_items(item_pnu(item), (item,))
+                written += 1
+        return written, failed
+
+    out = open(output, 'w', encoding='utf-8') if output else sys.stdout
+    try:
+        for item in items:
+            out.write(json.dumps({"pnu": item_pnu(item), **item}, ensure_ascii=False) + "\n")
+            written += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return written, failed
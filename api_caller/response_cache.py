@@ -0,0 +1,197 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# 기본 캐시 파일 위치 (CLI와 PyQt 창이 함께 사용)
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".qgis_apitest", "building_cache.sqlite")
+
+# 건축물대장은 자주 바뀌지 않으므로 기본 유효기간은 7일
+DEFAULT_TTL = 7 * 24 * 60 * 60
+
+# 요청마다 달라지지만 응답 내용에는 영향을 주지 않는 파라미터
+_IGNORED_PARAMS = ("serviceKey",)
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def make_cache_key(endpoint, params):
+    """
+    Build a normalized cache key for an API request
+
+    :param endpoint: Request URL without query string
+    :param params: Query parameters of the request
+    :return: Cache key string
+    """
+    normalized = {
+        name: str(value).strip()
+        for name, value in params.items()
+        if name not in _IGNORED_PARAMS and value is not None
+    }
+    return endpoint + "?" + json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+
+class ResponseCache:
+    """
+    SQLite-backed response cache with per-entry TTL and LRU eviction
+
+    Recently used entries are also kept decoded in memory, so repeated
+    lookups in the same process do not touch the database at all.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=50000, default_ttl=DEFAULT_TTL, memory_entries=512):
+        """
+        :param path: SQLite database path (":memory:" for a private in-process cache)
+        :param max_entries: Maximum number of stored entries before LRU eviction
+        :param default_ttl: Default time-to-live in seconds (None for no expiry)
+        :param memory_entries: Number of decoded entries kept in memory
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self.path = path
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.memory_entries = memory_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+        self._count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def get(self, key):
+        """
+        Return the cached value for key, or None if missing or expired
+
+        :param key: Cache key from make_cache_key
+        :return: Cached value or None
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            raw_value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._count -= 1
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+            value = json.loads(raw_value)
+            self._remember(key, value, expires_at)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        """
+        Store a JSON-serializable value
+
+        :param key: Cache key from make_cache_key
+        :param value: Value to store
+        :param ttl: Time-to-live in seconds (default_ttl if None)
+        """
+        if ttl is None:
+            ttl = self.default_ttl
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        raw_value = json.dumps(value, ensure_ascii=False)
+
+        with self._lock:
+            exists = self._conn.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, raw_value, expires_at, now)
+            )
+            if exists is None:
+                self._count += 1
+            self._remember(key, value, expires_at)
+            if self._count > self.max_entries:
+                self._evict()
+
+    def delete(self, key):
+        """캐시 항목 삭제"""
+        with self._lock:
+            self._memory.pop(key, None)
+            cursor = self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._count -= cursor.rowcount
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM entries")
+            self._count = 0
+
+    def close(self):
+        """데이터베이스 연결 종료"""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self):
+        return self._count
+
+    def _remember(self, key, value, expires_at):
+        if self.memory_entries <= 0:
+            return
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self):
+        # 매번 한 건씩 지우지 않도록 최대 크기의 90%까지 한 번에 정리
+        target = int(self.max_entries * 0.9)
+        now = time.time()
+        self._conn.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        self._count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        excess = self._count - target
+        if excess > 0:
+            evicted = [row[0] for row in self._conn.execute(
+                "SELECT key FROM entries ORDER BY last_access LIMIT ?", (excess,)
+            )]
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in evicted])
+            for key in evicted:
+                self._memory.pop(key, None)
+            self._count -= len(evicted)
+
+def get_default_cache():
+    """
+    Return the cache shared by the CLI and the PyQt windows
+
+    :return: ResponseCache stored at DEFAULT_CACHE_PATH
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache(DEFAULT_CACHE_PATH)
+        return _default_cache
@@ -0,0 +1,282 @@
+import abc
+import csv
+import os
+from pnu_types import attribute_pnu
+from title_schema import KIND_DOUBLE, KIND_INT, KIND_STRING, TITLE_INFO_COLUMNS, convert_value
+
+# pyarrow와 GDAL은 해당 형식으로 저장할 때 처음 불러옴 (가져오는 데만 수십~수백 ms)
+pa = pq = None
+ogr = None
+
+def _import_pyarrow():
+    """pyarrow를 불러와 모듈 전역에 설정 (Parquet 저장을 쓰지 않으면 필요 없음)"""
+    global pa, pq
+    if pq is None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet 저장에는 pyarrow가 필요합니다.") from None
+        pa, pq = pyarrow, pyarrow.parquet
+
+def _import_ogr():
+    """GDAL을 불러와 모듈 전역에 설정 (GeoPackage 저장은 GDAL(QGIS에 포함)이 있을 때만 사용)"""
+    global ogr
+    if ogr is None:
+        try:
+            from osgeo import ogr as ogr_module
+        except ImportError:
+            raise ImportError("GeoPackage 저장에는 GDAL(osgeo)이 필요합니다.") from None
+        ogr = ogr_module
+
+# 한 번에 파일에 쓰는 행 수 (메모리에 쌓이는 최대 행 수)
+DEFAULT_ROW_GROUP_SIZE = 10000
+
+# 모든 결과 행 앞에 붙는 PNU 열
+PNU_COLUMN = 'pnu'
+
+OUTPUT_FORMATS = ("jsonl", "csv", "parquet", "gpkg")
+
+_EXTENSION_FORMATS = {
+    ".jsonl": "jsonl",
+    ".json": "jsonl",
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".gpkg": "gpkg",
+}
+
+def guess_output_format(path):
+    """
+    Pick an output format from a file extension
+
+    :param path: Output path
+    :return: One of OUTPUT_FORMATS ("jsonl" for unknown extensions)
+    """
+    return _EXTENSION_FORMATS.get(os.path.splitext(path)[1].lower(), "jsonl")
+
+class ResultWriter(abc.ABC):
+    """
+    Base class of the streaming building-item writers
+
+    Items are converted to typed rows (one per building, led by the PNU
+    column) and buffered; every ``row_group_size`` rows the buffer is
+    written out and cleared, so memory use does not grow with the input.
+    """
+
+    def __init__(self, path, columns=TITLE_INFO_COLUMNS, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+        """
+        :param path: Output path
+        :param columns: Sequence of (API field, kind) pairs to write
+        :param row_group_size: Number of rows buffered before each write
+        """
+        self.path = path
+        self.columns = ((PNU_COLUMN, KIND_STRING),) + tuple(columns)
+        self.row_group_size = row_group_size
+        self.rows_written = 0
+        self._rows = []
+
+    def write_items(self, pnu, items):
+        """
+        Append the building items of one parcel
+
+        :param pnu: PNU the items belong to
+        :param items: Building title item dictionaries
+        """
+        fields = self.columns[1:]
+        for item in items:
+            self._rows.append((pnu,) + tuple(convert_value(item.get(name), kind) for name, kind in fields))
+        if len(self._rows) >= self.row_group_size:
+            self.flush()
+
+    def write_record(self, record):
+        """
+        Append the items of a lookup_pnu record (failed records are skipped)
+
+        :param record: Record returned by lookup_pnu
+        :return: True if the record was written
+        """
+        if record.get("error") is not None:
+            return False
+        self.write_items(record["pnu"], record.get("items") or [])
+        return True
+
+    def flush(self):
+        """버퍼에 쌓인 행을 파일에 기록"""
+        if self._rows:
+            rows, self._rows = self._rows, []
+            self._write_rows(rows)
+            self.rows_written += len(rows)
+
+    def close(self):
+        self.flush()
+        self._close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @abc.abstractmethod
+    def _write_rows(self, rows):
+        """버퍼에서 꺼낸 행 목록을 파일에 기록 (형식별로 구현)"""
+
+    def _close(self):
+        pass
+
+class CsvResultWriter(ResultWriter):
+    """UTF-8 (BOM 포함) CSV로 저장; 빈 값은 빈 칸"""
+
+    def __init__(self, path, columns=TITLE_INFO_COLUMNS, row_group_size=DEFAULT_ROW_GROUP_SIZE, append=False):
+        """
+        :param append: Add rows to an existing file instead of replacing it
+        """
+        super().__init__(path, columns, row_group_size)
+        append = append and os.path.exists(path) and os.path.getsize(path) > 0
+        if append:
+            self._file = open(path, 'a', encoding='utf-8', newline='')
+        else:
+            self._file = open(path, 'w', encoding='utf-8-sig', newline='')
+        self._writer = csv.writer(self._file)
+        if not append:
+            self._writer.writerow([name for name, _ in self.columns])
+
+    def _write_rows(self, rows):
+        self._writer.writerows(["" if value is None else value for value in row] for row in rows)
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+class ParquetResultWriter(ResultWriter):
+    """Parquet으로 저장; 버퍼 하나가 행 그룹 하나가 됨"""
+
+    _ARROW_TYPES = {KIND_DOUBLE: "float64", KIND_INT: "int64", KIND_STRING: "string"}
+
+    def __init__(self, path, columns=TITLE_INFO_COLUMNS, row_group_size=DEFAULT_ROW_GROUP_SIZE, compression="zstd"):
+        """
+        :param compression: Parquet compression codec
+        """
+        _import_pyarrow()
+        super().__init__(path, columns, row_group_size)
+        self.schema = pa.schema([(name, getattr(pa, self._ARROW_TYPES[kind])()) for name, kind in self.columns])
+        self._writer = pq.ParquetWriter(path, self.schema, compression=compression)
+
+    def _write_rows(self, rows):
+        arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*rows), self.schema)]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema), row_group_size=len(rows))
+
+    def _close(self):
+        self._writer.close()
+
+class GeoPackageResultWriter(ResultWriter):
+    """
+    GeoPackage writer that joins each building to its parcel geometry
+
+    Only a PNU -> feature id index of the parcel layer is kept in memory;
+    geometries are read from the parcel file as rows are written. Each
+    row group is written in one transaction. Buildings whose PNU is not in
+    the parcel layer are written without geometry (see ``unmatched``).
+    """
+
+    _OGR_TYPES = {KIND_DOUBLE: "OFTReal", KIND_INT: "OFTInteger64", KIND_STRING: "OFTString"}
+
+    def __init__(self, path, parcels_path, pnu_field="PNU", layer_name="building_title",
+                 columns=TITLE_INFO_COLUMNS, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+        """
+        :param parcels_path: Parcel layer readable by GDAL (Shapefile, GeoPackage, ...)
+        :param pnu_field: PNU attribute of the parcel layer
+        :param layer_name: Name of the layer created in the GeoPackage
+        :raises ValueError: If the parcel layer has no such field or stores PNUs as Real/double
+        """
+        _import_ogr()
+        super().__init__(path, columns, row_group_size)
+        self.unmatched = 0
+
+        self._parcels = ogr.Open(parcels_path)
+        if self._parcels is None:
+            raise OSError(f"필지 파일을 열 수 없습니다: {parcels_path}")
+        self._parcel_layer = self._parcels.GetLayer(0)
+        self._parcel_ids = self._index_parcels(pnu_field)
+
+        driver = ogr.GetDriverByName("GPKG")
+        if os.path.exists(path):
+            driver.DeleteDataSource(path)
+        self._output = driver.CreateDataSource(path)
+        self._layer = self._output.CreateLayer(layer_name, srs=self._parcel_layer.GetSpatialRef(),
+                                               geom_type=self._parcel_layer.GetGeomType())
+        for name, kind in self.columns:
+            self._layer.CreateField(ogr.FieldDefn(name, getattr(ogr, self._OGR_TYPES[kind])))
+        self._definition = self._layer.GetLayerDefn()
+
+    def _index_parcels(self, pnu_field):
+        """PNU -> 필지 피처 ID (도형은 읽지 않음)"""
+        layer = self._parcel_layer
+        definition = layer.GetLayerDefn()
+        if definition.GetFieldIndex(pnu_field) < 0:
+            raise ValueError(f"필지 레이어에 '{pnu_field}' 필드가 없습니다.")
+        ignored = [definition.GetFieldDefn(i).GetName() for i in range(definition.GetFieldCount())
+                   if definition.GetFieldDefn(i).GetName() != pnu_field]
+        layer.SetIgnoredFields(ignored + ["OGR_GEOMETRY"])
+        parcel_ids = {}
+        try:
+            layer.ResetReading()
+            for feature in layer:
+                pnu = attribute_pnu(feature.GetField(pnu_field))
+                if pnu is not None:
+                    parcel_ids.setdefault(pnu, feature.GetFID())
+        finally:
+            layer.SetIgnoredFields([])
+        return parcel_ids
+
+    def _write_rows(self, rows):
+        self._layer.StartTransaction()
+        try:
+            for row in rows:
+                feature = ogr.Feature(self._definition)
+                for index, value in enumerate(row):
+                    if value is not None:
+                        feature.SetField(index, value)
+                parcel_id = self._parcel_ids.get(row[0])
+                parcel = self._parcel_layer.GetFeature(parcel_id) if parcel_id is not None else None
+                if parcel is not None and parcel.GetGeometryRef() is not None:
+                    feature.SetGeometry(parcel.GetGeometryRef())
+                else:
+                    self.unmatched += 1
+                self._layer.CreateFeature(feature)
+        except Exception:
+            self._layer.RollbackTransaction()
+            raise
+        self._layer.CommitTransaction()
+
+    def _close(self):
+        self._output = self._layer = None
+        self._parcels = self._parcel_layer = None
+
+def open_result_writer(path, output_format=None, parcels_path=None, pnu_field="PNU",
+                       row_group_size=DEFAULT_ROW_GROUP_SIZE, append=False):
+    """
+    Create the writer for an output path
+
+    :param path: Output path
+    :param output_format: "csv", "parquet" or "gpkg" (guessed from the extension if None)
+    :param parcels_path: Parcel layer joined by PNU (required for "gpkg")
+    :param pnu_field: PNU attribute of the parcel layer
+    :param row_group_size: Number of rows buffered before each write
+    :param append: Add rows to an existing file (only supported for "csv")
+    :return: ResultWriter
+    :raises ValueError: For "jsonl" or unknown formats, "gpkg" without parcels, or append to other than "csv"
+    """
+    output_format = output_format or guess_output_format(path)
+    if append and output_format != "csv":
+        raise ValueError(f"{output_format} 파일에는 이어서 저장할 수 없습니다. CSV 또는 JSON Lines를 사용하세요.")
+    if output_format == "csv":
+        return CsvResultWriter(path, row_group_size=row_group_size, append=append)
+    if output_format == "parquet":
+        return ParquetResultWriter(path, row_group_size=row_group_size)
+    if output_format == "gpkg":
+        if not parcels_path:
+            raise ValueError("GeoPackage로 저장하려면 필지 파일(--parcels)이 필요합니다.")
+        return GeoPackageResultWriter(path, parcels_path, pnu_field=pnu_field, row_group_size=row_group_size)
+    raise ValueError(f"지원하지 않는 저장 형식입니다: {output_format}")
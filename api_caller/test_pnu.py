@@ -1,33 +1,27 @@
-import requests
-import urllib.parse
+import argparse
+import json
+import logging
+import sqlite3
+import sys
+from building_client import (BuildingRegistryClient, DEFAULT_PAGE_SIZE, extract_items, extract_total_count,
+                             get_shared_client)
+from building_lookup import check_pnu, fetch_building_info_batch, format_building_info, iter_pnus, parse_pnu
+from response_cache import get_default_cache
+from code_table import get_default_code_table, load_code_table
+from client_metrics import MetricsRegistry
+from batch_journal import BatchJournal, is_failed
+from key_pool import (DEFAULT_DAILY_QUOTA, DEFAULT_KEYS_PATH, DEFAULT_RATE, DEFAULT_USAGE_PATH, ServiceKeyPool,
+                      UsageStore, load_service_keys)
+from result_writers import DEFAULT_ROW_GROUP_SIZE, OUTPUT_FORMATS, guess_output_format, open_result_writer
 
-def parse_pnu(pnu):
-    """
-    Parse PNU code into its components
-    
-    :param pnu: 19-digit PNU code
-    :return: Dictionary containing PNU components
-    """
-    if len(pnu) != 19:
-        raise ValueError("PNU must be 19 digits")
-        
-    # 산구분코드 처리
-    san_value = pnu[10:11]
-    if not san_value:
-        raise ValueError("Invalid PNU format: missing plat_gb_cd")
-    
-    return {
-        'sigungu_cd': pnu[0:5],      # 시군구코드 (앞 5자리)
-        'bjdong_cd': pnu[5:10],      # 법정동코드 (다음 5자리)
-        'plat_gb_cd': str(int(san_value) - 1),  # 산여부 (0->-1, 1->0)
-        'bun': pnu[11:15].zfill(4),  # 본번 (4자리로 채우기)
-        'ji': pnu[15:].zfill(4)      # 부번 (4자리로 채우기)
-    }
-
-def fetch_building_info(service_key, sigungu_cd, bjdong_cd, plat_gb_cd, bun, ji, rows=1, page=1, response_type="json"):
+def fetch_building_info(service_key, sigungu_cd, bjdong_cd, plat_gb_cd, bun, ji, rows=1, page=1, response_type="json",
+                        cache=None, refresh=False, cache_ttl=None):
     """
     Fetch building registry information based on parameters from the OpenAPI.
 
+    Goes through a shared BuildingRegistryClient, so connections are reused
+    between calls with the same service key and cache.
+
     :param service_key: Decoded service key from the public data portal
     :param sigungu_cd: City/district code
     :param bjdong_cd: Legal dong code
@@ -37,86 +31,22 @@ def fetch_building_info(service_key, sigungu_cd, bjdong_cd, plat_gb_cd, bun, ji,
     :param rows: Number of rows per page
     :param page: Page number
     :param response_type: Response format (json or xml)
+    :param cache: ResponseCache to read from and store into (None disables caching)
+    :param refresh: Skip the cached entry and store a fresh response
+    :param cache_ttl: Time-to-live in seconds for the stored entry (cache default if None)
     :return: API response in JSON format
     """
-    # Base URL for the API
-    base_url = "http://apis.data.go.kr/1613000/BldRgstHubService/getBrTitleInfo"
-
-    # API parameters
-    params = {
-        "serviceKey": service_key,
-        "sigunguCd": sigungu_cd,
-        "bjdongCd": bjdong_cd,
-        "platGbCd": plat_gb_cd,
-        "bun": bun,
-        "ji": ji,
-        "numOfRows": rows,
-        "pageNo": page,
-        "_type": response_type
-    }
-
-    try:
-        # Send a GET request
-        response = requests.get(base_url, params=params, timeout=10)
-        response.raise_for_status()  # Raise an HTTPError for bad responses (4xx and 5xx)
-
-        if response_type == "json":
-            # Print raw response for debugging
-            print("Raw response:", response.text)
-            
-            # Check if response is empty
-            if not response.text.strip():
-                return {"error": "Empty response received from server"}
-                
-            try:
-                return response.json()
-            except ValueError as json_err:
-                return {"error": f"Failed to parse JSON response: {json_err}", "raw_response": response.text}
-        else:
-            return response.text
-    except requests.exceptions.ConnectionError:
-        return {"error": "Connection error occurred. Please check your network or the API server."}
-    except requests.exceptions.Timeout:
-        return {"error": "The request timed out. Please try again later."}
-    except requests.exceptions.RequestException as e:
-        return {"error": f"An error occurred: {e}"}
-
-def format_building_info(item):
-    """건축물 정보를 보기 좋게 포맷팅"""
-    return f"""
-📍 기본 정보
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-• 건물명: {item['bldNm']}
-• 지번 주소: {item['platPlc']}
-• 도로명 주소: {item['newPlatPlc']}
-• 동번호: {item['dongNm']}
-
-🏗️ 건축물 규모
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-• 건축면적: {item['archArea']}㎡
-• 연면적: {item['totArea']}㎡
-• 용적률: {item['vlRat']}%
-• 건폐율: {item['bcRat']}%
-• 지상층수: {item['grndFlrCnt']}층
-• 지하층수: {item['ugrndFlrCnt']}층
-• 세대수: {item['hhldCnt']}세대
-
-🏠 건축물 특성
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-• 구조: {item['strctCdNm']}
-• 주용도: {item['mainPurpsCdNm']}
-• 세부용도: {item['etcPurps']}
-• 지붕: {item['roofCdNm']}
-
-📅 인허가 정보
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-• 허가일: {item['pmsDay']}
-• 사용승인일: {item['useAprDay']}"""
+    client = get_shared_client(service_key, cache)
+    return client.fetch_building_info(
+        sigungu_cd, bjdong_cd, plat_gb_cd, bun, ji,
+        rows=rows, page=page, response_type=response_type,
+        refresh=refresh, cache_ttl=cache_ttl
+    )
 
 def print_response_summary(response):
     """API 응답 결과 요약 출력"""
-    items = response['response']['body']['items']['item']
-    total_count = response['response']['body']['totalCount']
+    items = extract_items(response)
+    total_count = extract_total_count(response)
     
     print(f"\n🏢 총 {total_count}개의 건축물이 검색되었습니다.\n")
     
@@ -124,33 +54,305 @@ def print_response_summary(response):
         print(format_building_info(item))
         print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
 
+def print_building_pages(pages):
+    """페이지 단위로 받은 전체 조회 결과 출력"""
+    for page_no, items, total_count in pages:
+        if page_no == 1:
+            print(f"\n🏢 총 {total_count}개의 건축물이 검색되었습니다.\n")
+
+        for item in items:
+            print(format_building_info(item))
+            print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+
+def run_batch(client, source, output=None, max_workers=8, page_size=DEFAULT_PAGE_SIZE, refresh=False,
+              code_table=None, output_format=None, parcels_path=None, pnu_field="PNU",
+              row_group_size=DEFAULT_ROW_GROUP_SIZE, lookup=None, journal=None):
+    """
+    Run a batch lookup and write the results as they arrive
+
+    With the "jsonl" format one JSON line is written per PNU. The "csv",
+    "parquet" and "gpkg" formats write one typed row per building through
+    a ResultWriter; failed PNUs are only counted.
+
+    With a journal, PNUs already completed in an earlier run are skipped,
+    failed and missing ones are looked up again, and the output file is
+    appended to instead of replaced. Failed records are then only
+    journaled, not written, so the output holds one final row per PNU.
+
+    :param client: BuildingRegistryClient shared by all workers
+    :param source: PNU file path ("-" for stdin) or iterable of PNUs
+    :param output: Output file path (stdout if None, "jsonl" only)
+    :param max_workers: Number of concurrent requests
+    :param page_size: Number of rows requested per page
+    :param refresh: Skip cached entries and store fresh responses
+    :param code_table: CodeTable used to validate and label the legal dong (optional)
+    :param output_format: One of OUTPUT_FORMATS (guessed from the output extension if None)
+    :param parcels_path: Parcel layer joined by PNU for the "gpkg" format
+    :param pnu_field: PNU attribute of the parcel layer
+    :param row_group_size: Number of rows buffered before each write
+    :param lookup: Per-PNU lookup passed to fetch_building_info_batch (lookup_pnu if None)
+    :param journal: BatchJournal recording the outcome of every PNU (optional)
+    :return: Tuple of (succeeded, failed) counts of this run
+    """
+    output_format = output_format or (guess_output_format(output) if output else "jsonl")
+    if output_format != "jsonl" and not output:
+        raise ValueError(f"{output_format} 형식으로 저장하려면 --output 경로가 필요합니다.")
+
+    pnus = iter_pnus(source)
+    if journal is not None:
+        # 이전 실행에서 완료된 PNU는 건너뜀
+        completed = journal.completed()
+        pnus = (pnu for pnu in pnus if pnu not in completed)
+
+    succeeded = failed = 0
+    records = fetch_building_info_batch(client, pnus, max_workers=max_workers,
+                                        page_size=page_size, refresh=refresh, code_table=code_table, lookup=lookup)
+    if output_format != "jsonl":
+        with open_result_writer(output, output_format, parcels_path=parcels_path, pnu_field=pnu_field,
+                                row_group_size=row_group_size, append=journal is not None) as writer:
+            if journal is not None:
+                journal.add_flush_hook(writer.flush)
+            try:
+                for record in records:
+                    if journal is not None and is_failed(record):
+                        failed += 1
+                    elif writer.write_record(record):
+                        succeeded += 1
+                    else:
+                        failed += 1
+                    if journal is not None:
+                        journal.record(record)
+            finally:
+                # 중단되더라도 저장된 결과까지는 작업 기록에 남김
+                if journal is not None:
+                    journal.flush()
+        return succeeded, failed
+
+    if output:
+        out = open(output, 'a' if journal is not None else 'w', encoding='utf-8')
+    else:
+        out = sys.stdout
+    if journal is not None:
+        journal.add_flush_hook(out.flush)
+    try:
+        for record in records:
+            if journal is not None and is_failed(record):
+                # 실패한 레코드는 작업 기록에만 남기고 다시 조회해 성공했을 때 저장
+                failed += 1
+            else:
+                if record["error"] is None:
+                    succeeded += 1
+                else:
+                    failed += 1
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            if journal is not None:
+                journal.record(record)
+    finally:
+        if journal is not None:
+            journal.flush()
+        if out is not sys.stdout:
+            out.close()
+    return succeeded, failed
+
+def build_arg_parser():
+    """명령행 인자 정의"""
+    parser = argparse.ArgumentParser(description="PNU로 건축물대장 표제부 정보를 조회합니다.")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="한 줄에 하나씩 PNU가 적힌 파일 (- 는 표준입력). 지정하면 일괄 조회 모드로 실행")
+    parser.add_argument("--output", metavar="FILE", help="일괄 조회 결과 저장 경로, 기본값은 표준출력(JSON Lines)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, dest="output_format",
+                        help="저장 형식 (기본값: --output 확장자로 판단, .csv/.parquet/.gpkg 외에는 jsonl)")
+    parser.add_argument("--parcels", metavar="FILE", help="GeoPackage 저장 시 PNU로 연결할 필지 도형 파일")
+    parser.add_argument("--pnu-field", default="PNU", help="필지 파일의 PNU 필드명 (기본값: PNU)")
+    parser.add_argument("--row-group-size", type=int, default=DEFAULT_ROW_GROUP_SIZE,
+                        help=f"한 번에 기록하는 행 수 (기본값: {DEFAULT_ROW_GROUP_SIZE})")
+    parser.add_argument("--workers", type=int, default=8, help="동시 요청 수 (기본값: 8)")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE,
+                        help=f"페이지당 요청 행 수 (기본값: {DEFAULT_PAGE_SIZE})")
+    parser.add_argument("--profile", action="store_true",
+                        help="표제부·총괄표제부·층별개요·전유공용면적·토지대장을 동시에 조회해 한 레코드로 저장 (JSON Lines 전용)")
+    parser.add_argument("--journal", metavar="FILE",
+                        help="작업 기록 파일 (SQLite). 다시 실행하면 완료된 PNU는 건너뛰고 실패·누락된 PNU만 조회하며 결과를 이어서 저장")
+    parser.add_argument("--sync", metavar="SNAPSHOT",
+                        help="변경분 갱신 모드: 스냅숏(SQLite)의 필지를 오래된 순으로 다시 조회해 바뀐 건물만 저장하고 "
+                             "변경 내역(JSON Lines)을 --output에 기록. --batch 파일의 PNU는 추적 대상에 추가")
+    parser.add_argument("--harvest", metavar="REGION",
+                        help="지역 수집 모드: 시도(2자리) 또는 시군구(5자리) 코드의 모든 법정동 건축물을 동별로 나누어 "
+                             "동시에 조회하고 중복을 제거해 --output에 저장 (법정동코드 파일 필요)")
+    parser.add_argument("--limit", type=int, help="변경분 갱신 시 조회할 최대 필지 수 (기본값: 남은 일일 한도)")
+    parser.add_argument("--max-age-days", type=float, help="변경분 갱신 시 이 기간(일) 안에 조회한 필지는 건너뜀")
+    parser.add_argument("--no-cache", action="store_true", help="응답 캐시를 사용하지 않음")
+    parser.add_argument("--refresh", action="store_true", help="캐시를 무시하고 새로 조회한 뒤 캐시를 갱신")
+    parser.add_argument("--codes", metavar="FILE",
+                        help="PNU 검증에 사용할 법정동코드 파일 (기본값: ~/.qgis_apitest/bjdong_codes.csv 가 있으면 사용)")
+    parser.add_argument("--keys", metavar="FILE", default=DEFAULT_KEYS_PATH,
+                        help="한 줄에 하나씩 서비스키가 적힌 파일 (기본값: ~/.qgis_apitest/service_keys.txt)")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help=f"서비스키 하나의 초당 요청 수, 0보다 커야 함 (기본값: {DEFAULT_RATE:g})")
+    parser.add_argument("--daily-quota", type=int, default=DEFAULT_DAILY_QUOTA,
+                        help=f"서비스키 하나의 일일 요청 한도, 0은 제한 없음 (기본값: {DEFAULT_DAILY_QUOTA})")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="요청별 지연 시간/응답 크기/캐시/재시도 통계를 저장할 파일 (.prom 이면 Prometheus 형식, 그 외 JSON)")
+    parser.add_argument("-v", "--verbose", action="count", default=0,
+                        help="재시도·오류 로그 출력 (-vv 는 요청별 로그와 원본 응답까지 출력)")
+    return parser
+
 # Example usage
 if __name__ == "__main__":
-    # Decode the service key
-    service_key = urllib.parse.unquote("Lvn%2FX9ciaH3OcErj46QABbDpndkMA%2FBR6ZJmLMlTOO1No1vGocwgMhcp%2BVKl%2BShi8et1lD%2BVhhVAdQNi%2BtkKGw%3D%3D")
-    
+    args = build_arg_parser().parse_args()
+
+    if args.verbose:
+        logging.basicConfig(level=logging.DEBUG if args.verbose > 1 else logging.INFO,
+                            format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    cache = None if args.no_cache else get_default_cache()
+    metrics = MetricsRegistry() if args.metrics else None
+    # 설정된 서비스키를 요청 속도·일일 한도에 맞춰 돌아가며 사용
+    try:
+        key_pool = ServiceKeyPool(load_service_keys(args.keys), rate=args.rate,
+                                  daily_quota=args.daily_quota or None, usage_store=UsageStore(DEFAULT_USAGE_PATH))
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"\n❌ 서비스키를 준비할 수 없습니다: {e}", file=sys.stderr)
+        sys.exit(1)
+    client = BuildingRegistryClient(None, cache=cache, pool_maxsize=max(args.workers, 10), metrics=metrics,
+                                    key_pool=key_pool)
+    try:
+        code_table = load_code_table(args.codes) if args.codes else get_default_code_table()
+    except (OSError, ValueError) as e:
+        print(f"\n❌ 법정동코드 파일을 읽을 수 없습니다: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.sync:
+        from delta_sync import CHANGE_ADDED, CHANGE_CHANGED, CHANGE_REMOVED, BuildingSnapshot, sync_snapshot
+        try:
+            with BuildingSnapshot(args.sync) as snapshot:
+                if args.batch:
+                    added = snapshot.track(iter_pnus(args.batch))
+                    print(f"추적 필지 {added}건 추가", file=sys.stderr)
+                limit = args.limit
+                if limit is None and key_pool.daily_quota is not None:
+                    # 오늘 남은 한도 안에서 가장 오래된 필지부터 갱신
+                    limit = sum(usage['remaining'] for usage in key_pool.usage().values())
+                max_age = args.max_age_days * 86400 if args.max_age_days is not None else None
+                counts = {"parcels": 0, "failed": 0, CHANGE_ADDED: 0, CHANGE_CHANGED: 0, CHANGE_REMOVED: 0}
+                out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+                try:
+                    for record, changes in sync_snapshot(client, snapshot, limit=limit, max_age=max_age,
+                                                         max_workers=args.workers, page_size=args.page_size,
+                                                         code_table=code_table):
+                        counts["parcels"] += 1
+                        counts["failed"] += record["error"] is not None
+                        for change in changes:
+                            counts[change["change"]] += 1
+                            out.write(json.dumps(change, ensure_ascii=False) + "\n")
+                finally:
+                    if out is not sys.stdout:
+                        out.close()
+                stats = snapshot.stats()
+            print(f"\n✅ 변경분 갱신 완료: 필지 {counts['parcels']}건 조회 (실패 {counts['failed']}건), "
+                  f"추가 {counts[CHANGE_ADDED]} · 변경 {counts[CHANGE_CHANGED]} · 삭제 {counts[CHANGE_REMOVED]}",
+                  file=sys.stderr)
+            print(f"   스냅숏: 필지 {stats['parcels']}건, 건물 {stats['buildings']}건, "
+                  f"미조회 {stats['never_fetched']}건", file=sys.stderr)
+            if metrics is not None:
+                metrics.write(args.metrics)
+        except (OSError, ValueError) as e:
+            print(f"\n❌ 오류: {e}", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(0)
+
+    if args.harvest:
+        from region_harvest import run_harvest
+        if code_table is None:
+            print("\n❌ 지역 수집에는 법정동코드 파일이 필요합니다 (--codes).", file=sys.stderr)
+            sys.exit(1)
+
+        def report_shard(shard):
+            # 동별 진행 상황 (-v 이면 페이지마다)
+            if shard.done or args.verbose:
+                if not shard.done:
+                    status = "진행 중"
+                else:
+                    status = "완료" if shard.error is None else f"실패 ({shard.error})"
+                print(f"   [{shard.code}] {shard.name or ''}: {shard.items}/{shard.total_count or 0}건, "
+                      f"{shard.pages}페이지 {status}", file=sys.stderr)
+
+        try:
+            written, failed_shards = run_harvest(client, args.harvest, code_table, args.output, args.workers,
+                                                 args.page_size, refresh=args.refresh,
+                                                 output_format=args.output_format, parcels_path=args.parcels,
+                                                 pnu_field=args.pnu_field, row_group_size=args.row_group_size,
+                                                 progress=report_shard)
+            print(f"\n✅ 지역 수집 완료: 건물 {written}건 저장, 실패한 법정동 {len(failed_shards)}곳", file=sys.stderr)
+            for shard in failed_shards:
+                print(f"     - {shard.code} {shard.name or ''}: {shard.error}", file=sys.stderr)
+            stats = client.stats()
+            print(f"   API 요청 {stats['requests']}건", file=sys.stderr)
+            if metrics is not None:
+                metrics.write(args.metrics)
+        except (ImportError, OSError, ValueError) as e:
+            print(f"\n❌ 오류: {e}", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(0)
+
+    if args.batch:
+        try:
+            lookup = None
+            journal = BatchJournal(args.journal) if args.journal else None
+            if args.profile:
+                if (args.output_format or (guess_output_format(args.output) if args.output else "jsonl")) != "jsonl":
+                    raise ValueError("--profile 결과는 JSON Lines로만 저장할 수 있습니다.")
+                from parcel_profile import ProfileLookup
+                # 동시에 조회하는 필지 수만큼 엔드포인트 스레드를 준비
+                lookup = ProfileLookup(args.workers)
+            try:
+                succeeded, failed = run_batch(client, args.batch, args.output, args.workers, args.page_size,
+                                              refresh=args.refresh, code_table=code_table,
+                                              output_format=args.output_format, parcels_path=args.parcels,
+                                              pnu_field=args.pnu_field, row_group_size=args.row_group_size,
+                                              lookup=lookup, journal=journal)
+            finally:
+                if lookup is not None:
+                    lookup.close()
+            print(f"\n✅ 일괄 조회 완료: 성공 {succeeded}건, 실패 {failed}건", file=sys.stderr)
+            if journal is not None:
+                summary = journal.summary()
+                journal.close()
+                print(f"   작업 기록 누계: 완료 {summary['done']}건, 실패 {summary['failed']}건", file=sys.stderr)
+                for error_type, count in sorted(summary['failed_by_type'].items(), key=lambda entry: -entry[1]):
+                    print(f"     - {error_type}: {count}건", file=sys.stderr)
+            stats = client.stats()
+            print(f"   API 요청 {stats['requests']}건 (동시 중복 요청 {stats['coalesced']}건 병합)", file=sys.stderr)
+            for key_name, usage in key_pool.usage().items():
+                remaining = "제한 없음" if usage['remaining'] is None else f"{usage['remaining']}건"
+                print(f"   서비스키 {key_name}: 오늘 {usage['requests']}건 사용, 남은 한도 {remaining}"
+                      + (" (한도 초과)" if usage['exhausted'] else ""), file=sys.stderr)
+            if metrics is not None:
+                metrics.write(args.metrics)
+        except (ImportError, OSError, ValueError) as e:
+            print(f"\n❌ 오류: {e}", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(0)
+
     try:
         # Get PNU input from user
         pnu = input("PNU를 입력해주세요 (19자리): ").strip()
         
-        # Validate PNU length
-        if len(pnu) != 19:
-            raise ValueError("PNU는 반드시 19자리여야 합니다.")
-        
-        if not pnu.isdigit():
-            raise ValueError("PNU는 숫자로만 구성되어야 합니다.")
+        # Validate PNU
+        check_pnu(pnu)
+        if code_table is not None:
+            code_table.validate_pnu(pnu)
             
         # Parse PNU and get parameters
         params = parse_pnu(pnu)
         
         print("\n조회 중입니다...")
         
-        # Fetch building information using parsed parameters
-        building_info = fetch_building_info(
-            service_key=service_key,
+        # Fetch building information page by page using parsed parameters
+        pages = client.iter_building_pages(
             **params,
-            rows=10,
-            page=1
+            page_size=args.page_size,
+            refresh=args.refresh
         )
         
         # Print the result in a more readable format
@@ -158,11 +360,13 @@ if __name__ == "__main__":
         print(f"▶ 조회 파라미터:")
         print(f"  - 시군구코드: {params['sigungu_cd']}")
         print(f"  - 법정동코드: {params['bjdong_cd']}")
+        if code_table is not None:
+            print(f"  - 법정동: {code_table.name(pnu[:10])}")
         print(f"  - 대지구분: {params['plat_gb_cd']}")
         print(f"  - 본번: {params['bun']}")
         print(f"  - 부번: {params['ji']}")
         print("\n▶ API 응답:")
-        print_response_summary(building_info)
+        print_building_pages(pages)
         
     except ValueError as e:
         print(f"\n❌ 오류: {e}")
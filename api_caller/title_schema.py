@@ -0,0 +1,64 @@
+# 필드 값 종류
+KIND_DOUBLE = "double"
+KIND_INT = "int"
+KIND_STRING = "string"
+
+# 표제부 응답 항목의 열 정의 (API 필드명, 값 종류)
+# 날짜(YYYYMMDD)와 코드 값은 앞자리 0과 빈 날짜를 보존하기 위해 문자열로 유지
+TITLE_INFO_COLUMNS = (
+    ('mgmBldrgstPk', KIND_STRING),
+    ('platPlc', KIND_STRING),
+    ('newPlatPlc', KIND_STRING),
+    ('bldNm', KIND_STRING),
+    ('dongNm', KIND_STRING),
+    ('sigunguCd', KIND_STRING),
+    ('bjdongCd', KIND_STRING),
+    ('platGbCd', KIND_STRING),
+    ('bun', KIND_STRING),
+    ('ji', KIND_STRING),
+    ('regstrKindCdNm', KIND_STRING),
+    ('mainAtchGbCdNm', KIND_STRING),
+    ('mainPurpsCdNm', KIND_STRING),
+    ('etcPurps', KIND_STRING),
+    ('strctCdNm', KIND_STRING),
+    ('roofCdNm', KIND_STRING),
+    ('platArea', KIND_DOUBLE),
+    ('archArea', KIND_DOUBLE),
+    ('bcRat', KIND_DOUBLE),
+    ('totArea', KIND_DOUBLE),
+    ('vlRatEstmTotArea', KIND_DOUBLE),
+    ('vlRat', KIND_DOUBLE),
+    ('heit', KIND_DOUBLE),
+    ('grndFlrCnt', KIND_INT),
+    ('ugrndFlrCnt', KIND_INT),
+    ('hhldCnt', KIND_INT),
+    ('fmlyCnt', KIND_INT),
+    ('hoCnt', KIND_INT),
+    ('rideUseElvtCnt', KIND_INT),
+    ('emgenUseElvtCnt', KIND_INT),
+    ('pmsDay', KIND_STRING),
+    ('stcnsDay', KIND_STRING),
+    ('useAprDay', KIND_STRING),
+    ('crtnDay', KIND_STRING),
+)
+
+def convert_value(value, kind):
+    """
+    Convert a raw API value to the field kind
+
+    :param value: Value from a building title item
+    :param kind: KIND_DOUBLE, KIND_INT or KIND_STRING
+    :return: Converted value, or None for empty or malformed values
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    if not value:
+        return None
+    if kind == KIND_STRING:
+        return value
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return int(number) if kind == KIND_INT else number